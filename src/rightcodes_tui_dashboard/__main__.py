@@ -4,12 +4,18 @@ import argparse
 import sys
 
 from rightcodes_tui_dashboard import __version__
-from rightcodes_tui_dashboard.cli import (
-    cmd_dashboard,
-    cmd_doctor,
-    cmd_login,
-    cmd_logs,
-)
+
+# 子命令 -> cli 模块中的实现函数名。
+# cli（httpx 等）在解析参数后才导入：`--help/--version` 不需要加载任何网络/TUI 依赖。
+_COMMANDS = {
+    "login": "cmd_login",
+    "dashboard": "cmd_dashboard",
+    "logs": "cmd_logs",
+    "sync": "cmd_sync",
+    "exporter": "cmd_exporter",
+    "daemon": "cmd_daemon",
+    "doctor": "cmd_doctor",
+}
 
 _HELP_EXAMPLES = """\
 示例（最佳实践）：
@@ -22,13 +28,16 @@ _HELP_EXAMPLES = """\
   # 3) 只看一次快照（关闭自动刷新）
   rightcodes dashboard --watch 0s
 
-  # 4) rolling window（过去 N 小时/天）：
+  # 4) 按数据源设置不同刷新频率（明细 10s，套餐 5m，其余沿用 --watch）
+  rightcodes dashboard --watch 30s --watch-logs 10s --watch-subs 5m
+
+  # 5) rolling window（过去 N 小时/天）：
   rightcodes dashboard --range 24h
   rightcodes dashboard --range 7d
 
 提示：
   - 查看某个子命令的全部参数：rightcodes <command> --help
-  - 常见子命令：dashboard / logs / doctor
+  - 常见子命令：dashboard / logs / sync / daemon / exporter / doctor
 """
 
 
@@ -36,6 +45,10 @@ class _Formatter(argparse.ArgumentDefaultsHelpFormatter, argparse.RawTextHelpFor
     """帮助信息 formatter：保留换行 + 自动展示默认值。"""
 
 
+_HTTP2_HELP = '启用 HTTP/2（单连接多路复用；需要 `pip install "httpx[http2]"`，未安装时回退 HTTP/1.1）'
+_RATE_LIMIT_NOTE = "受 RIGHTCODES_RATE_LIMIT 限流：默认 60/m、突发 20，超过 20 页后约 1 页/秒；可设为 300/m 等或 off"
+
+
 def _add_parser(sub, name: str, *, help_text: str) -> argparse.ArgumentParser:
     """创建子命令 parser（统一 formatter）。"""
 
@@ -87,6 +100,23 @@ def build_parser() -> argparse.ArgumentParser:
             "设为 0s 关闭自动刷新（只看一次快照）。"
         ),
     )
+    for group, label in (
+        ("me", "/auth/me（账户/余额）"),
+        ("subs", "/subscriptions/list（套餐/额度）"),
+        ("stats", "/use-log/stats*（速率/趋势/汇总）"),
+        ("logs", "/use-log/list（使用记录明细）"),
+    ):
+        p_dashboard.add_argument(
+            f"--watch-{group}",
+            default=None,
+            help=f"单独设置 {label} 的刷新间隔（例如 10s/5m；0s 关闭；默认沿用 --watch）",
+        )
+    p_dashboard.add_argument(
+        "--watch-jitter",
+        type=float,
+        default=0.1,
+        help="刷新间隔随机抖动比例（0~0.5；例如 0.1 表示 ±10%%，避免多个数据源同一时刻请求）",
+    )
     p_dashboard.add_argument(
         "--range",
         default="today",
@@ -107,6 +137,47 @@ def build_parser() -> argparse.ArgumentParser:
         choices=["auto", "hour", "day"],
         help="趋势粒度（auto：range<=48h 用 hour，否则 day）",
     )
+    p_dashboard.add_argument(
+        "--pool-size",
+        type=int,
+        default=10,
+        help="HTTP 连接池大小（App 级长连接池，跨刷新/跨屏复用）",
+    )
+    p_dashboard.add_argument(
+        "--pool-idle-timeout",
+        default="auto",
+        help=(
+            "连接池空闲连接保活时长（支持 s/m/h 后缀；例如 60s/5m）。\n"
+            "auto：max(60s, 2 × --watch)，保证两次刷新之间连接不被回收。"
+        ),
+    )
+    p_dashboard.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=4,
+        help="每轮刷新的最大并发请求数（6 个端点并发拉取；1 表示顺序请求）",
+    )
+    p_dashboard.add_argument("--http2", action="store_true", help=_HTTP2_HELP)
+    p_dashboard.add_argument(
+        "--sync-logs",
+        default=None,
+        help="后台增量同步使用明细到本地归档的间隔（例如 5m；默认关闭；同 `rightcodes sync`）",
+    )
+    p_dashboard.add_argument(
+        "--attach",
+        nargs="?",
+        const="default",
+        default=None,
+        help=(
+            "订阅 `rightcodes daemon` 推送的数据（不自行请求 API；无需登录）。\n"
+            "可指定 socket 路径；省略时使用默认路径。统计口径（range/rate-window）以 daemon 为准。"
+        ),
+    )
+    p_dashboard.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="不使用启动快照（默认启动时先显示上次成功刷新的数据，并在后台实时刷新）",
+    )
     p_dashboard.add_argument(
         "--no-keyring",
         action="store_true",
@@ -122,7 +193,106 @@ def build_parser() -> argparse.ArgumentParser:
     )
     p_logs.add_argument("--page-size", type=int, default=50, help="分页大小（默认 50）")
     p_logs.add_argument("--page", type=int, default=1, help="页码（默认 1）")
-    p_logs.add_argument("--format", choices=["table", "json"], default="table", help="输出格式（默认 table）")
+    p_logs.add_argument(
+        "--format",
+        choices=["table", "json", "ndjson"],
+        default="table",
+        help="输出格式（ndjson：每条一行，适合管道处理）",
+    )
+    p_logs.add_argument(
+        "--all",
+        action="store_true",
+        help="从 --page 起翻完整个时间范围的所有页（逐页流式输出，内存占用与总量无关）",
+    )
+    p_logs.add_argument("--max-pages", type=int, default=None, help="最多拉取的页数（隐含逐页流式输出）")
+    p_logs.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help=f"[--all/--max-pages] 并发预取后续页的数量（仍按页码顺序输出；1 表示逐页顺序请求；{_RATE_LIMIT_NOTE}）",
+    )
+    p_logs.add_argument("--http2", action="store_true", help=_HTTP2_HELP)
+    p_logs.add_argument(
+        "--archive",
+        action="store_true",
+        help="同时把在线获取的明细写入本地归档（未脱敏原文，含 IP/密钥名；文件权限 0600）",
+    )
+    p_logs.add_argument(
+        "--local",
+        action="store_true",
+        help="离线查询本地归档（SQLite；由 `rightcodes sync` 或 `logs --archive` 写入）",
+    )
+    p_logs.add_argument("--model", default=None, help="[--local] 按模型过滤")
+    p_logs.add_argument("--key", default=None, help="[--local] 按密钥名过滤")
+    p_logs.add_argument("--channel", default=None, help="[--local] 按渠道过滤")
+    p_logs.add_argument(
+        "--group-by",
+        default=None,
+        choices=["model", "key", "channel", "day", "hour"],
+        help="[--local] 聚合输出 requests/tokens/cost（不输出明细）",
+    )
+
+    p_sync = _add_parser(sub, "sync", help_text="增量同步使用明细到本地归档（基于水位线）")
+    p_sync.add_argument("--base-url", default=None, help="覆盖 base_url（默认 https://right.codes）")
+    p_sync.add_argument("--page-size", type=int, default=100, help="每页条数")
+    p_sync.add_argument(
+        "--lookback",
+        default="1d",
+        help="首次同步（尚无水位线）回看的时间范围（支持 s/m/h/d 后缀；例如 1d/7d）",
+    )
+    p_sync.add_argument(
+        "--backfill",
+        default=None,
+        help="把本地归档的覆盖范围回填到最近 N（例如 7d/30d；用于 dashboard 本地计算历史统计）",
+    )
+    p_sync.add_argument(
+        "--max-pages",
+        type=int,
+        default=None,
+        help=f"单次同步最多请求的页数（默认不限；截断后下次从断点续传；{_RATE_LIMIT_NOTE}）",
+    )
+    p_sync.add_argument("--http2", action="store_true", help=_HTTP2_HELP)
+    p_sync.add_argument(
+        "--no-keyring",
+        action="store_true",
+        help="禁用 keyring（适用于 CI/容器/无 keyring 环境）",
+    )
+
+    p_daemon = _add_parser(sub, "daemon", help_text="共享轮询 daemon：统一拉取一次，经 Unix socket 推送给多个 dashboard")
+    p_daemon.add_argument("--base-url", default=None, help="覆盖 base_url（默认 https://right.codes）")
+    p_daemon.add_argument("--socket", default=None, help="Unix socket 路径（默认全局数据目录 rightcodes-daemon.sock）")
+    p_daemon.add_argument(
+        "--socket-mode",
+        default="600",
+        help="socket 文件权限（八进制；多用户共享时可设为 660 并配合共同的用户组）",
+    )
+    p_daemon.add_argument("--watch", default="30s", help="拉取间隔（与 viewer 数量无关）")
+    p_daemon.add_argument("--range", default="today", help="统计区间（today 或 24h/7d 等；同 dashboard）")
+    p_daemon.add_argument("--rate-window", default="6h", help="速率窗口（同 dashboard）")
+    p_daemon.add_argument("--granularity", default="auto", choices=["auto", "hour", "day"], help="趋势粒度")
+    p_daemon.add_argument("--max-concurrency", type=int, default=4, help="每轮刷新的最大并发请求数")
+    p_daemon.add_argument(
+        "--no-keyring",
+        action="store_true",
+        help="禁用 keyring（适用于 CI/容器/无 keyring 环境）",
+    )
+
+    p_exporter = _add_parser(sub, "exporter", help_text="无界面运行 Prometheus/OpenMetrics exporter（/metrics）")
+    p_exporter.add_argument("--base-url", default=None, help="覆盖 base_url（默认 https://right.codes）")
+    p_exporter.add_argument("--listen", default="127.0.0.1:9877", help="监听地址 host:port")
+    p_exporter.add_argument(
+        "--interval",
+        default="60s",
+        help="后台拉取上游 API 的间隔（scrape 只读缓存，不会增加上游请求）",
+    )
+    p_exporter.add_argument("--range", default="today", help="按模型统计的时间范围（today 或 24h/7d 等）")
+    p_exporter.add_argument("--rate-window", default="6h", help="burn rate 窗口（例如 1h/6h/24h）")
+    p_exporter.add_argument("--max-concurrency", type=int, default=4, help="单轮拉取的最大并发请求数")
+    p_exporter.add_argument(
+        "--no-keyring",
+        action="store_true",
+        help="禁用 keyring（适用于 CI/容器/无 keyring 环境）",
+    )
 
     p_doctor = _add_parser(sub, "doctor", help_text="端点自检与 keys 探测（不输出值）")
     p_doctor.add_argument("--base-url", default=None, help="覆盖 base_url（默认 https://right.codes）")
@@ -148,15 +318,15 @@ def main(argv: list[str] | None = None) -> int:
 
     args = build_parser().parse_args(argv)
 
+    handler_name = _COMMANDS.get(args.command)
+    if handler_name is None:
+        print("Unexpected error: unknown command")
+        return 1
+
     try:
-        if args.command == "login":
-            return cmd_login(args)
-        if args.command == "dashboard":
-            return cmd_dashboard(args)
-        if args.command == "logs":
-            return cmd_logs(args)
-        if args.command == "doctor":
-            return cmd_doctor(args)
+        from rightcodes_tui_dashboard import cli
+
+        return getattr(cli, handler_name)(args)
     except KeyboardInterrupt:
         print("\nInterrupted.")
         return 130
@@ -164,9 +334,6 @@ def main(argv: list[str] | None = None) -> int:
         print(f"Unexpected error: {e.__class__.__name__}")
         return 1
 
-    print("Unexpected error: unknown command")
-    return 1
-
 
 if __name__ == "__main__":
     raise SystemExit(main(sys.argv[1:]))
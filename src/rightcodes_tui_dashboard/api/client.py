@@ -1,11 +1,23 @@
 from __future__ import annotations
 
 import datetime as dt
+import asyncio
+import copy
 import email.utils
-from typing import Any
+import functools
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable
 
 import httpx
 
+from rightcodes_tui_dashboard.api.instrumentation import RequestProbe, RequestSink, default_sinks, emit
+from rightcodes_tui_dashboard.api.json_codec import loads as _loads_json
+from rightcodes_tui_dashboard.api.rate_limit import TokenBucket, shared_rate_limiter
+from rightcodes_tui_dashboard.api.response_cache import ResponseCache
+from rightcodes_tui_dashboard.api.schemas import AdvancedStatsPayload, SubscriptionsPayload, UseLogListPage
 from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
 
 
@@ -28,6 +40,70 @@ def extract_user_token(payload: dict[str, Any]) -> str | None:
     return None
 
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_POOL_IDLE_TIMEOUT = 60.0
+
+# 默认使用进程内共享、跨进程持久化的限流器（见 `shared_rate_limiter`）；显式传 None 关闭。
+_SHARED_LIMITER: Any = object()
+
+
+@dataclass
+class ConnectionStats:
+    """连接池复用统计（用于确认 keep-alive 生效：握手次数应接近“每会话一次”）。
+
+    Attributes:
+        requests: 已完成的 HTTP 请求数（含非 2xx）。
+        connections_opened: 新建 TCP 连接数（每次新建意味着一次 TCP+TLS 握手）。
+        coalesced: 与进行中的相同请求合并（未实际发送）的调用数。
+        http2_requests: 经 HTTP/2 完成的请求数。
+        wire_bytes: 响应体传输字节数（压缩后）。
+        decoded_bytes: 响应体解压后的字节数。
+        transfers: 按 endpoint 的 (请求数, wire_bytes, decoded_bytes)。
+    """
+
+    requests: int = 0
+    connections_opened: int = 0
+    coalesced: int = 0
+    http2_requests: int = 0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    transfers: dict[str, tuple[int, int, int]] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def reused(self) -> int:
+        """复用已有连接完成的请求数。"""
+
+        return max(0, self.requests - self.connections_opened)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_connection(self) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def record_coalesced(self) -> None:
+        with self._lock:
+            self.coalesced += 1
+
+    @property
+    def compression_ratio(self) -> float | None:
+        """decoded / wire（>1 表示压缩生效；尚无响应时为 None）。"""
+
+        return self.decoded_bytes / self.wire_bytes if self.wire_bytes else None
+
+    def record_transfer(self, endpoint: str, *, wire_bytes: int, decoded_bytes: int, http_version: str) -> None:
+        with self._lock:
+            if http_version == "HTTP/2":
+                self.http2_requests += 1
+            self.wire_bytes += wire_bytes
+            self.decoded_bytes += decoded_bytes
+            count, wire, decoded = self.transfers.get(endpoint, (0, 0, 0))
+            self.transfers[endpoint] = (count + 1, wire + wire_bytes, decoded + decoded_bytes)
+
+
 class RightCodesApiClient:
     """Right.codes HTTP API 客户端（MVP）。
 
@@ -35,6 +111,15 @@ class RightCodesApiClient:
     - 自动注入 Authorization（若 token 存在）
     - 401/403/429 做错误映射；其它非 2xx 统一 ApiError
     - JSON 解析失败不崩溃：返回空 dict 以便上层降级展示
+    - 底层 httpx.Client 自带 keep-alive 连接池；长生命周期实例（例如 TUI App 持有）可跨刷新复用连接
+    - 发送前经过令牌桶限流（`rate_limiter`）：主动控制速率，并从 429 的 Retry-After 学习
+    - 相同的 GET（endpoint + 参数）并发调用合并为一次请求（single-flight；见 `stats.coalesced`）
+    - 可选响应缓存（`response_cache`；按 endpoint TTL + LRU）：TTL 内的相同 GET 直接返回本地结果
+    - 显式协商压缩（Accept-Encoding：gzip/deflate，安装 brotli 时加 br）；`stats` 记录传输/解压后字节数
+    - `http2=True` 时启用 HTTP/2 多路复用（需要 h2：`pip install "httpx[http2]"`；未安装时回退 HTTP/1.1，
+      实际是否启用见 `self.http2`）
+    - 每次请求的连接/TTFB/总耗时、状态、字节数与解码耗时交给 `sinks`（见 api/instrumentation.py；
+      默认仅在设置 `RIGHTCODES_REQUEST_LOG` 时写入 NDJSON）
     """
 
     def __init__(
@@ -44,14 +129,29 @@ class RightCodesApiClient:
         token: str | None,
         timeout: float = 15.0,
         trust_env: bool = False,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        rate_limiter: TokenBucket | None = _SHARED_LIMITER,
+        response_cache: ResponseCache | None = None,
+        http2: bool = False,
+        sinks: Iterable[RequestSink] | None = None,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self._token = token
+        self.stats = ConnectionStats()
+        self.rate_limiter = shared_rate_limiter(self.base_url) if rate_limiter is _SHARED_LIMITER else rate_limiter
+        self._inflight: dict[Hashable, Future[Any]] = {}
+        self._inflight_lock = threading.Lock()
+        self.response_cache = response_cache
+        self.http2 = bool(http2) and http2_available()
+        self.sinks: list[RequestSink] = list(default_sinks() if sinks is None else sinks)
         self._client = httpx.Client(
             base_url=self.base_url,
             timeout=timeout,
-            headers={"Accept": "application/json"},
+            headers=_default_headers(),
             trust_env=trust_env,
+            limits=_pool_limits(pool_size=pool_size, pool_idle_timeout=pool_idle_timeout),
+            http2=self.http2,
         )
 
     def set_token(self, token: str | None) -> None:
@@ -94,7 +194,7 @@ class RightCodesApiClient:
         data = self._request_json("GET", "/auth/me")
         return data if isinstance(data, dict) else {}
 
-    def list_subscriptions(self) -> dict[str, Any]:
+    def list_subscriptions(self) -> SubscriptionsPayload:
         """GET /subscriptions/list。"""
 
         data = self._request_json("GET", "/subscriptions/list")
@@ -118,7 +218,7 @@ class RightCodesApiClient:
         start_date: str,
         end_date: str,
         granularity: str,
-    ) -> dict[str, Any]:
+    ) -> AdvancedStatsPayload:
         """GET /use-log/stats/advanced。"""
 
         data = self._request_json(
@@ -135,7 +235,7 @@ class RightCodesApiClient:
         page_size: int,
         start_date: str | None = None,
         end_date: str | None = None,
-    ) -> dict[str, Any]:
+    ) -> UseLogListPage:
         """GET /use-log/list。"""
 
         params: dict[str, Any] = {"page": page, "page_size": page_size}
@@ -147,34 +247,430 @@ class RightCodesApiClient:
         return data if isinstance(data, dict) else {}
 
     def _request_json(self, method: str, url: str, **kwargs: Any) -> Any:
-        headers = dict(kwargs.pop("headers", {}) or {})
-        if self._token:
-            headers["Authorization"] = f"Bearer {self._token}"
+        key = _flight_key(self._token, method, url, kwargs)
+        if key is None:
+            return self._send(method, url, **kwargs)
+        cache = self.response_cache
+        if cache is not None:
+            hit, cached = cache.get(key, url)
+            if hit:
+                return cached
+
+        with self._inflight_lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if flight is None:
+                flight = self._inflight[key] = Future()
+        if not leader:
+            self.stats.record_coalesced()
+            # 共享同一结果：返回副本，避免调用方之间互相影响（异常原样抛出）。
+            return copy.deepcopy(flight.result())
 
         try:
-            resp = self._client.request(method, url, headers=headers, **kwargs)
+            result = self._send(method, url, **kwargs)
+        except BaseException as e:
+            flight.set_exception(e)
+            raise
+        else:
+            if cache is not None:
+                cache.put(key, url, result)
+            flight.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> Any:
+        headers = _auth_headers(self._token, kwargs.pop("headers", None))
+        extensions = dict(kwargs.pop("extensions", {}) or {})
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire()
+            if wait > 0:
+                time.sleep(wait)
+        probe = RequestProbe(on_connect=self.stats.record_connection) if self.sinks else None
+        extensions.setdefault("trace", self._trace if probe is None else probe.trace)
+        try:
+            resp = self._client.request(method, url, headers=headers, extensions=extensions, **kwargs)
         except httpx.RequestError as e:
+            _emit_failure(self.sinks, probe, method, url, e)
             raise ApiError(f"网络错误：{e.__class__.__name__}") from e
+        self.stats.record_request()
+        _record_transfer(self.stats, url, resp)
+        try:
+            return _decode_observed(resp, probe, self.sinks, method=method, url=url)
+        finally:
+            # 采样结束后再反馈限流器：文件锁 I/O 不计入 total/decode 耗时。
+            feedback = _limiter_feedback(resp, self.rate_limiter)
+            if feedback is not None:
+                feedback()
+
+    def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """httpcore trace 回调：统计新建连接数（复用连接不会触发 connect_tcp）。"""
+
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.record_connection()
+
+
+class AsyncRightCodesApiClient:
+    """Right.codes HTTP API 异步客户端（`RightCodesApiClient` 的 httpx.AsyncClient 孪生版本）。
 
-        if resp.status_code in (401, 403):
-            raise AuthError("认证失败（token 可能已过期）。请执行 `rightcodes login` 重新登录。")
-        if resp.status_code == 429:
-            retry_after_seconds, next_retry_at = _parse_retry_after(resp.headers)
-            raise RateLimitError(
-                "触发限流（429）。已进入退避，请稍后重试。",
-                retry_after_seconds=retry_after_seconds,
-                next_retry_at=next_retry_at,
-            )
-        if resp.status_code < 200 or resp.status_code >= 300:
-            raise ApiError(f"API 错误（HTTP {resp.status_code}）。")
-
-        if not resp.content:
-            return {}
+    方法集合、错误映射（401/403/429）与 Retry-After 解析均与同步版本一致；
+    适用于直接在事件循环中请求（无线程切换，任务取消可直接中断请求）。
+    """
+
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        token: str | None,
+        timeout: float = 15.0,
+        trust_env: bool = False,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        rate_limiter: TokenBucket | None = _SHARED_LIMITER,
+        response_cache: ResponseCache | None = None,
+        http2: bool = False,
+        sinks: Iterable[RequestSink] | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self._token = token
+        self.stats = ConnectionStats()
+        self.rate_limiter = shared_rate_limiter(self.base_url) if rate_limiter is _SHARED_LIMITER else rate_limiter
+        self._inflight: dict[Hashable, asyncio.Future[Any]] = {}
+        self.response_cache = response_cache
+        self.http2 = bool(http2) and http2_available()
+        self.sinks: list[RequestSink] = list(default_sinks() if sinks is None else sinks)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers=_default_headers(),
+            trust_env=trust_env,
+            limits=_pool_limits(pool_size=pool_size, pool_idle_timeout=pool_idle_timeout),
+            http2=self.http2,
+        )
+
+    def set_token(self, token: str | None) -> None:
+        """更新客户端 token（用于 login 后复用同一实例）。"""
+
+        self._token = token
 
+    async def aclose(self) -> None:
+        """关闭底层 httpx.AsyncClient。"""
+
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncRightCodesApiClient":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def login(self, *, username: str, password: str) -> str:
+        """POST /auth/login 并返回 token。
+
+        Raises:
+            AuthError: 认证失败（401/403）。
+            RateLimitError: 触发限流（429）。
+            ApiError: 其它错误或 token 缺失。
+        """
+
+        payload = await self._request_json("POST", "/auth/login", json={"username": username, "password": password})
+        if not isinstance(payload, dict):
+            raise ApiError("登录响应不是 JSON object")
+        token = extract_user_token(payload)
+        if not token:
+            raise ApiError("登录成功但响应缺少 token 字段（user_token/userToken）")
+        self._token = token
+        return token
+
+    async def get_me(self) -> dict[str, Any]:
+        """GET /auth/me（用于 token 有效性探测）。"""
+
+        data = await self._request_json("GET", "/auth/me")
+        return data if isinstance(data, dict) else {}
+
+    async def list_subscriptions(self) -> SubscriptionsPayload:
+        """GET /subscriptions/list。"""
+
+        data = await self._request_json("GET", "/subscriptions/list")
+        return data if isinstance(data, dict) else {}
+
+    async def stats_overall(self) -> dict[str, Any]:
+        """GET /use-log/stats/overall。"""
+
+        data = await self._request_json("GET", "/use-log/stats/overall")
+        return data if isinstance(data, dict) else {}
+
+    async def stats_range(self, *, start_date: str, end_date: str) -> dict[str, Any]:
+        """GET /use-log/stats（range）。"""
+
+        data = await self._request_json(
+            "GET", "/use-log/stats", params={"start_date": start_date, "end_date": end_date}
+        )
+        return data if isinstance(data, dict) else {}
+
+    async def stats_advanced(
+        self,
+        *,
+        start_date: str,
+        end_date: str,
+        granularity: str,
+    ) -> AdvancedStatsPayload:
+        """GET /use-log/stats/advanced。"""
+
+        data = await self._request_json(
+            "GET",
+            "/use-log/stats/advanced",
+            params={"start_date": start_date, "end_date": end_date, "granularity": granularity},
+        )
+        return data if isinstance(data, dict) else {}
+
+    async def use_logs_list(
+        self,
+        *,
+        page: int,
+        page_size: int,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> UseLogListPage:
+        """GET /use-log/list。"""
+
+        params: dict[str, Any] = {"page": page, "page_size": page_size}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        data = await self._request_json("GET", "/use-log/list", params=params)
+        return data if isinstance(data, dict) else {}
+
+    async def _request_json(self, method: str, url: str, **kwargs: Any) -> Any:
+        key = _flight_key(self._token, method, url, kwargs)
+        if key is None:
+            return await self._send(method, url, **kwargs)
+        if self.response_cache is not None:
+            hit, cached = self.response_cache.get(key, url)
+            if hit:
+                return cached
+
+        flight = self._inflight.get(key)
+        if flight is not None:
+            self.stats.record_coalesced()
+            return copy.deepcopy(await asyncio.shield(flight))
+
+        flight = asyncio.ensure_future(self._send_and_cache(key, method, url, **kwargs))
+        self._inflight[key] = flight
+        flight.add_done_callback(lambda done: self._flight_done(key, done))
+        # shield：发起者被取消时，仍在等待同一结果的其它调用不受影响。
+        return await asyncio.shield(flight)
+
+    async def _send_and_cache(self, key: Hashable, method: str, url: str, **kwargs: Any) -> Any:
+        result = await self._send(method, url, **kwargs)
+        if self.response_cache is not None:
+            self.response_cache.put(key, url, result)
+        return result
+
+    def _flight_done(self, key: Hashable, flight: asyncio.Future[Any]) -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        if not flight.cancelled():
+            # 所有等待者都已取消时，避免 "exception was never retrieved" 警告。
+            flight.exception()
+
+    async def _send(self, method: str, url: str, **kwargs: Any) -> Any:
+        headers = _auth_headers(self._token, kwargs.pop("headers", None))
+        extensions = dict(kwargs.pop("extensions", {}) or {})
+
+        if self.rate_limiter is not None:
+            # 限流器持有文件锁并读写状态文件：放到线程里，避免阻塞事件循环。
+            wait = await asyncio.to_thread(self.rate_limiter.acquire)
+            if wait > 0:
+                await asyncio.sleep(wait)
+        probe = RequestProbe(on_connect=self.stats.record_connection) if self.sinks else None
+        extensions.setdefault("trace", self._trace if probe is None else probe.atrace)
+        try:
+            resp = await self._client.request(method, url, headers=headers, extensions=extensions, **kwargs)
+        except httpx.RequestError as e:
+            _emit_failure(self.sinks, probe, method, url, e)
+            raise ApiError(f"网络错误：{e.__class__.__name__}") from e
+        self.stats.record_request()
+        _record_transfer(self.stats, url, resp)
         try:
-            return resp.json()
-        except ValueError:
-            return {}
+            return _decode_observed(resp, probe, self.sinks, method=method, url=url)
+        finally:
+            # 采样结束后再反馈限流器（文件锁 I/O 放到线程里）：不计入 total/decode 耗时，也不阻塞事件循环。
+            feedback = _limiter_feedback(resp, self.rate_limiter)
+            if feedback is not None:
+                await asyncio.to_thread(feedback)
+
+    async def _trace(self, event_name: str, info: dict[str, Any]) -> None:
+        """httpcore trace 回调（异步版本必须是 coroutine function）。"""
+
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.record_connection()
+
+
+def _flight_key(token: str | None, method: str, url: str, kwargs: dict[str, Any]) -> Hashable | None:
+    """single-flight 合并 key（仅无请求体的 GET；其它请求返回 None，不合并）。"""
+
+    if method.upper() != "GET" or set(kwargs) - {"params"}:
+        return None
+    params = kwargs.get("params") or {}
+    return (token, url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+
+def http2_available() -> bool:
+    """是否可启用 HTTP/2（httpx 需要可选依赖 h2）。"""
+
+    return _try_import_h2() is not None
+
+
+def accept_encoding() -> str:
+    """本机可解码的压缩格式（brotli 仅在安装了 brotli/brotlicffi 时协商，否则服务端返回 br 会无法解码）。"""
+
+    encodings = ["gzip", "deflate"]
+    if _try_import_brotli() is not None:
+        encodings.append("br")
+    return ", ".join(encodings)
+
+
+def _default_headers() -> dict[str, str]:
+    return {"Accept": "application/json", "Accept-Encoding": accept_encoding()}
+
+
+def _endpoint(url: str) -> str:
+    return url.split("?", 1)[0]
+
+
+def _record_transfer(stats: ConnectionStats, url: str, resp: httpx.Response) -> None:
+    """记录响应体的传输字节数（压缩后）与解压后字节数（按 endpoint 汇总）。"""
+
+    stats.record_transfer(
+        _endpoint(url),
+        wire_bytes=resp.num_bytes_downloaded,
+        decoded_bytes=len(resp.content),
+        http_version=resp.http_version,
+    )
+
+
+def _decode_observed(
+    resp: httpx.Response,
+    probe: RequestProbe | None,
+    sinks: list[RequestSink],
+    *,
+    method: str,
+    url: str,
+) -> Any:
+    """`_decode_response` + 请求采样（probe 为 None 时不采样；decode_ms 只含错误映射与 JSON 解析）。"""
+
+    if probe is None:
+        return _decode_response(resp)
+    finished = time.perf_counter()
+    error: str | None = None
+    try:
+        return _decode_response(resp)
+    except ApiError as e:
+        error = e.__class__.__name__
+        raise
+    finally:
+        emit(
+            sinks,
+            probe.sample(
+                endpoint=_endpoint(url),
+                method=method,
+                finished=finished,
+                status=resp.status_code,
+                error=error,
+                decode_ms=(time.perf_counter() - finished) * 1000.0,
+                wire_bytes=resp.num_bytes_downloaded,
+                decoded_bytes=len(resp.content),
+                http_version=resp.http_version,
+            ),
+        )
+
+
+def _emit_failure(
+    sinks: list[RequestSink], probe: RequestProbe | None, method: str, url: str, error: Exception
+) -> None:
+    """网络错误（未收到响应）的请求采样。"""
+
+    if probe is not None:
+        emit(
+            sinks,
+            probe.sample(
+                endpoint=_endpoint(url), method=method, finished=time.perf_counter(), error=error.__class__.__name__
+            ),
+        )
+
+
+def _auth_headers(token: str | None, headers: Any) -> dict[str, str]:
+    """合并请求头并注入 Authorization（若 token 存在）。"""
+
+    out = dict(headers or {})
+    if token:
+        out["Authorization"] = f"Bearer {token}"
+    return out
+
+
+def _limiter_feedback(resp: httpx.Response, limiter: TokenBucket | None) -> Callable[[], None] | None:
+    """响应需要反馈给限流器时返回反馈调用（同步/异步客户端共用同一口径），否则返回 None。
+
+    口径：
+    - 429：按 Retry-After 暂停并降速
+    - 2xx：仅在速率低于配置速率（`limiter.recovering`）时逐步恢复；已是配置速率时无需读写共享状态
+    """
+
+    if limiter is None:
+        return None
+    if resp.status_code == 429:
+        retry_after_seconds, next_retry_at = _parse_retry_after(resp.headers)
+        return functools.partial(
+            limiter.record_rate_limited, retry_after_seconds=retry_after_seconds, next_retry_at=next_retry_at
+        )
+    if 200 <= resp.status_code < 300 and limiter.recovering:
+        return limiter.record_success
+    return None
+
+
+def _decode_response(resp: httpx.Response) -> Any:
+    """错误映射 + JSON 解析（同步/异步客户端共用；限流反馈见 `_limiter_feedback`）。
+
+    Raises:
+        AuthError: 401/403。
+        RateLimitError: 429（携带 Retry-After 解析结果）。
+        ApiError: 其它非 2xx。
+    """
+
+    if resp.status_code in (401, 403):
+        raise AuthError("认证失败（token 可能已过期）。请执行 `rightcodes login` 重新登录。")
+    if resp.status_code == 429:
+        retry_after_seconds, next_retry_at = _parse_retry_after(resp.headers)
+        raise RateLimitError(
+            "触发限流（429）。已进入退避，请稍后重试。",
+            retry_after_seconds=retry_after_seconds,
+            next_retry_at=next_retry_at,
+        )
+    if resp.status_code < 200 or resp.status_code >= 300:
+        raise ApiError(f"API 错误（HTTP {resp.status_code}）。")
+
+    if not resp.content:
+        return {}
+
+    try:
+        # 直接解码原始 bytes（orjson/msgspec，见 api/json_codec.py）；声明了非 UTF-8 charset 时先按 charset 转为文本。
+        if (resp.charset_encoding or "utf-8").lower().replace("_", "-") in ("utf-8", "utf8"):
+            return _loads_json(resp.content)
+        return _loads_json(resp.text)
+    except ValueError:
+        return {}
+
+
+def _pool_limits(*, pool_size: int, pool_idle_timeout: float) -> httpx.Limits:
+    """构建连接池限制（pool_size 同时作为最大连接数与 keep-alive 连接数）。"""
+
+    size = max(1, int(pool_size))
+    idle = max(0.0, float(pool_idle_timeout))
+    return httpx.Limits(max_connections=size, max_keepalive_connections=size, keepalive_expiry=idle)
 
 
 def _parse_retry_after(headers: httpx.Headers) -> tuple[int | None, dt.datetime | None]:
@@ -207,3 +703,20 @@ def _parse_retry_after(headers: httpx.Headers) -> tuple[int | None, dt.datetime
         return None, parsed
     except (TypeError, ValueError, OverflowError):
         return None, None
+
+
+def _try_import_h2():
+    try:
+        import h2
+    except Exception:
+        return None
+    return h2
+
+
+def _try_import_brotli():
+    for name in ("brotli", "brotlicffi"):
+        try:
+            return __import__(name)
+        except Exception:
+            continue
+    return None
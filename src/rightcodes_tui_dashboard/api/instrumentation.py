@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable, Protocol
+
+# 耗时直方图的桶上界（毫秒；最后一个桶为 +Inf）。
+HISTOGRAM_BOUNDS_MS = (5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0)
+
+# 设置后所有 client 额外把每次请求的耗时写入该 NDJSON 文件（见 `default_sinks`）。
+REQUEST_LOG_ENV = "RIGHTCODES_REQUEST_LOG"
+
+
+@dataclass(frozen=True)
+class RequestSample:
+    """一次 HTTP 请求的耗时/大小/结果（毫秒；不适用的阶段为 None）。
+
+    口径：
+    - connect_ms：新建连接的 DNS + TCP 握手（httpcore 不单独上报 DNS）；复用连接为 None
+    - tls_ms：TLS 握手；ttfb_ms：开始发送到收到响应头
+    - total_ms：开始发送到响应体读取完成（不含限流等待与 JSON 解码）；decode_ms：错误映射 + JSON 解码
+    - error：网络错误或错误映射的异常类名（AuthError/RateLimitError/ApiError）
+    """
+
+    endpoint: str
+    method: str
+    status: int | None
+    error: str | None
+    at: float
+    total_ms: float
+    connect_ms: float | None = None
+    tls_ms: float | None = None
+    ttfb_ms: float | None = None
+    decode_ms: float | None = None
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+    http_version: str | None = None
+
+
+class RequestSink(Protocol):
+    """请求采样的接收方（必须线程安全；异常会被忽略，不影响请求）。"""
+
+    def record(self, sample: RequestSample) -> None: ...
+
+
+@dataclass(frozen=True)
+class EndpointSummary:
+    """单个 endpoint（或 `*` 汇总）的耗时概览（分位数为直方图桶上界的近似值）。"""
+
+    endpoint: str
+    count: int
+    errors: int
+    p50_ms: float | None
+    p95_ms: float | None
+    max_ms: float | None
+    mean_connect_ms: float | None
+    mean_ttfb_ms: float | None
+    mean_decode_ms: float | None
+    wire_bytes: int
+    decoded_bytes: int
+
+    def as_dict(self) -> dict[str, Any]:
+        return {k: (round(v, 1) if isinstance(v, float) else v) for k, v in asdict(self).items()}
+
+
+@dataclass
+class _EndpointHistogram:
+    buckets: list[int] = field(default_factory=lambda: [0] * (len(HISTOGRAM_BOUNDS_MS) + 1))
+    count: int = 0
+    errors: int = 0
+    max_ms: float = 0.0
+    connects: int = 0
+    connect_sum: float = 0.0
+    ttfb_count: int = 0
+    ttfb_sum: float = 0.0
+    decode_count: int = 0
+    decode_sum: float = 0.0
+    wire_bytes: int = 0
+    decoded_bytes: int = 0
+
+    def add(self, sample: RequestSample) -> None:
+        index = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if sample.total_ms <= bound), -1)
+        self.buckets[index] += 1
+        self.count += 1
+        self.errors += 1 if sample.error else 0
+        self.max_ms = max(self.max_ms, sample.total_ms)
+        if sample.connect_ms is not None:
+            self.connects += 1
+            self.connect_sum += sample.connect_ms
+        if sample.ttfb_ms is not None:
+            self.ttfb_count += 1
+            self.ttfb_sum += sample.ttfb_ms
+        if sample.decode_ms is not None:
+            self.decode_count += 1
+            self.decode_sum += sample.decode_ms
+        self.wire_bytes += sample.wire_bytes
+        self.decoded_bytes += sample.decoded_bytes
+
+    def merge(self, other: "_EndpointHistogram") -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        for name in (
+            "count",
+            "errors",
+            "connects",
+            "connect_sum",
+            "ttfb_count",
+            "ttfb_sum",
+            "decode_count",
+            "decode_sum",
+            "wire_bytes",
+            "decoded_bytes",
+        ):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank and n:
+                return HISTOGRAM_BOUNDS_MS[i] if i < len(HISTOGRAM_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def summary(self, endpoint: str) -> EndpointSummary:
+        return EndpointSummary(
+            endpoint=endpoint,
+            count=self.count,
+            errors=self.errors,
+            p50_ms=self.quantile(0.5),
+            p95_ms=self.quantile(0.95),
+            max_ms=self.max_ms if self.count else None,
+            mean_connect_ms=self.connect_sum / self.connects if self.connects else None,
+            mean_ttfb_ms=self.ttfb_sum / self.ttfb_count if self.ttfb_count else None,
+            mean_decode_ms=self.decode_sum / self.decode_count if self.decode_count else None,
+            wire_bytes=self.wire_bytes,
+            decoded_bytes=self.decoded_bytes,
+        )
+
+
+class HistogramSink:
+    """内存直方图：按 endpoint 汇总耗时分布、错误数与字节数（常驻内存与请求数无关）。"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._by_endpoint: dict[str, _EndpointHistogram] = {}
+
+    def record(self, sample: RequestSample) -> None:
+        with self._lock:
+            self._by_endpoint.setdefault(sample.endpoint, _EndpointHistogram()).add(sample)
+
+    def summary(self) -> list[EndpointSummary]:
+        """各 endpoint 的概览（按 endpoint 排序）。"""
+
+        with self._lock:
+            return [hist.summary(name) for name, hist in sorted(self._by_endpoint.items())]
+
+    def overall(self) -> EndpointSummary:
+        """全部 endpoint 的汇总（endpoint 为 `*`）。"""
+
+        total = _EndpointHistogram()
+        with self._lock:
+            for hist in self._by_endpoint.values():
+                total.merge(hist)
+        return total.summary("*")
+
+
+class NdjsonSink:
+    """逐条追加写入 NDJSON 文件（每次写入独立打开，多进程追加同一文件时每行保持完整）。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, sample: RequestSample) -> None:
+        line = json.dumps(asdict(sample), ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self.path.open("a", encoding="utf-8") as fp:
+                fp.write(line)
+
+
+def default_sinks() -> list[RequestSink]:
+    """client 默认附带的 sinks：设置 `RIGHTCODES_REQUEST_LOG` 时写入该 NDJSON 文件。"""
+
+    path = os.environ.get(REQUEST_LOG_ENV, "").strip()
+    return [NdjsonSink(Path(path).expanduser())] if path else []
+
+
+class RequestProbe:
+    """单次请求的 httpcore trace 采集（每个请求一个实例；并发请求互不干扰）。"""
+
+    def __init__(self, *, on_connect: Any = None) -> None:
+        self._on_connect = on_connect
+        self.started = time.perf_counter()
+        self._marks: dict[str, float] = {}
+
+    def trace(self, event_name: str, info: dict[str, Any]) -> None:
+        self._marks.setdefault(event_name, time.perf_counter())
+        if event_name == "connection.connect_tcp.complete" and self._on_connect is not None:
+            self._on_connect()
+
+    async def atrace(self, event_name: str, info: dict[str, Any]) -> None:
+        """异步 client 的 trace 回调（必须是 coroutine function）。"""
+
+        self.trace(event_name, info)
+
+    def sample(
+        self,
+        *,
+        endpoint: str,
+        method: str,
+        finished: float,
+        status: int | None = None,
+        error: str | None = None,
+        decode_ms: float | None = None,
+        wire_bytes: int = 0,
+        decoded_bytes: int = 0,
+        http_version: str | None = None,
+    ) -> RequestSample:
+        ttfb_end = self._marks.get("http11.receive_response_headers.complete") or self._marks.get(
+            "http2.receive_response_headers.complete"
+        )
+        return RequestSample(
+            endpoint=endpoint,
+            method=method.upper(),
+            status=status,
+            error=error,
+            at=time.time(),
+            total_ms=(finished - self.started) * 1000.0,
+            connect_ms=self._span("connection.connect_tcp"),
+            tls_ms=self._span("connection.start_tls"),
+            ttfb_ms=None if ttfb_end is None else (ttfb_end - self.started) * 1000.0,
+            decode_ms=decode_ms,
+            wire_bytes=wire_bytes,
+            decoded_bytes=decoded_bytes,
+            http_version=http_version,
+        )
+
+    def _span(self, prefix: str) -> float | None:
+        started = self._marks.get(f"{prefix}.started")
+        completed = self._marks.get(f"{prefix}.complete")
+        if started is None or completed is None:
+            return None
+        return (completed - started) * 1000.0
+
+
+def emit(sinks: Iterable[RequestSink], sample: RequestSample) -> None:
+    """分发采样（sink 异常被忽略：观测不应影响请求本身）。"""
+
+    for sink in sinks:
+        try:
+            sink.record(sample)
+        except Exception:
+            continue
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Callable
+
+_BACKEND_UNSET: Any = object()
+_backend: Any = _BACKEND_UNSET
+
+
+def json_backend() -> tuple[str, Callable[[bytes], Any]]:
+    """返回 (名称, 解码函数)：优先 orjson，其次 msgspec，否则标准库 json。
+
+    说明：
+    - 均为可选依赖；`RIGHTCODES_NO_FAST_JSON=1` 强制使用标准库
+    - 首次调用时才导入（不影响 CLI 冷启动）
+    - 解码结果均为普通 dict/list（未知字段原样保留，抽取仍由 ShapePlan 负责）
+    """
+
+    global _backend
+    if _backend is _BACKEND_UNSET:
+        _backend = _select_backend()
+    return _backend
+
+
+def loads(data: bytes | str) -> Any:
+    """解码 JSON（失败统一抛出 ValueError）。"""
+
+    _name, decode = json_backend()
+    try:
+        return decode(data)
+    except ValueError:
+        raise
+    except Exception as e:  # msgspec.DecodeError 不是 ValueError 的子类
+        raise ValueError(str(e)) from e
+
+
+def _select_backend() -> tuple[str, Callable[[bytes], Any]]:
+    if not os.environ.get("RIGHTCODES_NO_FAST_JSON"):
+        orjson = _try_import_orjson()
+        if orjson is not None:
+            return "orjson", orjson.loads
+        msgspec = _try_import_msgspec()
+        if msgspec is not None:
+            return "msgspec", msgspec.json.decode
+    return "json", json.loads
+
+
+def _try_import_orjson():
+    try:
+        import orjson
+    except Exception:
+        return None
+    return orjson
+
+
+def _try_import_msgspec():
+    try:
+        import msgspec
+    except Exception:
+        return None
+    return msgspec
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator
+
+from rightcodes_tui_dashboard.api.client import RightCodesApiClient
+from rightcodes_tui_dashboard.errors import RateLimitError
+from rightcodes_tui_dashboard.services.backoff import compute_next_retry_at
+from rightcodes_tui_dashboard.services.calculations import extract_use_logs_items
+
+
+DEFAULT_PREFETCH_CONCURRENCY = 4
+
+
+@dataclass(frozen=True)
+class UseLogPage:
+    """/use-log/list 的一页结果。"""
+
+    page: int
+    items: list[dict[str, Any]]
+    total: int | None
+
+
+def has_more_pages(*, page: int, page_size: int, item_count: int, total: int | None) -> bool:
+    """判断在第 `page` 页之后是否还有下一页。
+
+    口径：
+    - 本页条数不足 page_size（含空页）即视为最后一页
+    - 响应带 total 时，以 total 为准
+    """
+
+    if item_count < page_size:
+        return False
+    if total is not None and page * page_size >= total:
+        return False
+    return True
+
+
+def extract_total(payload: dict[str, Any]) -> int | None:
+    """从 /use-log/list 响应中抽取总条数（缺失/非整数返回 None）。"""
+
+    total = payload.get("total")
+    if isinstance(total, bool) or not isinstance(total, int):
+        return None
+    return total
+
+
+def iter_use_log_pages(
+    client: RightCodesApiClient,
+    *,
+    page_size: int,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    start_page: int = 1,
+    max_pages: int | None = None,
+    max_concurrency: int = 1,
+    rate_limit_retries: int = 0,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[UseLogPage]:
+    """逐页拉取 /use-log/list，按页码顺序产出。
+
+    口径：
+    - max_concurrency<=1：惰性顺序拉取（调用方消费完一页才请求下一页）
+    - max_concurrency>1 且首页带 total：剩余页码已确定，以有界窗口并发预取
+      （最多 max_concurrency 页在途/待消费；内存占用与总页数无关）
+    - 首页不带 total 时无法预知页数，退化为顺序拉取
+    - 429：所有在途请求共同暂停到 next retry（Retry-After 优先，否则指数退避），
+      同一页最多重试 rate_limit_retries 次
+
+    Args:
+        client: 同步 API client（httpx.Client 线程安全，可跨线程共用连接池）。
+        page_size: 每页条数。
+        start_date/end_date: 时间范围（同 `use_logs_list`）。
+        start_page: 起始页码。
+        max_pages: 最多请求的页数（None 表示直到最后一页）。
+        max_concurrency: 预取并发数。
+        rate_limit_retries: 单页遇到 429 时的重试次数（0 表示直接抛出）。
+        sleep: 可注入的 sleep（用于离线单测）。
+
+    Raises:
+        AuthError/RateLimitError/ApiError: 与 `use_logs_list` 一致（已产出的页不受影响）。
+    """
+
+    page_size = max(1, int(page_size))
+    page = max(1, int(start_page))
+    last_page = None if max_pages is None else page + max(1, int(max_pages)) - 1
+    fetcher = _PageFetcher(
+        client,
+        page_size=page_size,
+        start_date=start_date,
+        end_date=end_date,
+        rate_limit_retries=rate_limit_retries,
+        sleep=sleep,
+    )
+
+    first = fetcher.fetch(page)
+    yield first
+    if not has_more_pages(page=page, page_size=page_size, item_count=len(first.items), total=first.total):
+        return
+    if last_page is not None and page >= last_page:
+        return
+
+    if max_concurrency <= 1 or first.total is None:
+        while last_page is None or page < last_page:
+            page += 1
+            current = fetcher.fetch(page)
+            yield current
+            if not has_more_pages(page=page, page_size=page_size, item_count=len(current.items), total=current.total):
+                return
+        return
+
+    total_pages = (first.total + page_size - 1) // page_size
+    if last_page is not None:
+        total_pages = min(total_pages, last_page)
+    pending_pages = iter(range(page + 1, total_pages + 1))
+    window: deque[Future[UseLogPage]] = deque()
+
+    with ThreadPoolExecutor(max_workers=int(max_concurrency), thread_name_prefix="rightcodes-pages") as pool:
+        try:
+            for next_page in pending_pages:
+                window.append(pool.submit(fetcher.fetch, next_page))
+                if len(window) >= max_concurrency:
+                    break
+            while window:
+                current = window.popleft().result()
+                yield current
+                if not has_more_pages(
+                    page=current.page,
+                    page_size=page_size,
+                    item_count=len(current.items),
+                    total=current.total,
+                ):
+                    return
+                next_page = next(pending_pages, None)
+                if next_page is not None:
+                    window.append(pool.submit(fetcher.fetch, next_page))
+        finally:
+            # 提前结束（异常/调用方停止消费）时，不再发起尚未开始的请求。
+            for future in window:
+                future.cancel()
+
+
+class _PageFetcher:
+    """拉取单页 + 429 退避（多个线程共享同一个暂停截止时间）。"""
+
+    def __init__(
+        self,
+        client: RightCodesApiClient,
+        *,
+        page_size: int,
+        start_date: str | None,
+        end_date: str | None,
+        rate_limit_retries: int,
+        sleep: Callable[[float], None],
+    ) -> None:
+        self._client = client
+        self._page_size = page_size
+        self._start_date = start_date
+        self._end_date = end_date
+        self._retries = max(0, int(rate_limit_retries))
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._paused_until: dt.datetime | None = None
+
+    def fetch(self, page: int) -> UseLogPage:
+        attempt = 0
+        while True:
+            self._wait_if_paused()
+            try:
+                payload = self._client.use_logs_list(
+                    page=page,
+                    page_size=self._page_size,
+                    start_date=self._start_date,
+                    end_date=self._end_date,
+                )
+            except RateLimitError as e:
+                attempt += 1
+                if attempt > self._retries:
+                    raise
+                self._pause(e, attempt)
+                continue
+            return UseLogPage(page=page, items=extract_use_logs_items(payload), total=extract_total(payload))
+
+    def _pause(self, err: RateLimitError, attempt: int) -> None:
+        now = dt.datetime.now()
+        retry_at = err.next_retry_at or compute_next_retry_at(
+            now=now,
+            attempt=attempt,
+            base_delay_seconds=5,
+            max_delay_seconds=300,
+        )
+        with self._lock:
+            if self._paused_until is None or retry_at > self._paused_until:
+                self._paused_until = retry_at
+
+    def _wait_if_paused(self) -> None:
+        with self._lock:
+            paused_until = self._paused_until
+        if paused_until is None:
+            return
+        remaining = (paused_until - dt.datetime.now()).total_seconds()
+        if remaining > 0:
+            self._sleep(remaining)
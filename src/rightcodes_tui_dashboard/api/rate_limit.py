@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from rightcodes_tui_dashboard.errors import RateLimitError
+
+DEFAULT_RATE_LIMIT = "60/m"
+RATE_LIMIT_STATE_FILENAME = "rate-limit.json"
+
+# 需要等待超过该时长时不再阻塞请求，直接抛出 RateLimitError（交给调用方既有的退避逻辑）。
+DEFAULT_MAX_WAIT_SECONDS = 10.0
+
+# 收到 429 时速率减半（不低于配置速率的 1/8）；之后每次成功请求恢复配置速率的 1/20。
+_DECREASE_FACTOR = 0.5
+_MIN_RATE_FRACTION = 0.125
+_RECOVER_FRACTION = 0.05
+# 429 未携带 Retry-After 时的最短暂停（秒）。
+_FALLBACK_PENALTY_SECONDS = 5.0
+
+_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+_shared: dict[str, "TokenBucket | None"] = {}
+_shared_lock = threading.Lock()
+
+
+class TokenBucket:
+    """客户端令牌桶限流（主动控制请求速率，尽量不触发服务端 429）。
+
+    口径：
+    - 每个请求消耗 1 个令牌；令牌按 `rate_per_second` 连续补充，上限 `burst`
+    - 令牌不足时预约（令牌可为负）：返回需要等待的秒数，多个并发请求依次排队
+    - 需要等待超过 `max_wait_seconds` 时不预约，直接抛出 RateLimitError（next_retry_at 为可发送时间）
+    - 学习 Retry-After：429 时暂停到服务端给出的时间，并把速率减半；成功请求逐步恢复到配置速率
+    - `state_path` 不为空时，状态保存在该文件中并以文件锁串行化：多个进程（dashboard/CLI/daemon）共享同一个桶
+      （无 fcntl 的平台或文件不可写时退化为进程内状态）
+    - 速率已是配置速率时 `record_success` 不读写状态文件（`recovering` 为 False；由 acquire/429 更新），
+      正常情况下每个请求只有 acquire 一次文件锁
+    """
+
+    def __init__(
+        self,
+        *,
+        rate_per_second: float,
+        burst: float,
+        state_path: Path | None = None,
+        scope: str = "default",
+        max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if rate_per_second <= 0 or burst < 1:
+            raise ValueError("rate_per_second must be > 0 and burst >= 1")
+        self.rate_per_second = float(rate_per_second)
+        self.burst = float(burst)
+        self.max_wait_seconds = float(max_wait_seconds)
+        self._state_path = state_path
+        self._scope = scope
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._memory: dict[str, float] = {}
+        # 其它进程可能已降速：首次成功请求读一次共享状态。
+        self._recovering = True
+
+    @property
+    def recovering(self) -> bool:
+        """速率是否低于配置速率（上次读到的共享状态；为 False 时 record_success 无需文件 I/O）。"""
+
+        return self._recovering
+
+    def acquire(self) -> float:
+        """预约一个令牌，返回发送前需要等待的秒数（调用方负责 sleep）。
+
+        Raises:
+            RateLimitError: 需要等待超过 `max_wait_seconds`（未消耗令牌）。
+        """
+
+        with self._state() as state:
+            now = self._clock()
+            self._refill(state, now)
+            self._recovering = state["rate"] < self.rate_per_second
+            wait = max(0.0, state["blocked_until"] - now)
+            if state["tokens"] < 1.0:
+                wait = max(wait, (1.0 - state["tokens"]) / state["rate"])
+            if wait > self.max_wait_seconds:
+                raise RateLimitError(
+                    "本地限流：请求过于频繁，已暂停发送。",
+                    retry_after_seconds=int(wait + 0.999),
+                    next_retry_at=dt.datetime.now() + dt.timedelta(seconds=wait),
+                )
+            state["tokens"] -= 1.0
+            return wait
+
+    def record_success(self) -> None:
+        """成功请求：逐步恢复到配置速率（已是配置速率时直接返回）。"""
+
+        if not self._recovering:
+            return
+        with self._state() as state:
+            if state["rate"] < self.rate_per_second:
+                state["rate"] = min(self.rate_per_second, state["rate"] + self.rate_per_second * _RECOVER_FRACTION)
+            self._recovering = state["rate"] < self.rate_per_second
+
+    def record_rate_limited(self, *, retry_after_seconds: float | None = None, next_retry_at: dt.datetime | None = None) -> None:
+        """收到 429：暂停到 Retry-After 并降低速率。"""
+
+        with self._state() as state:
+            now = self._clock()
+            self._refill(state, now)
+            if retry_after_seconds is None and next_retry_at is not None:
+                retry_after_seconds = (next_retry_at - dt.datetime.now()).total_seconds()
+            if retry_after_seconds is None or retry_after_seconds <= 0:
+                retry_after_seconds = _FALLBACK_PENALTY_SECONDS
+            if state["blocked_until"] <= now:
+                # 同一轮并发请求可能同时收到多个 429：每次暂停只降速一次。
+                state["rate"] = max(self.rate_per_second * _MIN_RATE_FRACTION, state["rate"] * _DECREASE_FACTOR)
+            state["blocked_until"] = max(state["blocked_until"], now + float(retry_after_seconds))
+            state["tokens"] = min(state["tokens"], 0.0)
+            self._recovering = state["rate"] < self.rate_per_second
+
+    def snapshot(self) -> dict[str, float]:
+        """当前状态（tokens/rate/blocked_until；用于展示与测试）。"""
+
+        with self._state() as state:
+            self._refill(state, self._clock())
+            return dict(state)
+
+    def _refill(self, state: dict[str, float], now: float) -> None:
+        elapsed = max(0.0, now - state["updated"])
+        state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+    def _state(self) -> "_LockedState":
+        return _LockedState(self)
+
+    def _initial(self) -> dict[str, float]:
+        return {"tokens": self.burst, "updated": self._clock(), "blocked_until": 0.0, "rate": self.rate_per_second}
+
+
+class _LockedState:
+    """进程内锁 + 可选文件锁下读写桶状态（with 块结束时写回）。"""
+
+    def __init__(self, bucket: TokenBucket) -> None:
+        self._bucket = bucket
+        self._file: Any = None
+        self._all: dict[str, Any] = {}
+        self._state: dict[str, float] = {}
+
+    def __enter__(self) -> dict[str, float]:
+        bucket = self._bucket
+        bucket._lock.acquire()
+        try:
+            self._file = _open_locked(bucket._state_path)
+            if self._file is not None:
+                self._all = _read_states(self._file)
+                raw = self._all.get(bucket._scope)
+            else:
+                raw = bucket._memory or None
+            self._state = _coerce_state(raw) or bucket._initial()
+        except BaseException:
+            self._release()
+            raise
+        return self._state
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        bucket = self._bucket
+        try:
+            if self._file is not None:
+                self._all[bucket._scope] = self._state
+                try:
+                    _write_states(self._file, self._all)
+                except OSError:
+                    bucket._memory = dict(self._state)
+            else:
+                bucket._memory = dict(self._state)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        if self._file is not None:
+            try:
+                _unlock(self._file)
+            finally:
+                self._file.close()
+                self._file = None
+        self._bucket._lock.release()
+
+
+def parse_rate(text: str) -> float | None:
+    """解析速率配置（例如 `60/m`、`2/s`、`1000/h`；`off`/`0` 表示关闭），返回 requests/second。
+
+    Raises:
+        ValueError: 格式不合法。
+    """
+
+    raw = text.strip().lower()
+    if raw in ("", "off", "none", "0", "false"):
+        return None
+    count_text, sep, unit = raw.partition("/")
+    if not sep:
+        unit = "s"
+    if unit not in _UNITS:
+        raise ValueError(f"Invalid rate limit: {text}")
+    count = float(count_text)
+    if count <= 0:
+        return None
+    return count / _UNITS[unit]
+
+
+def shared_rate_limiter(base_url: str) -> TokenBucket | None:
+    """进程内共享的限流器（按 base_url 区分；状态文件位于全局数据目录，跨进程共享）。
+
+    配置：环境变量 `RIGHTCODES_RATE_LIMIT`（默认 60/m；`off` 关闭）。无法解析时使用默认值。
+    """
+
+    with _shared_lock:
+        if base_url in _shared:
+            return _shared[base_url]
+        raw = os.environ.get("RIGHTCODES_RATE_LIMIT", DEFAULT_RATE_LIMIT)
+        try:
+            rate = parse_rate(raw)
+        except ValueError:
+            rate = parse_rate(DEFAULT_RATE_LIMIT)
+        limiter = None
+        if rate is not None:
+            limiter = TokenBucket(
+                rate_per_second=rate,
+                burst=max(1.0, min(20.0, rate * 20.0)),
+                state_path=_default_state_path(),
+                scope=base_url,
+            )
+        _shared[base_url] = limiter
+        return limiter
+
+
+def _default_state_path() -> Path | None:
+    try:
+        from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
+
+        return resolve_app_data_path(RATE_LIMIT_STATE_FILENAME)
+    except Exception:
+        return None
+
+
+def _open_locked(path: Path | None) -> Any:
+    if path is None:
+        return None
+    fcntl = _try_import_fcntl()
+    if fcntl is None:
+        return None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        handle = os.fdopen(fd, "r+b")
+    except OSError:
+        return None
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+    except OSError:
+        handle.close()
+        return None
+    return handle
+
+
+def _unlock(handle: Any) -> None:
+    fcntl = _try_import_fcntl()
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def _read_states(handle: Any) -> dict[str, Any]:
+    handle.seek(0)
+    raw = handle.read()
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_states(handle: Any, states: dict[str, Any]) -> None:
+    handle.seek(0)
+    handle.truncate()
+    handle.write(json.dumps(states, separators=(",", ":")).encode("utf-8"))
+    handle.flush()
+
+
+def _coerce_state(raw: Any) -> dict[str, float] | None:
+    if not isinstance(raw, dict):
+        return None
+    try:
+        state = {key: float(raw[key]) for key in ("tokens", "updated", "blocked_until", "rate")}
+    except (KeyError, TypeError, ValueError):
+        return None
+    if state["rate"] <= 0:
+        return None
+    return state
+
+
+def _try_import_fcntl():
+    try:
+        import fcntl
+    except Exception:
+        return None
+    return fcntl
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Mapping
+
+DEFAULT_CACHE_ENTRIES = 256
+
+# 各 endpoint 的缓存时长上限（秒；0 或缺失表示不缓存）。
+# dashboard 会再按各刷新分组的间隔收紧（见 `ResponseCache.cap_ttl`），定时刷新总能拿到新数据；
+# 缓存主要服务于重复查看/切屏/同一窗口内的重复请求。
+DEFAULT_ENDPOINT_TTLS: dict[str, float] = {
+    "/auth/me": 30.0,
+    "/subscriptions/list": 60.0,
+    "/use-log/stats/overall": 30.0,
+    "/use-log/stats": 20.0,
+    "/use-log/stats/advanced": 20.0,
+    "/use-log/list": 10.0,
+}
+
+
+@dataclass
+class CacheStats:
+    """响应缓存命中统计。"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def hit_ratio(self) -> float | None:
+        total = self.hits + self.misses
+        return self.hits / total if total else None
+
+    def record(self, *, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def record_eviction(self) -> None:
+        with self._lock:
+            self.evictions += 1
+
+
+class ResponseCache:
+    """内存响应缓存（按 endpoint 设置 TTL + LRU 淘汰；线程安全）。
+
+    口径：
+    - key 由调用方给出（client 使用 token + endpoint + 查询参数，与 single-flight 相同）
+    - 过期条目在读取时删除；超过 `max_entries` 时淘汰最久未使用的条目
+    - 读取返回副本：调用方修改结果不会污染缓存
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_CACHE_ENTRIES,
+        ttls: Mapping[str, float] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._ttls = dict(DEFAULT_ENDPOINT_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def ttl_for(self, url: str) -> float:
+        return float(self._ttls.get(url.split("?", 1)[0], 0.0))
+
+    def cap_ttl(self, endpoint: str, max_seconds: float) -> None:
+        """把 endpoint 的 TTL 收紧到不超过 `max_seconds`（≤0 表示该 endpoint 不再缓存）。"""
+
+        self._ttls[endpoint] = max(0.0, min(self.ttl_for(endpoint), float(max_seconds)))
+
+    def get(self, key: Hashable, url: str) -> tuple[bool, Any]:
+        """查找缓存，返回 (hit, value)。不缓存的 endpoint 不计入统计。"""
+
+        if self.ttl_for(url) <= 0:
+            return False, None
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        self.stats.record(hit=entry is not None)
+        if entry is None:
+            return False, None
+        return True, copy.deepcopy(entry[1])
+
+    def put(self, key: Hashable, url: str, value: Any) -> None:
+        ttl = self.ttl_for(url)
+        if ttl <= 0:
+            return
+        expires_at = self._clock() + ttl
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.stats.record_eviction()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from typing import Any, List, TypedDict, Union
+
+# 已知响应形状（仅用于类型标注；运行时不校验）。
+#
+# 口径：
+# - 均为 total=False：字段可缺失；未列出的字段原样保留（服务端新增字段不影响解析）
+# - 同一含义存在多个 key 变体时一并列出（抽取逻辑见 services/calculations.py、services/use_logs.py，
+#   由 ShapePlan 按响应形状选择实际 key）
+#
+# 注意：`List`/`Union` 写法是为了兼容 Python 3.9（TypedDict 的注解会在运行时求值）。
+
+Number = Union[int, float]
+
+
+class SubscriptionItem(TypedDict, total=False):
+    """/subscriptions/list 中的单个订阅。"""
+
+    tier_id: Union[int, str]
+    name: str
+    total_quota: Number
+    remaining_quota: Number
+    expired_at: str
+
+
+class SubscriptionsPayload(TypedDict, total=False):
+    subscriptions: List[SubscriptionItem]
+
+
+class AdvancedBucket(TypedDict, total=False):
+    """/use-log/stats/advanced 的单个时间 bucket（time/ts/timestamp/date 任一）。"""
+
+    time: Union[str, Number]
+    ts: Union[str, Number]
+    timestamp: Union[str, Number]
+    date: str
+    requests: Number
+    tokens: Number
+    total_tokens: Number
+    cost: Number
+    total_cost: Number
+
+
+class ModelDetailRow(TypedDict, total=False):
+    """`details_by_model` 的一行（model/name/model_name 任一）。"""
+
+    model: str
+    name: str
+    model_name: str
+    total_requests: Number
+    requests: Number
+    total_tokens: Number
+    tokens: Number
+    total_cost: Number
+    cost: Number
+
+
+class AdvancedStatsPayload(TypedDict, total=False):
+    data: List[AdvancedBucket]
+    items: List[AdvancedBucket]
+    series: List[AdvancedBucket]
+    buckets: List[AdvancedBucket]
+    trend: List[AdvancedBucket]
+    details_by_model: List[ModelDetailRow]
+    tokens_by_model: dict
+
+
+class UseLogItem(TypedDict, total=False):
+    """/use-log/list 的单条记录（常见 key；其余变体见 services/use_logs.py）。"""
+
+    id: Union[int, str]
+    log_id: Union[int, str]
+    request_id: str
+    time: str
+    created_at: str
+    model: str
+    model_name: str
+    api_key_name: str
+    key_name: str
+    upstream_prefix: str
+    channel: str
+    route: str
+    usage: dict
+    total_tokens: Number
+    tokens: Number
+    cost: Number
+    total_cost: Number
+    billing_rate: Number
+    ratio: Number
+    billing_source: str
+    balance_type: str
+    ip: str
+    client_ip: str
+
+
+class UseLogListPage(TypedDict, total=False):
+    items: List[UseLogItem]
+    logs: List[UseLogItem]
+    data: Any  # 列表，或嵌套 {"items"/"logs": [...]} 的对象
+    total: int
+    page: int
+    page_size: int
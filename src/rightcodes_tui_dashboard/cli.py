@@ -4,10 +4,16 @@ import argparse
 import datetime as dt
 import getpass
 import json
+import os
+import sqlite3
+import sys
+from dataclasses import asdict, replace
 from pathlib import Path
 from typing import Any
 
-from rightcodes_tui_dashboard.api.client import RightCodesApiClient
+from rightcodes_tui_dashboard.api.client import DEFAULT_POOL_SIZE, RightCodesApiClient, http2_available
+from rightcodes_tui_dashboard.api.instrumentation import EndpointSummary, HistogramSink, default_sinks
+from rightcodes_tui_dashboard.api.pagination import DEFAULT_PREFETCH_CONCURRENCY, iter_use_log_pages
 from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
 from rightcodes_tui_dashboard.privacy import redact_sensitive_fields
 from rightcodes_tui_dashboard.storage.token_store import (
@@ -15,9 +21,14 @@ from rightcodes_tui_dashboard.storage.token_store import (
     LocalFileTokenStore,
     TokenStore,
 )
-from rightcodes_tui_dashboard.ui.app import RightCodesDashboardApp
+from rightcodes_tui_dashboard.storage.use_log_archive import (
+    ARCHIVE_FILENAME,
+    UseLogAggregate,
+    UseLogArchive,
+)
 from rightcodes_tui_dashboard.services.calculations import extract_use_logs_items
-from rightcodes_tui_dashboard.services.use_logs import extract_use_log_tokens
+from rightcodes_tui_dashboard.services.log_sync import DEFAULT_SYNC_PAGE_SIZE, UseLogSyncer, backfill_archive
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch
 from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
 
 
@@ -108,28 +119,47 @@ def cmd_dashboard(args: argparse.Namespace) -> int:
     """`rightcodes dashboard` 子命令实现。"""
 
     base_url = args.base_url or DEFAULT_BASE_URL
-    store = _select_store("auto", disable_keyring=bool(args.no_keyring))
-    token_record = store.load_token()
-    token = token_record.token if token_record else None
-    token = _ensure_token_for_dashboard(base_url=base_url, store=store, token=token)
-    if not token:
-        return 1
+    daemon_socket = _resolve_daemon_socket(args.attach) if getattr(args, "attach", None) else None
+    if daemon_socket is not None:
+        # viewer 只订阅 daemon：不请求 API，也不需要 token。
+        token = None
+    else:
+        store = _select_store("auto", disable_keyring=bool(args.no_keyring))
+        token_record = store.load_token()
+        token = token_record.token if token_record else None
+        token = _ensure_token_for_dashboard(base_url=base_url, store=store, token=token)
+        if not token:
+            return 1
 
     watch_seconds = _parse_duration_seconds(args.watch) if args.watch else 30
     if watch_seconds <= 0:
         watch_seconds = None
 
-    range_mode = "rolling"
-    range_text = (args.range or "").strip()
-    if range_text.lower() in ("today", "td", "今日"):
-        # “今天”必须以日历日为边界动态计算：在 _fetch_data 中按本地 00:00 起算。
-        range_mode = "today"
-        range_seconds = 24 * 3600
-    else:
-        range_seconds = _parse_duration_seconds(range_text) if range_text else 24 * 3600
+    range_mode, range_seconds = _parse_range(args.range)
     rate_window_seconds = _parse_duration_seconds(args.rate_window) if args.rate_window else 6 * 3600
     granularity = args.granularity or "auto"
 
+    pool_idle_text = (getattr(args, "pool_idle_timeout", None) or "auto").strip().lower()
+    if pool_idle_text == "auto":
+        pool_idle_timeout = float(max(60, 2 * (watch_seconds or 0)))
+    else:
+        pool_idle_timeout = float(_parse_duration_seconds(pool_idle_text))
+    pool_size = int(getattr(args, "pool_size", None) or DEFAULT_POOL_SIZE)
+
+    watch_intervals: dict[str, int | None] = {}
+    for group in ("me", "subs", "stats", "logs"):
+        raw = getattr(args, f"watch_{group}", None)
+        if not raw:
+            continue
+        seconds = _parse_duration_seconds(raw)
+        watch_intervals[group] = seconds if seconds > 0 else None
+
+    sync_text = getattr(args, "sync_logs", None)
+    sync_seconds = _parse_duration_seconds(sync_text) if sync_text else 0
+
+    # TUI 依赖（Textual/Rich）较重：只在 dashboard 子命令真正运行时才导入。
+    from rightcodes_tui_dashboard.ui.app import RightCodesDashboardApp
+
     app = RightCodesDashboardApp(
         base_url=base_url,
         token=token,
@@ -138,14 +168,45 @@ def cmd_dashboard(args: argparse.Namespace) -> int:
         range_mode=range_mode,
         rate_window_seconds=rate_window_seconds,
         granularity=granularity,
+        pool_size=pool_size,
+        pool_idle_timeout=pool_idle_timeout,
+        http2=_want_http2(args),
+        max_concurrency=max(1, int(getattr(args, "max_concurrency", None) or 4)),
+        watch_intervals=watch_intervals,
+        watch_jitter=float(getattr(args, "watch_jitter", 0.1)),
+        sync_seconds=sync_seconds if sync_seconds > 0 else None,
+        snapshot=not bool(getattr(args, "no_snapshot", False)) and daemon_socket is None,
+        daemon_socket=daemon_socket,
     )
     app.run()
     return 0
 
 
+def _want_http2(args: argparse.Namespace) -> bool:
+    """解析 `--http2`（缺少 h2 时提示并回退 HTTP/1.1）。"""
+
+    if not getattr(args, "http2", False):
+        return False
+    if not http2_available():
+        print('提示：未安装 h2，已回退 HTTP/1.1（pip install "httpx[http2]"）。', file=sys.stderr)
+        return False
+    return True
+
+
 def cmd_logs(args: argparse.Namespace) -> int:
     """`rightcodes logs` 子命令实现（CLI：table/json，默认脱敏）。"""
 
+    now = dt.datetime.now()
+    range_text = (args.range or "").strip()
+    if range_text.lower() in ("today", "td", "今日"):
+        start_dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        range_seconds = _parse_duration_seconds(range_text) if range_text else 24 * 3600
+        start_dt = now - dt.timedelta(seconds=range_seconds)
+
+    if getattr(args, "local", False):
+        return _cmd_logs_local(args, start_dt=start_dt, end_dt=now)
+
     base_url = args.base_url or DEFAULT_BASE_URL
     store = _select_store("auto")
     token_record = store.load_token()
@@ -155,19 +216,14 @@ def cmd_logs(args: argparse.Namespace) -> int:
         print("未登录：请先执行 `rightcodes login`。")
         return 1
 
-    now = dt.datetime.now()
-    range_text = (args.range or "").strip()
-    if range_text.lower() in ("today", "td", "今日"):
-        start_dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    else:
-        range_seconds = _parse_duration_seconds(range_text) if range_text else 24 * 3600
-        start_dt = now - dt.timedelta(seconds=range_seconds)
-
     start = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
     end = now.strftime("%Y-%m-%dT%H:%M:%S")
 
+    if getattr(args, "all", False) or getattr(args, "max_pages", None):
+        return _cmd_logs_stream(args, base_url=base_url, token=token, start=start, end=end)
+
     try:
-        with RightCodesApiClient(base_url=base_url, token=token) as client:
+        with RightCodesApiClient(base_url=base_url, token=token, http2=_want_http2(args)) as client:
             payload = client.use_logs_list(
                 page=int(args.page),
                 page_size=int(args.page_size),
@@ -186,15 +242,376 @@ def cmd_logs(args: argparse.Namespace) -> int:
         print(f"获取 logs 失败：{e}")
         return 1
 
+    if getattr(args, "archive", False):
+        _archive_items(items)
+
     redacted = [redact_sensitive_fields(x) for x in items if isinstance(x, dict)]
     if args.format == "json":
         print(json.dumps(redacted, ensure_ascii=False, indent=2))
         return 0
+    if args.format == "ndjson":
+        _write_ndjson(redacted)
+        return 0
+
+    _print_logs_table(redacted)
+    return 0
+
+
+def _cmd_logs_stream(args: argparse.Namespace, *, base_url: str, token: str, start: str, end: str) -> int:
+    """`rightcodes logs --all/--max-pages`：逐页拉取并即时输出（内存占用与结果总量无关）。
+
+    说明：
+    - ndjson：每条一行；json：流式输出一个 JSON 数组；table：每页一张表
+    - 错误信息写入 stderr，避免污染管道中的数据
+    - `--concurrency`>1 时并发预取后续页（仍按页码顺序输出）；429 时统一暂停后重试
+    """
+
+    max_pages = int(args.max_pages) if getattr(args, "max_pages", None) else None
+    fmt = args.format
+    emitted = 0
+    archive = _open_archive_quietly() if getattr(args, "archive", False) else None
+    try:
+        with RightCodesApiClient(base_url=base_url, token=token, http2=_want_http2(args)) as client:
+            if fmt == "json":
+                sys.stdout.write("[")
+            for page in iter_use_log_pages(
+                client,
+                page_size=int(args.page_size),
+                start_date=start,
+                end_date=end,
+                start_page=int(args.page),
+                max_pages=max_pages,
+                max_concurrency=max(1, int(getattr(args, "concurrency", None) or DEFAULT_PREFETCH_CONCURRENCY)),
+                rate_limit_retries=3,
+            ):
+                _archive_page(archive, page.items)
+                redacted = [redact_sensitive_fields(x) for x in page.items]
+                if fmt == "ndjson":
+                    _write_ndjson(redacted)
+                elif fmt == "json":
+                    for item in redacted:
+                        sys.stdout.write(("," if emitted else "") + "\n  " + json.dumps(item, ensure_ascii=False))
+                        emitted += 1
+                    sys.stdout.flush()
+                else:
+                    _print_logs_table(redacted)
+            if fmt == "json":
+                sys.stdout.write("\n]\n" if emitted else "]\n")
+                sys.stdout.flush()
+    except BrokenPipeError:
+        # 下游（如 head）提前关闭管道：正常结束，且避免解释器退出时再次 flush 报错。
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 0
+    except AuthError as e:
+        print(f"认证失败：{e}", file=sys.stderr)
+        return 1
+    except RateLimitError as e:
+        retry_at = e.next_retry_at.isoformat(sep=" ", timespec="seconds") if e.next_retry_at else "unknown"
+        print(f"触发限流（429），请稍后重试。Next retry: {retry_at}", file=sys.stderr)
+        return 1
+    except ApiError as e:
+        print(f"获取 logs 失败：{e}", file=sys.stderr)
+        return 1
+    finally:
+        if archive is not None:
+            archive.close()
+    return 0
+
+
+def _write_ndjson(items: list[dict[str, Any]]) -> None:
+    """以 NDJSON（每行一个 JSON 对象）输出并立即 flush，便于管道下游边读边处理。"""
+
+    for item in items:
+        sys.stdout.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")) + "\n")
+    sys.stdout.flush()
+
+
+def _cmd_logs_local(args: argparse.Namespace, *, start_dt: dt.datetime, end_dt: dt.datetime) -> int:
+    """`rightcodes logs --local`：离线查询本地归档（范围/过滤/聚合）。"""
+
+    path = resolve_app_data_path(ARCHIVE_FILENAME)
+    if not path.exists():
+        print("本地归档为空：请先执行 `rightcodes sync`（或 `rightcodes logs --archive`）。")
+        return 1
+
+    filters = {
+        "start": start_dt,
+        "end": end_dt,
+        "model": getattr(args, "model", None),
+        "key": getattr(args, "key", None),
+        "channel": getattr(args, "channel", None),
+    }
+    group_by = getattr(args, "group_by", None)
+
+    with UseLogArchive(path) as archive:
+        if group_by:
+            rows = archive.aggregate(group_by=group_by, **filters)
+            if group_by == "key":
+                # 默认脱敏：密钥名只展示打码形式
+                rows = [replace(r, group=_mask_token(r.group)) for r in rows]
+            if args.format == "json":
+                print(json.dumps([asdict(r) for r in rows], ensure_ascii=False, indent=2))
+            elif args.format == "ndjson":
+                _write_ndjson([asdict(r) for r in rows])
+            else:
+                _print_aggregate_table(rows, group_by=group_by)
+            return 0
+
+        page = max(1, int(args.page))
+        page_size = max(1, int(args.page_size))
+        items = archive.query(limit=page_size, offset=(page - 1) * page_size, **filters)
+
+    redacted = [redact_sensitive_fields(x) for x in items]
+    if args.format == "json":
+        print(json.dumps(redacted, ensure_ascii=False, indent=2))
+        return 0
+    if args.format == "ndjson":
+        _write_ndjson(redacted)
+        return 0
 
     _print_logs_table(redacted)
     return 0
 
 
+def _archive_items(items: list[dict[str, Any]]) -> None:
+    """将在线获取的 use-log items 写入本地归档（仅 `--archive`；尽力而为：失败不影响命令输出）。"""
+
+    if not items:
+        return
+    archive = _open_archive_quietly()
+    if archive is None:
+        return
+    with archive:
+        _archive_page(archive, items)
+
+
+def _open_archive_quietly() -> UseLogArchive | None:
+    try:
+        return UseLogArchive()
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def _archive_page(archive: UseLogArchive | None, items: list[dict[str, Any]]) -> None:
+    if archive is None or not items:
+        return
+    try:
+        archive.upsert_items(items)
+    except (OSError, sqlite3.Error):
+        return
+
+
+def cmd_sync(args: argparse.Namespace) -> int:
+    """`rightcodes sync` 子命令实现（增量同步 use-log 到本地归档）。"""
+
+    base_url = args.base_url or DEFAULT_BASE_URL
+    store = _select_store("auto", disable_keyring=bool(getattr(args, "no_keyring", False)))
+    token_record = store.load_token()
+    token = token_record.token if token_record else None
+
+    if not token:
+        print("未登录：请先执行 `rightcodes login`。")
+        return 1
+
+    lookback_seconds = _parse_duration_seconds(args.lookback)
+    backfill_seconds = _parse_duration_seconds(args.backfill) if args.backfill else None
+    max_pages = int(args.max_pages) if args.max_pages else None
+    page_size = int(args.page_size or DEFAULT_SYNC_PAGE_SIZE)
+    backfilled = None
+
+    try:
+        with UseLogArchive() as archive, RightCodesApiClient(
+            base_url=base_url, token=token, http2=_want_http2(args)
+        ) as client:
+            now = dt.datetime.now()
+            if backfill_seconds is not None:
+                if archive.get_coverage_start() is None:
+                    # 首次同步：直接按回填范围回看。
+                    lookback_seconds = max(lookback_seconds, backfill_seconds)
+                else:
+                    backfill_kwargs = {
+                        "since": now - dt.timedelta(seconds=backfill_seconds),
+                        "page_size": page_size,
+                        "max_pages": max_pages,
+                    }
+                    backfilled = backfill_archive(archive, client, **backfill_kwargs)
+                    if backfilled.resumed and not backfilled.truncated:
+                        # 续传沿用上次的 since：补上与本次 since 之间的间隙。
+                        resumed = backfilled
+                        backfilled = backfill_archive(archive, client, **backfill_kwargs)
+                        backfilled = replace(
+                            backfilled,
+                            pages=resumed.pages + backfilled.pages,
+                            fetched=resumed.fetched + backfilled.fetched,
+                            inserted=resumed.inserted + backfilled.inserted,
+                            resumed=True,
+                        )
+            sync_kwargs = {
+                "now": now,
+                "page_size": page_size,
+                "initial_lookback": dt.timedelta(seconds=lookback_seconds),
+                "max_pages": max_pages,
+            }
+            result = UseLogSyncer(archive, **sync_kwargs).run(client)
+            if result.resumed and not result.truncated:
+                # 上次截断的窗口已续传完成：接着同步该窗口之后的新增明细。
+                resumed = result
+                result = UseLogSyncer(archive, **sync_kwargs).run(client)
+                result = replace(
+                    result,
+                    pages=resumed.pages + result.pages,
+                    fetched=resumed.fetched + result.fetched,
+                    inserted=resumed.inserted + result.inserted,
+                    resumed=True,
+                )
+            total = archive.count()
+            coverage_start = archive.get_coverage_start()
+    except AuthError as e:
+        print(f"认证失败：{e}")
+        return 1
+    except RateLimitError as e:
+        retry_at = e.next_retry_at.isoformat(sep=" ", timespec="seconds") if e.next_retry_at else "unknown"
+        print(f"触发限流（429），请稍后重试（水位线未推进）。Next retry: {retry_at}")
+        return 1
+    except ApiError as e:
+        print(f"同步 logs 失败：{e}")
+        return 1
+    except (OSError, sqlite3.Error) as e:
+        print(f"写入本地归档失败：{e.__class__.__name__}")
+        return 1
+
+    watermark = (
+        result.watermark.time.isoformat(sep=" ", timespec="seconds") if result.watermark is not None else "—"
+    )
+    print(
+        f"同步完成：pages={result.pages} fetched={result.fetched} new={result.inserted} "
+        f"archive={total} watermark={watermark}"
+    )
+    if backfilled is not None:
+        print(f"回填完成：pages={backfilled.pages} fetched={backfilled.fetched} new={backfilled.inserted}")
+        if backfilled.truncated:
+            print("提示：回填已达到 --max-pages 上限，覆盖起点未前移（已记录续传位置）；请再次执行以继续回填。")
+    if coverage_start is not None:
+        print(f"本地覆盖起点：{coverage_start.isoformat(sep=' ', timespec='seconds')}")
+    if result.truncated:
+        print("提示：已达到 --max-pages 上限，水位线未推进（已记录续传位置）；请再次执行 `rightcodes sync` 继续。")
+    return 0
+
+
+def cmd_daemon(args: argparse.Namespace) -> int:
+    """`rightcodes daemon` 子命令实现（共享轮询；经 Unix socket 推送快照给 `dashboard --attach`）。"""
+
+    import asyncio
+
+    from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient
+    from rightcodes_tui_dashboard.services.daemon import DashboardDaemon, unix_sockets_supported
+    from rightcodes_tui_dashboard.services.dashboard_fetch import DashboardFetcher
+    from rightcodes_tui_dashboard.storage.bucket_store import StatsBucketStore, bucket_scope
+
+    if not unix_sockets_supported():
+        print("当前平台不支持 Unix socket，无法运行 daemon。")
+        return 1
+
+    base_url = args.base_url or DEFAULT_BASE_URL
+    store = _select_store("auto", disable_keyring=bool(getattr(args, "no_keyring", False)))
+    token_record = store.load_token()
+    token = token_record.token if token_record else None
+    if not token:
+        print("未登录：请先执行 `rightcodes login`。")
+        return 1
+
+    try:
+        mode = int(str(args.socket_mode), 8)
+    except ValueError:
+        print(f"--socket-mode 格式错误：{args.socket_mode}（应为八进制，例如 600/660）")
+        return 2
+    socket_path = _resolve_daemon_socket(args.socket)
+    interval_seconds = max(1, _parse_duration_seconds(args.watch))
+    range_mode, range_seconds = _parse_range(args.range)
+    bucket_store = StatsBucketStore(scope=bucket_scope(base_url=base_url, token=token))
+    fetcher = DashboardFetcher(
+        range_mode=range_mode,
+        range_seconds=range_seconds,
+        rate_window_seconds=_parse_duration_seconds(args.rate_window) if args.rate_window else 6 * 3600,
+        granularity=args.granularity or "auto",
+        max_concurrency=max(1, int(getattr(args, "max_concurrency", None) or 4)),
+        bucket_store=bucket_store,
+    )
+
+    async def _run() -> None:
+        async with AsyncRightCodesApiClient(base_url=base_url, token=token) as client:
+            daemon = DashboardDaemon(client, fetcher, interval_seconds=interval_seconds)
+            try:
+                await daemon.run(socket_path, mode=mode)
+            finally:
+                bucket_store.close()
+
+    print(f"Daemon 已启动：{socket_path}（每 {interval_seconds}s 拉取一次；viewer：rightcodes dashboard --attach）")
+    try:
+        asyncio.run(_run())
+    except FileExistsError:
+        print(f"已有 daemon 在监听 {socket_path}。")
+        return 1
+    except OSError as e:
+        print(f"监听 {socket_path} 失败：{e.__class__.__name__}")
+        return 1
+    return 0
+
+
+def cmd_exporter(args: argparse.Namespace) -> int:
+    """`rightcodes exporter` 子命令实现（无界面；后台轮询 + `/metrics` 只读缓存）。"""
+
+    from rightcodes_tui_dashboard.services.exporter import MetricsCollector, MetricsPoller, make_server, parse_listen
+
+    base_url = args.base_url or DEFAULT_BASE_URL
+    store = _select_store("auto", disable_keyring=bool(getattr(args, "no_keyring", False)))
+    token_record = store.load_token()
+    token = token_record.token if token_record else None
+    if not token:
+        print("未登录：请先执行 `rightcodes login`。")
+        return 1
+
+    try:
+        address = parse_listen(args.listen)
+    except ValueError:
+        print(f"--listen 格式错误：{args.listen}（应为 host:port）")
+        return 2
+    interval_seconds = max(1, _parse_duration_seconds(args.interval))
+    range_mode, range_seconds = _parse_range(args.range)
+    rate_window_seconds = _parse_duration_seconds(args.rate_window) if args.rate_window else 6 * 3600
+
+    def _on_error(error: Exception) -> None:
+        if isinstance(error, RateLimitError):
+            retry_at = error.next_retry_at.isoformat(sep=" ", timespec="seconds") if error.next_retry_at else "backoff"
+            print(f"触发限流（429），暂停拉取。Next retry: {retry_at}", file=sys.stderr)
+        else:
+            print(f"拉取失败：{error.__class__.__name__}", file=sys.stderr)
+
+    with RightCodesApiClient(base_url=base_url, token=token) as client:
+        collector = MetricsCollector(
+            client,
+            range_mode=range_mode,
+            range_seconds=range_seconds,
+            rate_window_seconds=rate_window_seconds,
+            max_concurrency=max(1, int(getattr(args, "max_concurrency", None) or 4)),
+        )
+        poller = MetricsPoller(collector.collect, interval_seconds=interval_seconds, on_error=_on_error)
+        try:
+            server = make_server(address, poller)
+        except OSError as e:
+            print(f"监听 {args.listen} 失败：{e.__class__.__name__}")
+            return 1
+        host, port = server.server_address[:2]
+        print(f"Exporter 已启动：http://{host}:{port}/metrics（每 {interval_seconds}s 拉取一次）")
+        poller.start()
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            poller.stop()
+    return 0
+
+
 def cmd_doctor(args: argparse.Namespace) -> int:
     """`rightcodes doctor` 子命令实现（脱敏：仅输出 keys）。"""
 
@@ -227,7 +644,8 @@ def cmd_doctor(args: argparse.Namespace) -> int:
     start_6h = (now - dt.timedelta(hours=6)).strftime("%Y-%m-%dT%H:%M:%S")
     end_now = now.strftime("%Y-%m-%dT%H:%M:%S")
 
-    with RightCodesApiClient(base_url=base_url, token=token) as client:
+    timings = HistogramSink()
+    with RightCodesApiClient(base_url=base_url, token=token, sinks=[*default_sinks(), timings]) as client:
         _record("GET /auth/me", client.get_me)
         _record("GET /subscriptions/list", client.list_subscriptions)
         _record("GET /use-log/stats/overall", client.stats_overall)
@@ -245,17 +663,38 @@ def cmd_doctor(args: argparse.Namespace) -> int:
             lambda: client.use_logs_list(page=1, page_size=1, start_date=start_24h, end_date=end_now),
         )
 
+    summary["timings"] = [row.as_dict() for row in timings.summary()]
+
     if not args.no_save:
         out_path = Path(args.out) if args.out else resolve_app_data_path("rightcodes-doctor.json")
         out_path.parent.mkdir(parents=True, exist_ok=True)
         out_path.write_text(json.dumps(summary, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
         print(f"doctor 输出已写入：{out_path}")
+        _print_timings(timings.summary())
     else:
-        print(json.dumps({"endpoints": summary["endpoints"]}, ensure_ascii=False, indent=2))
+        print(json.dumps({"endpoints": summary["endpoints"], "timings": summary["timings"]}, ensure_ascii=False, indent=2))
 
     return 0
 
 
+def _print_timings(rows: list[EndpointSummary]) -> None:
+    """doctor：按 endpoint 输出请求耗时概览（毫秒；connect 含 DNS，仅统计新建连接）。"""
+
+    if not rows:
+        return
+
+    def _ms(value: float | None) -> str:
+        return "—" if value is None else f"{value:.0f}"
+
+    print("端点耗时（ms）：")
+    print(f"  {'endpoint':<28} {'n':>3} {'err':>3} {'max':>7} {'connect':>7} {'ttfb':>7} {'decode':>7} {'bytes':>9}")
+    for row in rows:
+        print(
+            f"  {row.endpoint:<28} {row.count:>3} {row.errors:>3} {_ms(row.max_ms):>7} {_ms(row.mean_connect_ms):>7}"
+            f" {_ms(row.mean_ttfb_ms):>7} {_ms(row.mean_decode_ms):>7} {row.decoded_bytes:>9}"
+        )
+
+
 def _ensure_token_for_dashboard(*, base_url: str, store: TokenStore, token: str | None) -> str | None:
     """确保 dashboard 启动时 token 可用。
 
@@ -324,11 +763,11 @@ def _print_logs_table(items: list[dict[str, Any]]) -> None:
     table.add_column("cost", justify="right", no_wrap=True)
     table.add_column("summary")
 
-    for item in items:
-        time_val = _first_str(item, ("time", "ts", "timestamp", "date", "request_time", "created_at")) or "—"
-        tokens_val = extract_use_log_tokens(item)
-        tokens = "—" if tokens_val is None else f"{int(tokens_val):,}"
-        cost = _first_number_str(item, ("cost", "total_cost", "amount")) or "—"
+    dict_items = [item for item in items if isinstance(item, dict)]
+    for item, record in zip(dict_items, UseLogBatch.from_items(dict_items).records()):
+        time_val = record.time or "—"
+        tokens = "—" if record.tokens is None else f"{int(record.tokens):,}"
+        cost = _fmt_number_str(record.cost)
         summary = item.copy()
         for k in (
             "time",
@@ -352,27 +791,53 @@ def _print_logs_table(items: list[dict[str, Any]]) -> None:
     Console().print(table)
 
 
-def _first_str(payload: dict[str, Any], keys: tuple[str, ...]) -> str | None:
-    """从 payload 中按 keys 顺序取第一个非空 str。"""
+def _print_aggregate_table(rows: list[UseLogAggregate], *, group_by: str) -> None:
+    """以表格方式输出本地归档聚合结果。"""
 
-    for k in keys:
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+    from rich.console import Console
+    from rich.table import Table
 
+    table = Table(title=f"Right.codes Logs（本地归档，按 {group_by} 聚合）", show_lines=False)
+    table.add_column(group_by, no_wrap=True)
+    table.add_column("requests", justify="right", no_wrap=True)
+    table.add_column("tokens", justify="right", no_wrap=True)
+    table.add_column("cost", justify="right", no_wrap=True)
 
-def _first_number_str(payload: dict[str, Any], keys: tuple[str, ...]) -> str | None:
-    """从 payload 中按 keys 顺序取第一个 number 并格式化为字符串。"""
+    for r in rows:
+        group = r.group
+        tokens = "—" if r.tokens is None else f"{int(r.tokens):,}"
+        cost = "—" if r.cost is None else f"{r.cost:.6f}"
+        table.add_row(group, f"{r.requests:,}", tokens, cost)
 
-    for k in keys:
-        v = payload.get(k)
-        if isinstance(v, bool):
-            continue
-        if isinstance(v, (int, float)):
-            number = float(v)
-            return f"{number:.0f}" if number.is_integer() else f"{number:.4f}"
-    return None
+    Console().print(table)
+
+
+def _fmt_number_str(value: float | None) -> str:
+    """格式化 number 为紧凑字符串（整数不带小数；缺失为 `—`）。"""
+
+    if value is None:
+        return "—"
+    return f"{value:.0f}" if value.is_integer() else f"{value:.4f}"
+
+
+def _resolve_daemon_socket(raw: str | None) -> str:
+    """`--attach/--socket` 的路径（未指定或为 default 时使用默认 socket 路径）。"""
+
+    if raw and raw != "default":
+        return str(Path(raw).expanduser())
+    from rightcodes_tui_dashboard.services.daemon import default_socket_path
+
+    return str(default_socket_path())
+
+
+def _parse_range(raw: str | None) -> tuple[str, int]:
+    """解析 `--range`：返回 (range_mode, range_seconds)。"""
+
+    range_text = (raw or "").strip()
+    if range_text.lower() in ("today", "td", "今日"):
+        # “今天”必须以日历日为边界动态计算：拉取时按本地 00:00 起算。
+        return "today", 24 * 3600
+    return "rolling", _parse_duration_seconds(range_text) if range_text else 24 * 3600
 
 
 def _parse_duration_seconds(raw: str) -> int:
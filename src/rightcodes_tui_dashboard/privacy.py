@@ -40,3 +40,23 @@ def redact_sensitive_fields(payload: dict[str, Any]) -> dict[str, Any]:
             out[k] = v
     return out
 
+
+
+def redact_sensitive_tree(value: Any) -> Any:
+    """递归脱敏（dict/list 任意嵌套；口径同 `redact_sensitive_fields`）。
+
+    Args:
+        value: 任意 JSON 形状的值。
+
+    Returns:
+        复制后的值：任意层级的敏感字段值替换为 `***REDACTED***`。
+    """
+
+    if isinstance(value, dict):
+        return {
+            k: "***REDACTED***" if str(k).lower() in _SENSITIVE_KEYS else redact_sensitive_tree(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, list):
+        return [redact_sensitive_tree(v) for v in value]
+    return value
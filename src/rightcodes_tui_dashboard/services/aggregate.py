@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def sum_present(values: Sequence[float | None]) -> float | None:
+    """对列求和（忽略 None）；全部缺失返回 None。
+
+    说明：输入是从 dict 抽取出的 Python list（每个响应只按列抽取一次）；转换为 ndarray 的开销
+    高于向量化求和的收益，因此求和/占比/排序均为纯 Python。
+    """
+
+    present = [v for v in values if v is not None]
+    return sum(present, 0.0) if present else None
+
+
+def drop_missing(values: Sequence[float | None]) -> list[float]:
+    """去掉缺失值（保持顺序）。"""
+
+    return [v for v in values if v is not None]
+
+
+def shares_of(values: Sequence[float | None], total: float) -> list[float | None]:
+    """逐项占比 `value / total`（缺失值的占比为 None）。"""
+
+    return [None if v is None else v / total for v in values]
+
+
+def order_desc(primary: Sequence[float | None], secondary: Sequence[float | None], names: Sequence[str]) -> list[int]:
+    """按 (primary, secondary, name) 降序排列的下标（缺失值视为 0；与 `sorted(..., reverse=True)` 一致）。"""
+
+    keys = [
+        (0.0 if a is None else a, 0.0 if b is None else b, name)
+        for a, b, name in zip(primary, secondary, names)
+    ]
+    return sorted(range(len(keys)), key=keys.__getitem__, reverse=True)
@@ -4,6 +4,9 @@ import datetime as dt
 from dataclasses import dataclass
 from typing import Any, Iterable
 
+from rightcodes_tui_dashboard.services.aggregate import drop_missing, order_desc, shares_of, sum_present
+from rightcodes_tui_dashboard.services.shape import FieldSpec, ShapePlan
+
 
 @dataclass(frozen=True)
 class NormalizedSubscription:
@@ -230,6 +233,12 @@ def extract_advanced_buckets(payload: dict[str, Any]) -> list[dict[str, Any]] |
     return None
 
 
+def extract_bucket_start(bucket: dict[str, Any]) -> dt.datetime | None:
+    """advanced bucket 的起始时间（time/ts/timestamp/date；无法解析返回 None）。"""
+
+    return _bucket_time(bucket)
+
+
 def calculate_burn_rate(
     buckets: list[dict[str, Any]] | None,
     *,
@@ -254,25 +263,203 @@ def calculate_burn_rate(
     if hours <= 0:
         return None
 
-    tokens_sum = 0.0
-    tokens_seen = False
-    cost_sum = 0.0
-    cost_seen = False
+    # 同一响应的 buckets 形状一致：检测一次形状后按列抽取，再整列求和。
+    tokens_col, cost_col = ShapePlan.for_items(_BUCKET_FIELDS, buckets).extract_columns(buckets)
+    tokens_sum = sum_present(tokens_col)
+    cost_sum = sum_present(cost_col)
 
-    for b in buckets:
-        t = _first_number(b, ("tokens", "total_tokens", "token_count"))
-        if t is not None:
-            tokens_sum += t
-            tokens_seen = True
+    tokens_per_hour = (tokens_sum / hours) if tokens_sum is not None else None
+    cost_per_day = ((cost_sum / hours) * 24.0) if cost_sum is not None else None
+    return BurnRate(tokens_per_hour=tokens_per_hour, cost_per_day=cost_per_day, hours_in_window=hours)
 
-        c = _first_number(b, ("cost", "total_cost", "amount"))
-        if c is not None:
-            cost_sum += c
-            cost_seen = True
 
-    tokens_per_hour = (tokens_sum / hours) if tokens_seen else None
-    cost_per_day = ((cost_sum / hours) * 24.0) if cost_seen else None
-    return BurnRate(tokens_per_hour=tokens_per_hour, cost_per_day=cost_per_day, hours_in_window=hours)
+class RollingBurnRate:
+    """增量滚动窗口 burn rate（按小时 bucket 维护，避免每轮重拉整个 rate-window）。
+
+    口径：
+    - 已结束（closed）的 bucket 只拉取一次并缓存；每轮只需拉取当前未结束（open）的 bucket
+      （跨过整点时从上一个 open bucket 起拉，使其以完整数据转为 closed）
+    - 窗口为 `[now - window, now]`：最早的 bucket 只与窗口部分重叠时按重叠比例计入
+      （假设 bucket 内速率均匀），因此速率随时间连续变化，不会在整点跳变
+    - 已覆盖时长不足一个窗口时（刚启动/历史缺失），按实际覆盖时长折算速率
+    - 窗口内求和以增量方式维护：新增/替换/淘汰 bucket 均为 O(1)
+    - bucket 缺少可解析的时间字段时无法增量维护：`supported` 变为 False，调用方回退为整窗拉取 +
+      `calculate_burn_rate`
+    """
+
+    def __init__(self, *, window_seconds: int, bucket_seconds: int = 3600) -> None:
+        self._window = dt.timedelta(seconds=int(window_seconds))
+        self._bucket = dt.timedelta(seconds=int(bucket_seconds))
+        self._supported = window_seconds >= bucket_seconds > 0
+        # closed bucket 起始时间 -> (tokens, cost)，按起始时间升序。
+        self._closed: dict[dt.datetime, tuple[float | None, float | None]] = {}
+        self._tokens_sum = 0.0
+        self._tokens_seen = 0
+        self._cost_sum = 0.0
+        self._cost_seen = 0
+        self._open: tuple[float | None, float | None] = (None, None)
+        self._open_start: dt.datetime | None = None
+        self._coverage_start: dt.datetime | None = None
+
+    @property
+    def supported(self) -> bool:
+        """bucket 是否可增量维护（为 False 时调用方应回退为整窗计算）。"""
+
+        return self._supported
+
+    @property
+    def ready(self) -> bool:
+        """是否已完成首次整窗拉取（可直接调用 `burn`）。"""
+
+        return self._supported and self._open_start is not None
+
+    def request_start(self, now: dt.datetime) -> dt.datetime:
+        """本轮 `stats_advanced(granularity=hour)` 的 start_date。
+
+        - 未就绪：整窗（按 bucket 对齐，使最早的 bucket 数据完整）
+        - 已就绪：从上一个 open bucket 起（通常只有 1～2 个 bucket）
+        - 不支持增量：与 `calculate_burn_rate` 的口径一致，直接返回 `now - window`
+        """
+
+        if not self._supported:
+            return now - self._window
+        window_start = self._floor(now - self._window)
+        if self._open_start is None:
+            return window_start
+        return max(self._open_start, window_start)
+
+    def ingest(self, buckets: list[dict[str, Any]] | None, *, since: dt.datetime, now: dt.datetime) -> bool:
+        """合并一次拉取结果（`since` 为本次请求的 start_date）。
+
+        Returns:
+            是否已按增量口径合并；False 表示 bucket 无时间字段（已切换为不支持增量）。
+        """
+
+        if not self._supported:
+            return False
+        items = [b for b in (buckets or []) if isinstance(b, dict)]
+        starts = [_bucket_time(b) for b in items]
+        if any(t is None for t in starts):
+            self._supported = False
+            self._reset()
+            return False
+
+        tokens_col, cost_col = ShapePlan.for_items(_BUCKET_FIELDS, items).extract_columns(items)
+        open_start = self._floor(now)
+        if self._open_start is None or self._coverage_start is None or since > self._open_start:
+            # 首次拉取，或中断超过一个窗口（本次为整窗拉取）：从 since 起重新覆盖。
+            self._reset()
+            self._coverage_start = since
+
+        self._open = (None, None)
+        for start, tokens, cost in sorted(zip(starts, tokens_col, cost_col), key=lambda x: x[0]):
+            bucket_start = self._floor(start)  # type: ignore[arg-type]
+            if bucket_start >= open_start:
+                self._open = _add_pair(self._open, (tokens, cost))
+            else:
+                self._put_closed(bucket_start, (tokens, cost))
+        self._open_start = open_start
+        self._evict(now)
+        return True
+
+    def burn(self, now: dt.datetime) -> BurnRate | None:
+        """按当前窗口计算 tokens/hour 与 cost/day（未就绪返回 None）。"""
+
+        if not self.ready or self._coverage_start is None:
+            return None
+        self._evict(now)
+        window_start = now - self._window
+        start = max(window_start, self._coverage_start)
+        hours = (now - start).total_seconds() / 3600.0
+        if hours <= 0:
+            return None
+
+        tokens = self._tokens_sum
+        tokens_seen = self._tokens_seen
+        cost = self._cost_sum
+        cost_seen = self._cost_seen
+        open_tokens, open_cost = self._open
+        if open_tokens is not None:
+            tokens += open_tokens
+            tokens_seen += 1
+        if open_cost is not None:
+            cost += open_cost
+            cost_seen += 1
+
+        # 最早的 bucket 只部分落在窗口内：扣除窗口外的部分。
+        oldest = next(iter(self._closed), None)
+        if oldest is not None and oldest < start:
+            outside = (start - oldest) / self._bucket
+            old_tokens, old_cost = self._closed[oldest]
+            if old_tokens is not None:
+                tokens -= old_tokens * outside
+            if old_cost is not None:
+                cost -= old_cost * outside
+
+        return BurnRate(
+            tokens_per_hour=(tokens / hours) if tokens_seen else None,
+            cost_per_day=((cost / hours) * 24.0) if cost_seen else None,
+            hours_in_window=hours,
+        )
+
+    def as_payload(self) -> dict[str, Any]:
+        """当前窗口内的 bucket（advanced 响应形状；用于缓存/快照与回退计算）。"""
+
+        rows = [
+            {"time": start.isoformat(timespec="seconds"), "tokens": t, "cost": c}
+            for start, (t, c) in self._closed.items()
+        ]
+        if self._open_start is not None:
+            t, c = self._open
+            rows.append({"time": self._open_start.isoformat(timespec="seconds"), "tokens": t, "cost": c})
+        return {"data": rows}
+
+    def _floor(self, value: dt.datetime) -> dt.datetime:
+        midnight = value.replace(hour=0, minute=0, second=0, microsecond=0)
+        return value - (value - midnight) % self._bucket
+
+    def _put_closed(self, start: dt.datetime, values: tuple[float | None, float | None]) -> None:
+        previous = self._closed.get(start)
+        if previous is not None:
+            self._account(previous, -1)
+        elif self._closed and start < next(reversed(self._closed)):
+            # 乱序到达（罕见）：重新按起始时间排序，保证最早的 bucket 在最前。
+            self._closed = dict(sorted({**self._closed, start: values}.items()))
+            self._account(values, 1)
+            return
+        self._closed[start] = values
+        self._account(values, 1)
+
+    def _evict(self, now: dt.datetime) -> None:
+        cutoff = now - self._window
+        while self._closed:
+            oldest = next(iter(self._closed))
+            if oldest + self._bucket > cutoff:
+                break
+            self._account(self._closed.pop(oldest), -1)
+
+    def _account(self, values: tuple[float | None, float | None], sign: int) -> None:
+        tokens, cost = values
+        if tokens is not None:
+            self._tokens_sum += sign * tokens
+            self._tokens_seen += sign
+        if cost is not None:
+            self._cost_sum += sign * cost
+            self._cost_seen += sign
+        if not self._tokens_seen:
+            self._tokens_sum = 0.0
+        if not self._cost_seen:
+            self._cost_sum = 0.0
+
+    def _reset(self) -> None:
+        self._closed = {}
+        self._tokens_sum = 0.0
+        self._tokens_seen = 0
+        self._cost_sum = 0.0
+        self._cost_seen = 0
+        self._open = (None, None)
+        self._open_start = None
+        self._coverage_start = None
 
 
 def extract_stats_totals(payload: dict[str, Any]) -> StatsTotals:
@@ -336,6 +523,7 @@ def extract_model_usage_rows(payload: dict[str, Any]) -> list[ModelUsageRow]:
 
     details = payload.get("details_by_model")
     if isinstance(details, list):
+        plan = ShapePlan.for_items(_MODEL_ROW_FIELDS, details)
         for item in details:
             if not isinstance(item, dict):
                 continue
@@ -348,12 +536,13 @@ def extract_model_usage_rows(payload: dict[str, Any]) -> list[ModelUsageRow]:
                 if item.get("model_name") is not None
                 else "—"
             )
+            requests, tokens, cost = plan.extract(item)
             rows.append(
                 ModelUsageRow(
                     model=model,
-                    requests=_first_number(item, ("requests", "total_requests", "request_count", "request_count_total")),
-                    tokens=_first_number(item, ("tokens", "total_tokens", "token_count")),
-                    cost=_first_number(item, ("cost", "total_cost", "amount")),
+                    requests=requests,
+                    tokens=tokens,
+                    cost=cost,
                     share=None,
                     share_basis=None,
                 )
@@ -378,49 +567,40 @@ def extract_model_usage_rows(payload: dict[str, Any]) -> list[ModelUsageRow]:
                     )
                 )
 
-    cost_total = 0.0
-    cost_seen = False
-    tokens_total = 0.0
-    tokens_seen = False
-    for r in rows:
-        if r.cost is not None:
-            cost_total += float(r.cost)
-            cost_seen = True
-        if r.tokens is not None:
-            tokens_total += float(r.tokens)
-            tokens_seen = True
+    costs = [r.cost for r in rows]
+    tokens = [r.tokens for r in rows]
+    cost_total = sum_present(costs)
+    tokens_total = sum_present(tokens)
 
     share_basis: str | None = None
-    if cost_seen and cost_total > 0:
+    shares: list[float | None] = [None] * len(rows)
+    if cost_total is not None and cost_total > 0:
         share_basis = "cost"
-    elif tokens_seen and tokens_total > 0:
+        shares = shares_of(costs, cost_total)
+    elif tokens_total is not None and tokens_total > 0:
         share_basis = "tokens"
-
-    finalized: list[ModelUsageRow] = []
-    for r in rows:
-        share: float | None = None
-        if share_basis == "cost" and r.cost is not None:
-            share = float(r.cost) / cost_total
-        if share_basis == "tokens" and r.tokens is not None:
-            share = float(r.tokens) / tokens_total
-        finalized.append(
-            ModelUsageRow(
-                model=r.model,
-                requests=r.requests,
-                tokens=r.tokens,
-                cost=r.cost,
-                share=share,
-                share_basis=share_basis,
-            )
+        shares = shares_of(tokens, tokens_total)
+
+    return [
+        ModelUsageRow(
+            model=rows[i].model,
+            requests=rows[i].requests,
+            tokens=rows[i].tokens,
+            cost=rows[i].cost,
+            share=shares[i],
+            share_basis=share_basis,
         )
+        for i in order_desc(costs, tokens, [r.model for r in rows])
+    ]
 
-    def _sort_key(r: ModelUsageRow) -> tuple[float, float, str]:
-        cost = 0.0 if r.cost is None else float(r.cost)
-        tokens = 0.0 if r.tokens is None else float(r.tokens)
-        return (cost, tokens, r.model)
 
-    finalized.sort(key=_sort_key, reverse=True)
-    return finalized
+def extract_trend_series(buckets: list[dict[str, Any]] | None) -> list[float]:
+    """从 advanced buckets 中抽取 tokens 序列（tokens/total_tokens；缺失的 bucket 跳过）。"""
+
+    if not buckets:
+        return []
+    (tokens_col,) = ShapePlan.for_items(_TREND_FIELDS, buckets).extract_columns(buckets)
+    return drop_missing(tokens_col)
 
 
 def extract_use_logs_items(payload: dict[str, Any]) -> list[dict[str, Any]]:
@@ -492,3 +672,45 @@ def _first_number(obj: dict[str, Any], keys: tuple[str, ...]) -> float | None:
         if isinstance(v, (int, float)):
             return float(v)
     return None
+
+
+def _bucket_time(bucket: dict[str, Any]) -> dt.datetime | None:
+    """bucket 起始时间（time/ts/timestamp/date；ISO 字符串或 epoch 秒/毫秒）。"""
+
+    for k in _BUCKET_TIME_KEYS:
+        v = bucket.get(k)
+        if isinstance(v, str) and v.strip():
+            return _safe_parse_datetime(v)
+        if isinstance(v, (int, float)) and not isinstance(v, bool):
+            seconds = float(v) / 1000.0 if v > 1e11 else float(v)
+            try:
+                return dt.datetime.fromtimestamp(seconds)
+            except (OverflowError, OSError, ValueError):
+                return None
+    return None
+
+
+def _add_pair(
+    a: tuple[float | None, float | None], b: tuple[float | None, float | None]
+) -> tuple[float | None, float | None]:
+    return tuple(  # type: ignore[return-value]
+        y if x is None else x if y is None else x + y for x, y in zip(a, b)
+    )
+
+
+_BUCKET_TIME_KEYS = ("time", "ts", "timestamp", "date")
+_TOKENS_KEYS = ("tokens", "total_tokens", "token_count")
+_COST_KEYS = ("cost", "total_cost", "amount")
+_REQUESTS_KEYS = ("requests", "total_requests", "request_count", "request_count_total")
+
+# 形状编译的字段规则（与 `_first_number` 口径一致：仅接受 int/float；bool 视为缺失，继续尝试下一个 key）。
+_BUCKET_FIELDS = (
+    FieldSpec(_TOKENS_KEYS, _to_float_or_none),
+    FieldSpec(_COST_KEYS, _to_float_or_none),
+)
+_TREND_FIELDS = (FieldSpec(("tokens", "total_tokens"), _to_float_or_none),)
+_MODEL_ROW_FIELDS = (
+    FieldSpec(_REQUESTS_KEYS, _to_float_or_none),
+    FieldSpec(_TOKENS_KEYS, _to_float_or_none),
+    FieldSpec(_COST_KEYS, _to_float_or_none),
+)
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import datetime as dt
+import json
+import os
+import socket
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
+from rightcodes_tui_dashboard.services.backoff import compute_next_retry_at
+from rightcodes_tui_dashboard.services.dashboard_fetch import DashboardFetcher
+
+DEFAULT_DAEMON_SOCKET_NAME = "rightcodes-daemon.sock"
+
+# 单条快照（一行 JSON）的读取上限：默认 64 KiB 不足以容纳按天分桶的长区间 payload。
+_STREAM_LIMIT = 16 * 1024 * 1024
+
+_ERROR_TYPES: dict[str, type[ApiError]] = {
+    "auth": AuthError,
+    "rate_limited": RateLimitError,
+    "api": ApiError,
+}
+
+
+@dataclass(frozen=True)
+class DaemonSnapshot:
+    """daemon 推送的一轮结果（`data` 为 None 表示本轮整体失败，见 `error`）。"""
+
+    seq: int
+    published_at: dt.datetime
+    params: dict[str, Any]
+    data: dict[str, Any] | None
+    failed: dict[str, Exception]
+    error: Exception | None
+
+
+def unix_sockets_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def default_socket_path() -> Path:
+    """默认 socket 路径（全局数据目录下；可用 RIGHTCODES_DATA_DIR 覆盖）。"""
+
+    from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
+
+    return resolve_app_data_path(DEFAULT_DAEMON_SOCKET_NAME)
+
+
+def encode_snapshot(
+    *,
+    seq: int,
+    published_at: dt.datetime,
+    params: dict[str, Any],
+    data: dict[str, Any] | None,
+    failed: dict[str, Exception] | None = None,
+    error: Exception | None = None,
+) -> bytes:
+    """编码为一行 JSON（NDJSON；以换行分隔消息）。"""
+
+    message = {
+        "type": "snapshot",
+        "seq": seq,
+        "published_at": published_at.isoformat(timespec="seconds"),
+        "params": params,
+        "data": data,
+        "failed": {key: _error_to_json(e) for key, e in (failed or {}).items()},
+        "error": _error_to_json(error) if error is not None else None,
+    }
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8") + b"\n"
+
+
+def decode_snapshot(line: bytes) -> DaemonSnapshot:
+    """解码一行快照消息。
+
+    Raises:
+        ValueError: 不是合法的快照消息。
+    """
+
+    message = json.loads(line)
+    if not isinstance(message, dict) or message.get("type") != "snapshot":
+        raise ValueError("Unexpected daemon message")
+    data = message.get("data")
+    failed = message.get("failed") if isinstance(message.get("failed"), dict) else {}
+    error = message.get("error")
+    try:
+        return DaemonSnapshot(
+            seq=int(message.get("seq") or 0),
+            published_at=dt.datetime.fromisoformat(str(message["published_at"])),
+            params=message.get("params") if isinstance(message.get("params"), dict) else {},
+            data=data if isinstance(data, dict) else None,
+            failed={str(key): _error_from_json(value) for key, value in failed.items()},
+            error=_error_from_json(error) if isinstance(error, dict) else None,
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Malformed daemon message: missing/invalid {e}") from e
+
+
+class SnapshotHub:
+    """把最新快照广播给所有订阅者（每个订阅者只保留最新一条：慢订阅者不会拖慢 daemon）。"""
+
+    def __init__(self) -> None:
+        self._latest: bytes | None = None
+        self._queues: set[asyncio.Queue[bytes]] = set()
+        self._closing = False
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._queues)
+
+    def publish(self, message: bytes) -> None:
+        self._latest = message
+        for queue in self._queues:
+            _put_latest(queue, message)
+
+    async def aclose(self, *, timeout: float = 1.0) -> None:
+        """通知所有订阅连接结束并等待其退出（daemon 退出前调用，使 server 可以干净关闭）。"""
+
+        self._closing = True
+        for queue in self._queues:
+            _put_latest(queue, b"")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while self._queues and loop.time() < deadline:
+            await asyncio.sleep(0.01)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """单个订阅连接：连接后立即收到最近一次快照，之后每轮推送一次。"""
+
+        if self._closing:
+            writer.close()
+            return
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        if self._latest is not None:
+            queue.put_nowait(self._latest)
+        self._queues.add(queue)
+        # 订阅者不发送数据：read() 返回即表示对端已关闭。
+        closed = asyncio.ensure_future(reader.read())
+        try:
+            while True:
+                pending = asyncio.ensure_future(queue.get())
+                done, _ = await asyncio.wait({pending, closed}, return_when=asyncio.FIRST_COMPLETED)
+                if closed in done:
+                    pending.cancel()
+                    break
+                message = pending.result()
+                if not message:
+                    break
+                writer.write(message)
+                await writer.drain()
+        except (ConnectionError, OSError):
+            pass
+        finally:
+            closed.cancel()
+            writer.close()
+            with contextlib.suppress(ConnectionError, OSError):
+                await writer.wait_closed()
+            self._queues.discard(queue)
+
+
+class DashboardDaemon:
+    """共享轮询 daemon：按 dashboard 口径拉取一次，通过 Unix socket 推送给所有 viewer。
+
+    口径：
+    - 上游请求量只取决于 `interval_seconds`，与连接的 viewer 数量无关
+    - 429：暂停到 next retry（Retry-After 优先，否则指数退避），期间 viewer 保留上一轮数据
+    - 其它整体失败（含认证失败）：推送错误并在下个间隔重试
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        fetcher: DashboardFetcher,
+        *,
+        interval_seconds: int,
+        hub: SnapshotHub | None = None,
+    ) -> None:
+        self._client = client
+        self._fetcher = fetcher
+        self._interval = max(1, int(interval_seconds))
+        self.hub = hub or SnapshotHub()
+        self._cached: dict[str, Any] | None = None
+        self._seq = 0
+        self._rate_limit_attempt = 0
+
+    @property
+    def params(self) -> dict[str, Any]:
+        fetcher = self._fetcher
+        return {
+            "range_mode": fetcher.range_mode,
+            "range_seconds": fetcher.range_seconds,
+            "rate_window_seconds": fetcher.rate_window_seconds,
+            "granularity": fetcher.granularity,
+            "interval_seconds": self._interval,
+        }
+
+    async def poll_once(self) -> float:
+        """拉取一轮并推送，返回距下一轮的等待秒数。"""
+
+        now = dt.datetime.now()
+        delay = float(self._interval)
+        try:
+            data, failed = await self._fetcher.fetch(self._client, previous=self._cached, now=now)
+        except RateLimitError as e:
+            self._publish(now, data=None, error=e)
+            return max(delay, self._rate_limit_delay(e, now))
+        except ApiError as e:
+            self._publish(now, data=None, error=e)
+            return delay
+
+        self._cached = data
+        self._publish(now, data=data, failed=failed)
+        rate_limited = next((e for e in failed.values() if isinstance(e, RateLimitError)), None)
+        if rate_limited is not None:
+            return max(delay, self._rate_limit_delay(rate_limited, now))
+        self._rate_limit_attempt = 0
+        return delay
+
+    async def run(self, path: str | os.PathLike[str], *, mode: int = 0o600) -> None:
+        """监听 socket 并持续轮询（直到任务被取消）。
+
+        Raises:
+            OSError: socket 已被另一个 daemon 占用或无法创建。
+        """
+
+        server = await start_unix_server(self.hub.handle, path, mode=mode)
+        try:
+            while True:
+                await asyncio.sleep(await self.poll_once())
+        finally:
+            server.close()
+            await self.hub.aclose()
+            await server.wait_closed()
+            with contextlib.suppress(OSError):
+                os.unlink(path)
+
+    def _publish(
+        self,
+        now: dt.datetime,
+        *,
+        data: dict[str, Any] | None,
+        failed: dict[str, Exception] | None = None,
+        error: Exception | None = None,
+    ) -> None:
+        self._seq += 1
+        self.hub.publish(
+            encode_snapshot(
+                seq=self._seq, published_at=now, params=self.params, data=data, failed=failed, error=error
+            )
+        )
+
+    def _rate_limit_delay(self, error: RateLimitError, now: dt.datetime) -> float:
+        self._rate_limit_attempt += 1
+        retry_at = error.next_retry_at or compute_next_retry_at(
+            now=now, attempt=self._rate_limit_attempt, base_delay_seconds=5, max_delay_seconds=300
+        )
+        return (retry_at - now).total_seconds()
+
+
+async def start_unix_server(handler: Any, path: str | os.PathLike[str], *, mode: int = 0o600) -> asyncio.AbstractServer:
+    """在 `path` 上监听（清理上次异常退出遗留的 socket 文件；仍有 daemon 在监听时报错）。
+
+    Raises:
+        OSError: socket 已被占用或无法创建。
+    """
+
+    target = Path(path)
+    if target.exists():
+        if await _socket_alive(target):
+            raise FileExistsError(f"daemon already listening on {target}")
+        target.unlink()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    # 先以 0600 创建 socket（bind 与 chmod 之间不存在按默认 umask 可连接的窗口），再放宽到 mode。
+    previous_umask = os.umask(0o177)
+    try:
+        server = await asyncio.start_unix_server(handler, path=str(target), limit=_STREAM_LIMIT)
+    finally:
+        os.umask(previous_umask)
+    os.chmod(target, mode)
+    return server
+
+
+async def subscribe(path: str | os.PathLike[str]) -> AsyncIterator[DaemonSnapshot]:
+    """订阅 daemon 快照（连接断开时迭代结束）。
+
+    Raises:
+        OSError: 无法连接（daemon 未运行）。
+        ValueError: 收到无法解析的消息。
+    """
+
+    reader, writer = await asyncio.open_unix_connection(str(path), limit=_STREAM_LIMIT)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            yield decode_snapshot(line)
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError, OSError):
+            await writer.wait_closed()
+
+
+def _put_latest(queue: asyncio.Queue[bytes], message: bytes) -> None:
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(message)
+
+
+async def _socket_alive(path: Path) -> bool:
+    try:
+        _, writer = await asyncio.open_unix_connection(str(path))
+    except OSError:
+        return False
+    writer.close()
+    with contextlib.suppress(ConnectionError, OSError):
+        await writer.wait_closed()
+    return True
+
+
+def _error_to_json(error: Exception) -> dict[str, Any]:
+    if isinstance(error, AuthError):
+        kind = "auth"
+    elif isinstance(error, RateLimitError):
+        kind = "rate_limited"
+    else:
+        kind = "api"
+    out: dict[str, Any] = {"type": kind, "message": str(error) or error.__class__.__name__}
+    if isinstance(error, RateLimitError) and error.next_retry_at is not None:
+        out["next_retry_at"] = error.next_retry_at.isoformat(timespec="seconds")
+    return out
+
+
+def _error_from_json(value: Any) -> Exception:
+    if not isinstance(value, dict):
+        return ApiError("daemon error")
+    cls = _ERROR_TYPES.get(str(value.get("type")), ApiError)
+    message = str(value.get("message") or "daemon error")
+    if cls is RateLimitError:
+        retry_at = value.get("next_retry_at")
+        return RateLimitError(message, next_retry_at=dt.datetime.fromisoformat(retry_at) if retry_at else None)
+    return cls(message)
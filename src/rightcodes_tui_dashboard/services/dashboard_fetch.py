@@ -0,0 +1,420 @@
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Mapping
+
+from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
+from rightcodes_tui_dashboard.services.calculations import (
+    RollingBurnRate,
+    extract_advanced_buckets,
+    extract_bucket_start,
+)
+from rightcodes_tui_dashboard.services.fanout import async_fan_out
+from rightcodes_tui_dashboard.storage.bucket_store import StatsBucketStore
+
+# Dashboard 每轮刷新的数据源（key 与缓存 payload 的 key 一致）。
+DASHBOARD_SOURCES = ("me", "subscriptions", "advanced_rate", "advanced_trend", "stats", "use_logs")
+
+# 可由本地归档计算（不再请求 API）的数据源（见 `LocalRollups`）。
+LOCAL_ROLLUP_SOURCES = ("advanced_trend", "stats")
+
+# 窗口边界量化步长（秒，按 bucket 粒度）：同一步长内的多次刷新/切屏生成完全相同的请求参数，
+# 从而命中 client 的响应缓存与 single-flight。步长整除 1 小时，量化不会跨越 hour bucket。
+WINDOW_QUANTUM_SECONDS = {"hour": 60, "day": 300}
+
+# 可由本地 bucket 缓存拼接的粒度 -> bucket 长度。
+_BUCKET_STEPS = {"hour": dt.timedelta(hours=1), "day": dt.timedelta(days=1)}
+
+# advanced 响应中 bucket 列表可能使用的 key（与 `extract_advanced_buckets` 一致）。
+_BUCKET_LIST_KEYS = ("data", "items", "series", "buckets", "trend")
+
+# details_by_model 行的模型名字段（按优先级）。
+_MODEL_NAME_KEYS = ("model", "name", "model_name")
+
+# 拼接时可跨时段相加的数值字段：字段名（按 `_` 切分，`*_by_*` 取前半段）含以下词之一，
+# 且不含 `_NON_ADDITIVE_WORDS`（均值/比例/倍率等取最后一个时段的值）。
+_ADDITIVE_WORDS = frozenset(("tokens", "token", "cost", "amount", "requests", "request", "count"))
+_NON_ADDITIVE_WORDS = frozenset(
+    ("avg", "average", "mean", "median", "max", "min", "per", "rate", "ratio", "pct", "percent", "percentage", "share", "multiplier")
+)
+
+
+@dataclass(frozen=True)
+class FetchWindow:
+    """一轮拉取的时间口径。"""
+
+    start: dt.datetime
+    end: dt.datetime
+    rate_since: dt.datetime
+    granularity: str
+
+
+class DashboardFetcher:
+    """Dashboard 一轮拉取：构造请求、fan-out、合并结果（TUI 与 `rightcodes daemon` 共用）。
+
+    口径：
+    - `--range today` 以本地 00:00 为起点；rolling 为 `now - range`
+    - rate-window 由 `RollingBurnRate` 增量维护（缓存中保存整窗 bucket）
+    - 失败端点沿用上一轮 payload；全部失败时抛出（优先 RateLimitError 以便退避）
+    - 窗口终点按粒度向下量化（见 `WINDOW_QUANTUM_SECONDS`）：数据最多滞后一个步长
+    - 配置 `bucket_store` 时，已结束的 bucket 从本地缓存读取：advanced 请求只拉取未结束的尾部
+      （以及 rolling 窗口起点所在的不完整 bucket），再与缓存拼接（见 `stitch_advanced_payloads`）
+    """
+
+    def __init__(
+        self,
+        *,
+        range_mode: str,
+        range_seconds: int,
+        rate_window_seconds: int,
+        granularity: str = "auto",
+        max_concurrency: int = 4,
+        bucket_store: StatsBucketStore | None = None,
+    ) -> None:
+        self.range_mode = range_mode
+        self.range_seconds = int(range_seconds)
+        self.rate_window_seconds = int(rate_window_seconds)
+        self.granularity = granularity
+        self.max_concurrency = max(1, int(max_concurrency))
+        # rate-window 的增量 burn rate：首次整窗拉取，之后每轮只拉取当前小时的 bucket。
+        self.burn_engine = RollingBurnRate(window_seconds=self.rate_window_seconds)
+        self.bucket_store = bucket_store
+        # 响应中的 bucket 无法解析时间时关闭趋势拼接（回退为整窗请求）。
+        self._stitch_trend = True
+
+    def window(self, now: dt.datetime) -> FetchWindow:
+        granularity = self.granularity
+        if granularity == "auto":
+            granularity = "hour" if self.range_seconds <= 48 * 3600 else "day"
+        now = quantize_time(now, WINDOW_QUANTUM_SECONDS.get(granularity, 60))
+        if self.range_mode == "today":
+            start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            start = now - dt.timedelta(seconds=self.range_seconds)
+        return FetchWindow(
+            start=start,
+            end=now,
+            rate_since=self.burn_engine.request_start(now),
+            granularity=granularity,
+        )
+
+    async def fetch(
+        self,
+        client: Any,
+        sources: Iterable[str] = DASHBOARD_SOURCES,
+        *,
+        previous: Mapping[str, Any] | None = None,
+        use_logs_page: int = 1,
+        use_logs_page_size: int = 20,
+        local: Callable[[FetchWindow], Awaitable[dict[str, Any]]] | None = None,
+        now: dt.datetime | None = None,
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        """并发拉取 dashboard 端点（有界并发；每个端点单独失败）。
+
+        Args:
+            client: 异步 API client。
+            sources: 本轮需要拉取的数据源 keys（其余沿用 `previous`）。
+            previous: 上一轮合并后的 payload。
+            local: 可选的本地计算（返回 LOCAL_ROLLUP_SOURCES 的 payload；空 dict 表示回退为 API）。
+
+        Returns:
+            (data, failed)：见 `merge_fetch_result`。
+
+        Raises:
+            AuthError: 任一端点认证失败。
+            ApiError: 全部端点均失败。
+        """
+
+        window = self.window(now or dt.datetime.now())
+        now = window.end
+        start_range = _format_time(window.start)
+        end_now = _format_time(now)
+        page = int(use_logs_page)
+        page_size = int(use_logs_page_size)
+
+        calls = {
+            "me": client.get_me,
+            "subscriptions": client.list_subscriptions,
+            "advanced_rate": lambda: self._fetch_rate(client, window),
+            "advanced_trend": lambda: self._fetch_trend(client, window),
+            "stats": lambda: client.stats_range(start_date=start_range, end_date=end_now),
+            "use_logs": lambda: client.use_logs_list(
+                page=page,
+                page_size=page_size,
+                start_date=start_range,
+                end_date=end_now,
+            ),
+        }
+        wanted = set(sources)
+        local_values: dict[str, Any] = {}
+        if local is not None and wanted & set(LOCAL_ROLLUP_SOURCES):
+            local_values = {key: value for key, value in (await local(window)).items() if key in wanted}
+        calls = {key: fn for key, fn in calls.items() if key in wanted and key not in local_values}
+        result = await async_fan_out(calls, max_concurrency=self.max_concurrency)
+
+        values = {**local_values, **result.values}
+        rate_payload = values.get("advanced_rate")
+        if isinstance(rate_payload, dict):
+            buckets = extract_advanced_buckets(rate_payload)
+            if self.burn_engine.ingest(buckets, since=window.rate_since, now=now):
+                # 缓存/快照中保存整个窗口的 bucket（而不是本轮的增量响应），以便回退计算与重绘。
+                values["advanced_rate"] = self.burn_engine.as_payload()
+        return merge_fetch_result(values, result.errors, previous=previous)
+
+    async def _fetch_rate(self, client: Any, window: FetchWindow) -> Any:
+        """rate-window 的 hour buckets：burn engine 未就绪（启动/中断后）时优先用本地缓存补齐已结束部分。"""
+
+        since, end = window.rate_since, window.end
+        open_start = _bucket_floor(end, "hour")
+        store = self.bucket_store
+        engine = self.burn_engine
+        if (
+            store is not None
+            and engine.supported
+            and not engine.ready
+            and since < open_start
+            and store.covers("hour", since, open_start)
+        ):
+            tail = await client.stats_advanced(
+                start_date=_format_time(open_start), end_date=_format_time(end), granularity="hour"
+            )
+            tail = _clip_buckets(tail, "hour", start=open_start)
+            payload = stitch_advanced_payloads([{"data": store.load_buckets("hour", since, open_start)}, tail])
+        else:
+            payload = await client.stats_advanced(
+                start_date=_format_time(since), end_date=_format_time(end), granularity="hour"
+            )
+        if store is not None and since == _bucket_floor(since, "hour"):
+            pairs = _closed_buckets(payload, "hour")
+            if pairs is not None:
+                store.save_buckets("hour", pairs, start=since, end=open_start)
+        return payload
+
+    async def _fetch_trend(self, client: Any, window: FetchWindow) -> Any:
+        """趋势 advanced：已结束的前缀区间来自本地缓存，只请求起点的不完整 bucket 与未结束的尾部。"""
+
+        granularity = window.granularity
+        start, end = window.start, window.end
+        store = self.bucket_store
+        prefix_start = _bucket_ceil(start, granularity) if granularity in _BUCKET_STEPS else end
+        prefix_end = _bucket_floor(end, granularity) if granularity in _BUCKET_STEPS else end
+        if store is None or not self._stitch_trend or prefix_start >= prefix_end:
+            return await client.stats_advanced(
+                start_date=_format_time(start), end_date=_format_time(end), granularity=granularity
+            )
+
+        prefix = store.load_prefix(granularity, prefix_start, prefix_end)
+        if prefix is None:
+            prefix = await client.stats_advanced(
+                start_date=_format_time(prefix_start), end_date=_format_time(prefix_end), granularity=granularity
+            )
+            pairs = _closed_buckets(prefix, granularity)
+            if pairs is None:
+                self._stitch_trend = False
+                return await client.stats_advanced(
+                    start_date=_format_time(start), end_date=_format_time(end), granularity=granularity
+                )
+            details = {key: value for key, value in prefix.items() if key not in _BUCKET_LIST_KEYS}
+            store.save_prefix(granularity, start=prefix_start, end=prefix_end, buckets=pairs, details=details)
+            # 与缓存命中时的口径一致：只保留前缀区间内的 bucket（边界 bucket 由尾部请求给出）。
+            prefix = {**details, "data": [b for t, b in pairs if prefix_start <= t < prefix_end]}
+
+        # 两端请求同样按 bucket 起始时间裁剪：不依赖服务端 end_date 是否包含端点，边界 bucket 只计一次。
+        parts = [prefix]
+        if start < prefix_start:
+            head = await client.stats_advanced(
+                start_date=_format_time(start), end_date=_format_time(prefix_start), granularity=granularity
+            )
+            parts.insert(0, _clip_buckets(head, granularity, end=prefix_start))
+        tail = await client.stats_advanced(
+            start_date=_format_time(prefix_end), end_date=_format_time(end), granularity=granularity
+        )
+        parts.append(_clip_buckets(tail, granularity, start=prefix_end))
+        return stitch_advanced_payloads(parts)
+
+    def replay_rate(self, payload: Any, *, now: dt.datetime) -> None:
+        """用整窗 bucket（`as_payload` 形状）重建 burn engine（用于订阅 daemon 快照的 viewer）。"""
+
+        self.burn_engine = RollingBurnRate(window_seconds=self.rate_window_seconds)
+        if isinstance(payload, dict):
+            since = self.burn_engine.request_start(now)
+            self.burn_engine.ingest(extract_advanced_buckets(payload), since=since, now=now)
+
+
+def stitch_advanced_payloads(parts: Iterable[Any]) -> dict[str, Any]:
+    """拼接相邻时段的 `/use-log/stats/advanced` 响应（按时间先后传入）。
+
+    口径：
+    - bucket 按起始时间合并（同一 bucket 出现在多个时段时可相加字段相加），输出为 `data`（升序）
+    - 只有 requests/tokens/cost 类字段相加（见 `_is_additive`）：`tokens_by_model` 等 dict 逐 key 相加，
+      `details_by_model` 等列表按模型名合并相加；均值/比例/倍率等其他值取最后一个时段
+    """
+
+    buckets: dict[dt.datetime, dict[str, Any]] = {}
+    merged: dict[str, Any] = {}
+    for part in parts:
+        if not isinstance(part, dict):
+            continue
+        for bucket in extract_advanced_buckets(part) or []:
+            start = extract_bucket_start(bucket)
+            if start is None:
+                continue
+            previous = buckets.get(start)
+            buckets[start] = dict(bucket) if previous is None else _add_fields(previous, bucket)
+        for key, value in part.items():
+            if key in _BUCKET_LIST_KEYS:
+                continue
+            merged[key] = value if key not in merged else _merge_field(merged[key], value, additive=_is_additive(key))
+    merged["data"] = [buckets[start] for start in sorted(buckets)]
+    return merged
+
+
+def quantize_time(value: dt.datetime, seconds: int) -> dt.datetime:
+    """按 `seconds` 向下取整（相对当天 00:00；`seconds` 需整除 86400）。"""
+
+    if seconds <= 1:
+        return value.replace(microsecond=0)
+    midnight = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    elapsed = int((value - midnight).total_seconds())
+    return midnight + dt.timedelta(seconds=elapsed - elapsed % seconds)
+
+
+def _format_time(value: dt.datetime) -> str:
+    return value.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _bucket_floor(value: dt.datetime, granularity: str) -> dt.datetime:
+    if granularity == "day":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _bucket_ceil(value: dt.datetime, granularity: str) -> dt.datetime:
+    floor = _bucket_floor(value, granularity)
+    return floor if floor == value else floor + _BUCKET_STEPS[granularity]
+
+
+def _closed_buckets(payload: Any, granularity: str) -> list[tuple[dt.datetime, dict[str, Any]]] | None:
+    """响应中的 (bucket 起始时间, bucket) 列表；不是 advanced 形状或 bucket 缺少时间时返回 None。"""
+
+    buckets = extract_advanced_buckets(payload) if isinstance(payload, dict) else None
+    if buckets is None:
+        return None
+    pairs: list[tuple[dt.datetime, dict[str, Any]]] = []
+    for bucket in buckets:
+        start = extract_bucket_start(bucket)
+        if start is None:
+            return None
+        pairs.append((_bucket_floor(start, granularity), bucket))
+    return pairs
+
+
+def _clip_buckets(
+    payload: Any, granularity: str, *, start: dt.datetime | None = None, end: dt.datetime | None = None
+) -> Any:
+    """只保留起始时间在 [start, end) 内的 bucket（不是 advanced 形状时原样返回）。"""
+
+    pairs = _closed_buckets(payload, granularity)
+    if pairs is None:
+        return payload
+    rest = {key: value for key, value in payload.items() if key not in _BUCKET_LIST_KEYS}
+    kept = [b for t, b in pairs if (start is None or t >= start) and (end is None or t < end)]
+    return {**rest, "data": kept}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_additive(key: Any, *, default: bool = False) -> bool:
+    """字段值能否跨时段相加（requests/tokens/cost 的各种写法）；无法判断时返回 `default`。"""
+
+    words = str(key).lower().split("_by_", 1)[0].split("_")
+    if _NON_ADDITIVE_WORDS.intersection(words):
+        return False
+    return default or bool(_ADDITIVE_WORDS.intersection(words))
+
+
+def _add_fields(base: dict[str, Any], extra: Mapping[str, Any]) -> dict[str, Any]:
+    out = dict(base)
+    for key, value in extra.items():
+        if key in out and _is_number(out[key]) and _is_number(value) and _is_additive(key):
+            out[key] = out[key] + value
+        else:
+            out[key] = value
+    return out
+
+
+def _model_name(item: Mapping[str, Any]) -> str | None:
+    for key in _MODEL_NAME_KEYS:
+        if item.get(key) is not None:
+            return str(item[key])
+    return None
+
+
+def _merge_field(left: Any, right: Any, *, additive: bool) -> Any:
+    if _is_number(left) and _is_number(right):
+        return left + right if additive else right
+    if isinstance(left, dict) and isinstance(right, dict):
+        # `tokens_by_model` 等：key 为模型名，沿用外层字段的口径。
+        out = dict(left)
+        for key, value in right.items():
+            if key in out:
+                value = _merge_field(out[key], value, additive=_is_additive(key, default=additive))
+            out[key] = value
+        return out
+    if isinstance(left, list) and isinstance(right, list):
+        rows: dict[str, dict[str, Any]] = {}
+        unnamed: list[Any] = []
+        for item in [*left, *right]:
+            name = _model_name(item) if isinstance(item, dict) else None
+            if name is None:
+                unnamed.append(item)
+            elif name in rows:
+                rows[name] = _add_fields(rows[name], item)
+            else:
+                rows[name] = dict(item)
+        return [*rows.values(), *unnamed]
+    return right
+
+
+def merge_fetch_result(
+    values: dict[str, Any],
+    errors: dict[str, Exception],
+    *,
+    previous: Mapping[str, Any] | None = None,
+) -> tuple[dict[str, Any], dict[str, Exception]]:
+    """合并 fan-out 结果：失败端点沿用上一轮缓存，并按错误类型决定是否整体失败。
+
+    Returns:
+        (data, failed)：data 含全部 DASHBOARD_SOURCES；failed 为失败端点 -> 异常。
+
+    Raises:
+        AuthError: 任一端点认证失败（token 失效时整体无意义）。
+        ApiError: 全部端点均失败（优先抛出 RateLimitError 以便进入退避）。
+    """
+
+    auth_error = next((e for e in errors.values() if isinstance(e, AuthError)), None)
+    if auth_error is not None:
+        raise auth_error
+
+    if errors and not values:
+        rate_limited = next((e for e in errors.values() if isinstance(e, RateLimitError)), None)
+        raise rate_limited or next(iter(errors.values()))
+
+    failed = dict(errors)
+    # /use-log/list 属于“非关键”区块：接口变更时不应阻塞主面板刷新，也不计入失败提示。
+    use_logs_error = failed.get("use_logs")
+    if isinstance(use_logs_error, ApiError) and not isinstance(use_logs_error, RateLimitError):
+        failed.pop("use_logs")
+        values["use_logs"] = {}
+
+    previous = previous or {}
+    data: dict[str, Any] = {}
+    for key in DASHBOARD_SOURCES:
+        if key in values:
+            data[key] = values[key]
+        else:
+            data[key] = previous.get(key, {})
+    return data, failed
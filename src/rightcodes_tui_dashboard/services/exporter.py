@@ -0,0 +1,436 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from rightcodes_tui_dashboard.errors import AuthError, RateLimitError
+from rightcodes_tui_dashboard.services.backoff import compute_next_retry_at
+from rightcodes_tui_dashboard.services.calculations import (
+    BurnRate,
+    ModelUsageRow,
+    QuotaSummary,
+    RollingBurnRate,
+    calculate_burn_rate,
+    estimate_eta,
+    extract_advanced_buckets,
+    extract_me_balance,
+    extract_model_usage_rows,
+    normalize_subscriptions,
+    summarize_quota,
+)
+from rightcodes_tui_dashboard.services.fanout import fan_out
+
+DEFAULT_EXPORTER_LISTEN = "127.0.0.1:9877"
+DEFAULT_EXPORTER_INTERVAL = 60
+
+# 拉取的数据源（key 同 dashboard 的 `_cached`）。
+_EXPORTER_SOURCES = ("me", "subscriptions", "advanced_rate", "advanced_trend")
+
+_OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+_PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@dataclass(frozen=True)
+class ExporterSample:
+    """一次轮询的计算结果（scrape 只读取最近一次的 sample，不触发上游请求）。"""
+
+    collected_at: dt.datetime
+    quota: QuotaSummary
+    balance: float | None
+    burn: BurnRate | None
+    eta: dt.datetime | None
+    models: list[ModelUsageRow]
+    durations: dict[str, float]
+    failed: dict[str, str]
+
+
+@dataclass
+class PollStats:
+    """轮询计数（导出为 counter）。"""
+
+    polls: int = 0
+    poll_errors: int = 0
+    last_ok: bool = False
+    last_success: dt.datetime | None = None
+    next_poll_at: dt.datetime | None = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+
+def parse_listen(text: str) -> tuple[str, int]:
+    """解析 `host:port`（host 可省略，默认 127.0.0.1）。
+
+    Raises:
+        ValueError: 格式不合法或端口越界。
+    """
+
+    raw = text.strip()
+    host, sep, port_text = raw.rpartition(":")
+    if not sep:
+        host, port_text = "", raw
+    host = host.strip("[]") or "127.0.0.1"
+    port = int(port_text)
+    if not 0 <= port <= 65535:
+        raise ValueError(f"Invalid port: {port}")
+    return host, port
+
+
+class MetricsCollector:
+    """按固定口径拉取并计算指标（复用 dashboard 的计算逻辑；同步 client）。
+
+    口径：
+    - quota/balance/burn/ETA 与 dashboard 一致（ETA 为 cost 口径：剩余额度 / 成本速率）
+    - 按模型 cost/tokens/requests 来自 `--range` 的 advanced stats
+    - rate-window 使用 `RollingBurnRate` 增量拉取（bucket 无时间字段时回退为整窗拉取）
+    - 单个端点失败时沿用上一轮的 payload（并在 `failed` 中记录）
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        range_mode: str,
+        range_seconds: int,
+        rate_window_seconds: int,
+        max_concurrency: int = 4,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._client = client
+        self._range_mode = range_mode
+        self._range_seconds = int(range_seconds)
+        self._rate_window_seconds = int(rate_window_seconds)
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._clock = clock
+        self._burn_engine = RollingBurnRate(window_seconds=self._rate_window_seconds)
+        self._payloads: dict[str, Any] = {}
+
+    def collect(self, now: dt.datetime | None = None) -> ExporterSample:
+        """拉取一轮并计算 sample。
+
+        Raises:
+            AuthError: token 失效。
+            RateLimitError: 全部端点均被限流（调用方据此退避）。
+        """
+
+        now = now or dt.datetime.now()
+        if self._range_mode == "today":
+            start_range = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            start_range = now - dt.timedelta(seconds=self._range_seconds)
+        rate_since = self._burn_engine.request_start(now)
+        end = now.strftime("%Y-%m-%dT%H:%M:%S")
+        granularity = "hour" if self._range_seconds <= 48 * 3600 else "day"
+
+        client = self._client
+        calls: dict[str, Callable[[], Any]] = {
+            "me": client.get_me,
+            "subscriptions": client.list_subscriptions,
+            "advanced_rate": lambda: client.stats_advanced(
+                start_date=rate_since.strftime("%Y-%m-%dT%H:%M:%S"), end_date=end, granularity="hour"
+            ),
+            "advanced_trend": lambda: client.stats_advanced(
+                start_date=start_range.strftime("%Y-%m-%dT%H:%M:%S"), end_date=end, granularity=granularity
+            ),
+        }
+        durations: dict[str, float] = {}
+        result = fan_out(
+            {key: self._timed(key, fn, durations) for key, fn in calls.items()},
+            max_concurrency=self._max_concurrency,
+        )
+
+        auth_error = next((e for e in result.errors.values() if isinstance(e, AuthError)), None)
+        if auth_error is not None:
+            raise auth_error
+        if result.errors and not result.values:
+            rate_limited = next((e for e in result.errors.values() if isinstance(e, RateLimitError)), None)
+            raise rate_limited or next(iter(result.errors.values()))
+
+        values = dict(result.values)
+        rate_payload = values.get("advanced_rate")
+        if isinstance(rate_payload, dict):
+            if self._burn_engine.ingest(extract_advanced_buckets(rate_payload), since=rate_since, now=now):
+                values["advanced_rate"] = self._burn_engine.as_payload()
+        self._payloads.update(values)
+        return self._build_sample(now, durations, {k: e.__class__.__name__ for k, e in result.errors.items()})
+
+    def _timed(self, key: str, fn: Callable[[], Any], durations: dict[str, float]) -> Callable[[], Any]:
+        def _run() -> Any:
+            started = self._clock()
+            try:
+                return fn()
+            finally:
+                durations[key] = self._clock() - started
+
+        return _run
+
+    def _build_sample(self, now: dt.datetime, durations: dict[str, float], failed: dict[str, str]) -> ExporterSample:
+        payloads = self._payloads
+        subs_payload = payloads.get("subscriptions") if isinstance(payloads.get("subscriptions"), dict) else {}
+        subs_items = subs_payload.get("subscriptions") if isinstance(subs_payload.get("subscriptions"), list) else []
+        quota = summarize_quota(normalize_subscriptions([x for x in subs_items if isinstance(x, dict)], now=now))
+
+        me_payload = payloads.get("me") if isinstance(payloads.get("me"), dict) else {}
+        trend_payload = payloads.get("advanced_trend") if isinstance(payloads.get("advanced_trend"), dict) else {}
+        rate_payload = payloads.get("advanced_rate") if isinstance(payloads.get("advanced_rate"), dict) else {}
+
+        if self._burn_engine.ready:
+            burn = self._burn_engine.burn(now)
+        else:
+            burn = calculate_burn_rate(
+                extract_advanced_buckets(rate_payload), window_seconds=self._rate_window_seconds
+            )
+
+        eta = None
+        if burn is not None and burn.cost_per_day is not None and burn.cost_per_day > 0:
+            eta = estimate_eta(remaining=quota.remaining_sum, burn_tokens_per_hour=burn.cost_per_day / 24.0, now=now)
+
+        return ExporterSample(
+            collected_at=now,
+            quota=quota,
+            balance=extract_me_balance(me_payload),
+            burn=burn,
+            eta=eta,
+            models=extract_model_usage_rows(trend_payload),
+            durations=durations,
+            failed=failed,
+        )
+
+
+class MetricsPoller:
+    """后台线程按固定间隔轮询；scrape 只读缓存（scrape 频率不影响上游请求量）。
+
+    - 429：暂停到 next retry（Retry-After 优先，否则指数退避）
+    - 其它失败：保留上一轮 sample，下个间隔重试
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[], ExporterSample],
+        *,
+        interval_seconds: int = DEFAULT_EXPORTER_INTERVAL,
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self._collect = collect
+        self._interval = max(1, int(interval_seconds))
+        self._on_error = on_error
+        self._sample: ExporterSample | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._rate_limit_attempt = 0
+        self.stats = PollStats()
+
+    def latest(self) -> ExporterSample | None:
+        with self._lock:
+            return self._sample
+
+    def poll_once(self) -> float:
+        """执行一轮轮询，返回距下一轮的等待秒数。"""
+
+        now = dt.datetime.now()
+        delay = float(self._interval)
+        try:
+            sample = self._collect()
+        except RateLimitError as e:
+            self._rate_limit_attempt += 1
+            retry_at = e.next_retry_at or compute_next_retry_at(
+                now=now, attempt=self._rate_limit_attempt, base_delay_seconds=5, max_delay_seconds=300
+            )
+            delay = max(delay, (retry_at - now).total_seconds())
+            self._record_error(e)
+        except Exception as e:
+            self._record_error(e)
+        else:
+            self._rate_limit_attempt = 0
+            with self._lock:
+                self._sample = sample
+            with self.stats._lock:
+                self.stats.polls += 1
+                self.stats.last_ok = True
+                self.stats.last_success = sample.collected_at
+        with self.stats._lock:
+            self.stats.next_poll_at = now + dt.timedelta(seconds=delay)
+        return delay
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="rightcodes-exporter-poller", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delay = self.poll_once()
+            self._stop.wait(delay)
+
+    def _record_error(self, error: Exception) -> None:
+        with self.stats._lock:
+            self.stats.polls += 1
+            self.stats.poll_errors += 1
+            self.stats.last_ok = False
+        if self._on_error is not None:
+            self._on_error(error)
+
+
+def render_metrics(sample: ExporterSample | None, stats: PollStats, *, openmetrics: bool = False) -> str:
+    """渲染 Prometheus text（0.0.4）或 OpenMetrics 格式。"""
+
+    out = _MetricWriter(openmetrics=openmetrics)
+    with stats._lock:
+        polls, poll_errors, last_ok, last_success = stats.polls, stats.poll_errors, stats.last_ok, stats.last_success
+
+    out.metric("rightcodes_up", "gauge", "Whether the last upstream poll succeeded.", [((), 1 if last_ok else 0)])
+    out.metric("rightcodes_polls", "counter", "Upstream polls performed.", [((), polls)])
+    out.metric("rightcodes_poll_errors", "counter", "Upstream polls that failed.", [((), poll_errors)])
+    if last_success is not None:
+        out.metric(
+            "rightcodes_last_success_timestamp_seconds",
+            "gauge",
+            "Unix time of the last successful poll.",
+            [((), last_success.timestamp())],
+        )
+    if sample is None:
+        return out.text()
+
+    quota = sample.quota
+    out.metric("rightcodes_quota_total", "gauge", "Total quota across subscriptions.", [((), quota.total_quota_sum)])
+    out.metric("rightcodes_quota_remaining", "gauge", "Remaining quota across subscriptions.", [((), quota.remaining_sum)])
+    used_ratio = None
+    if quota.total_quota_sum and quota.used_sum is not None:
+        used_ratio = quota.used_sum / quota.total_quota_sum
+    out.metric("rightcodes_quota_used_ratio", "gauge", "Used quota / total quota (0-1).", [((), used_ratio)])
+    out.metric("rightcodes_balance", "gauge", "Account balance.", [((), sample.balance)])
+
+    burn = sample.burn
+    out.metric(
+        "rightcodes_burn_tokens_per_hour",
+        "gauge",
+        "Token burn rate over the rate window.",
+        [((), burn.tokens_per_hour if burn else None)],
+    )
+    out.metric(
+        "rightcodes_burn_cost_per_hour",
+        "gauge",
+        "Cost burn rate over the rate window.",
+        [((), burn.cost_per_day / 24.0 if burn and burn.cost_per_day is not None else None)],
+    )
+    eta_seconds = None
+    if sample.eta is not None:
+        eta_seconds = max(0.0, (sample.eta - sample.collected_at).total_seconds())
+    out.metric("rightcodes_eta_seconds", "gauge", "Estimated seconds until quota is exhausted.", [((), eta_seconds)])
+
+    out.metric(
+        "rightcodes_model_cost",
+        "gauge",
+        "Cost per model over the configured range.",
+        [((("model", r.model),), r.cost) for r in sample.models],
+    )
+    out.metric(
+        "rightcodes_model_tokens",
+        "gauge",
+        "Tokens per model over the configured range.",
+        [((("model", r.model),), r.tokens) for r in sample.models],
+    )
+    out.metric(
+        "rightcodes_model_requests",
+        "gauge",
+        "Requests per model over the configured range.",
+        [((("model", r.model),), r.requests) for r in sample.models],
+    )
+    out.metric(
+        "rightcodes_fetch_duration_seconds",
+        "gauge",
+        "Latency of the last upstream request per source.",
+        [((("source", k),), v) for k, v in sorted(sample.durations.items())],
+    )
+    out.metric(
+        "rightcodes_fetch_success",
+        "gauge",
+        "Whether the last upstream request per source succeeded.",
+        [((("source", k),), 0 if k in sample.failed else 1) for k in sorted(sample.durations)],
+    )
+    return out.text()
+
+
+def make_server(address: tuple[str, int], poller: MetricsPoller) -> ThreadingHTTPServer:
+    """创建 HTTP server：`/metrics` 返回缓存中的指标（不触发上游请求）。"""
+
+    class _Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802
+            path = self.path.split("?", 1)[0]
+            if path not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            if path == "/":
+                self._reply(200, "text/plain; charset=utf-8", "rightcodes exporter: see /metrics\n")
+                return
+            openmetrics = "application/openmetrics-text" in (self.headers.get("Accept") or "")
+            body = render_metrics(poller.latest(), poller.stats, openmetrics=openmetrics)
+            self._reply(200, _OPENMETRICS_CONTENT_TYPE if openmetrics else _PROMETHEUS_CONTENT_TYPE, body)
+
+        def _reply(self, status: int, content_type: str, body: str) -> None:
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            # scrape 日志没有排障价值，且会刷屏。
+            return
+
+    server = ThreadingHTTPServer(address, _Handler)
+    server.daemon_threads = True
+    return server
+
+
+class _MetricWriter:
+    def __init__(self, *, openmetrics: bool) -> None:
+        self._openmetrics = openmetrics
+        self._lines: list[str] = []
+
+    def metric(
+        self,
+        name: str,
+        kind: str,
+        help_text: str,
+        samples: list[tuple[tuple[tuple[str, str], ...], float | int | None]],
+    ) -> None:
+        present = [(labels, value) for labels, value in samples if value is not None]
+        if not present:
+            return
+        suffix = "_total" if kind == "counter" else ""
+        # OpenMetrics：counter 的 family 名不带 `_total`；Prometheus 0.0.4：HELP/TYPE 名须与样本名一致。
+        family = name if self._openmetrics else f"{name}{suffix}"
+        self._lines.append(f"# HELP {family} {help_text}")
+        self._lines.append(f"# TYPE {family} {kind}")
+        for labels, value in present:
+            label_text = ""
+            if labels:
+                label_text = "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels) + "}"
+            self._lines.append(f"{name}{suffix}{label_text} {_format_value(value)}")
+
+    def text(self) -> str:
+        lines = list(self._lines)
+        if self._openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float | int) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Mapping
+
+
+@dataclass(frozen=True)
+class FanOutResult:
+    """并发 fan-out 结果：成功值与失败异常分开保存（按 key 对应）。"""
+
+    values: dict[str, Any]
+    errors: dict[str, Exception]
+
+
+def fan_out(calls: Mapping[str, Callable[[], Any]], *, max_concurrency: int) -> FanOutResult:
+    """以有界并发执行一组互相独立的调用（每个调用单独失败，不拖累其它调用）。
+
+    Args:
+        calls: key -> 无参调用（通常是一次 API 请求）。
+        max_concurrency: 最大并发数（<=1 时退化为顺序执行）。
+
+    Returns:
+        FanOutResult：整体耗时约等于最慢的一批调用，而不是所有调用之和。
+    """
+
+    values: dict[str, Any] = {}
+    errors: dict[str, Exception] = {}
+    if not calls:
+        return FanOutResult(values=values, errors=errors)
+
+    workers = max(1, min(int(max_concurrency), len(calls)))
+    if workers == 1:
+        for key, fn in calls.items():
+            try:
+                values[key] = fn()
+            except Exception as e:
+                errors[key] = e
+        return FanOutResult(values=values, errors=errors)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rightcodes-fanout") as pool:
+        futures = {key: pool.submit(fn) for key, fn in calls.items()}
+        for key, future in futures.items():
+            try:
+                values[key] = future.result()
+            except Exception as e:
+                errors[key] = e
+    return FanOutResult(values=values, errors=errors)
+
+
+async def async_fan_out(
+    calls: Mapping[str, Callable[[], Awaitable[Any]]],
+    *,
+    max_concurrency: int,
+) -> FanOutResult:
+    """`fan_out` 的 asyncio 版本：在事件循环内以 Semaphore 限制并发（无线程切换）。
+
+    说明：
+    - 每个调用单独失败；取消（CancelledError）不会被吞掉，外层任务取消会中断全部请求。
+    """
+
+    if not calls:
+        return FanOutResult(values={}, errors={})
+
+    semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+
+    async def _run(fn: Callable[[], Awaitable[Any]]) -> Any:
+        async with semaphore:
+            return await fn()
+
+    keys = list(calls)
+    results = await asyncio.gather(*(_run(calls[k]) for k in keys), return_exceptions=True)
+
+    values: dict[str, Any] = {}
+    errors: dict[str, Exception] = {}
+    for key, result in zip(keys, results):
+        if isinstance(result, Exception):
+            errors[key] = result
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            values[key] = result
+    return FanOutResult(values=values, errors=errors)
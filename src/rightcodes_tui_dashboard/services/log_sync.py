@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+from dataclasses import dataclass
+from typing import Any
+
+from rightcodes_tui_dashboard.api.pagination import extract_total, has_more_pages, iter_use_log_pages
+from rightcodes_tui_dashboard.services.calculations import extract_use_logs_items
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch
+from rightcodes_tui_dashboard.storage.use_log_archive import SyncCursor, SyncWatermark, UseLogArchive
+
+DEFAULT_SYNC_PAGE_SIZE = 100
+DEFAULT_SYNC_LOOKBACK = dt.timedelta(days=1)
+
+# 归档中续传游标的名称（见 `UseLogArchive.get_cursor`）。
+_SYNC_CURSOR = "sync"
+_BACKFILL_CURSOR = "backfill"
+
+
+@dataclass(frozen=True)
+class SyncResult:
+    """一次增量同步的结果摘要。"""
+
+    pages: int
+    fetched: int
+    inserted: int
+    watermark: SyncWatermark | None
+    truncated: bool = False
+    resumed: bool = False
+
+
+class UseLogSyncer:
+    """基于水位线的 use-log 增量同步（/use-log/list -> 本地归档）。
+
+    口径：
+    - 水位线 = 已同步到的最新 use-log 时间（+ uid）；每轮只请求 `start_date >= 水位线` 的数据
+    - 边界条目（与水位线同一秒）会被重复返回，由归档按 uid 去重
+    - 首次同步（无水位线）回看 `initial_lookback`
+    - 稳态下新增条目少于一页时，每轮只需请求一小页
+    - 受 `max_pages` 截断时不推进水位线（避免跳过未拉取的页），而是在归档中记录续传游标
+      （固定的 start/end + 下一页页码）；下轮从该页继续，拉完整个窗口后才推进水位线
+
+    说明：
+    - 本类只负责“下一次请求什么 + 如何合并结果”；同步/异步 client 分别用 `run` / `arun` 驱动。
+    """
+
+    def __init__(
+        self,
+        archive: UseLogArchive,
+        *,
+        now: dt.datetime | None = None,
+        page_size: int = DEFAULT_SYNC_PAGE_SIZE,
+        initial_lookback: dt.timedelta = DEFAULT_SYNC_LOOKBACK,
+        max_pages: int | None = None,
+    ) -> None:
+        self._archive = archive
+        self._now = now or dt.datetime.now()
+        self._page_size = max(1, int(page_size))
+        self._max_pages = max_pages if max_pages is None else max(1, int(max_pages))
+
+        watermark = archive.get_watermark()
+        self._start = watermark.time if watermark is not None else self._now - initial_lookback
+        self._first_sync = watermark is None
+        self._newest = watermark
+        self._page = 1
+
+        cursor = archive.get_cursor(_SYNC_CURSOR)
+        self._resumed = cursor is not None
+        if cursor is not None:
+            self._start = cursor.start_time
+            self._now = cursor.end_time
+            self._page = cursor.page
+            self._first_sync = cursor.first_sync
+            self._newest = _newer(watermark, cursor.newest)
+
+        self._started_page = self._page
+        self._done = False
+        self._truncated = False
+        self._pages = 0
+        self._fetched = 0
+        self._inserted = 0
+
+    def next_request(self) -> dict[str, Any] | None:
+        """返回下一次 `use_logs_list` 的参数；同步完成时返回 None。"""
+
+        if self._done:
+            return None
+        return {
+            "page": self._page,
+            "page_size": self._page_size,
+            "start_date": self._start.strftime("%Y-%m-%dT%H:%M:%S"),
+            "end_date": self._now.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def ingest(self, payload: dict[str, Any]) -> None:
+        """合并一页响应到本地归档，并判断是否还有下一页。"""
+
+        items = extract_use_logs_items(payload)
+        self._pages += 1
+        self._fetched += len(items)
+        batch = UseLogBatch.from_items(items)
+        self._inserted += self._archive.upsert_items(items, batch=batch)
+
+        newest = batch.newest_index()
+        if newest is not None:
+            ts = batch.epoch[newest]
+            if self._newest is None or ts > self._newest.ts:
+                self._newest = SyncWatermark(ts=ts, uid=batch.ids[newest])
+
+        more = has_more_pages(
+            page=self._page,
+            page_size=self._page_size,
+            item_count=len(items),
+            total=extract_total(payload),
+        )
+        if not more:
+            self._finish()
+        elif self._max_pages is not None and self._page - self._started_page + 1 >= self._max_pages:
+            self._truncated = True
+            self._done = True
+            self._archive.set_cursor(
+                _SYNC_CURSOR,
+                SyncCursor(
+                    start=self._start.timestamp(),
+                    end=self._now.timestamp(),
+                    page=self._page + 1,
+                    newest=self._newest,
+                    first_sync=self._first_sync,
+                ),
+            )
+        else:
+            self._page += 1
+
+    def result(self) -> SyncResult:
+        return SyncResult(
+            pages=self._pages,
+            fetched=self._fetched,
+            inserted=self._inserted,
+            watermark=self._newest,
+            truncated=self._truncated,
+            resumed=self._resumed,
+        )
+
+    def run(self, client: Any) -> SyncResult:
+        """使用同步 client（RightCodesApiClient）执行完整同步。"""
+
+        request = self.next_request()
+        while request is not None:
+            self.ingest(client.use_logs_list(**request))
+            request = self.next_request()
+        return self.result()
+
+    async def arun(self, client: Any) -> SyncResult:
+        """使用异步 client（AsyncRightCodesApiClient）执行完整同步。
+
+        说明：每页的归档写入（SQLite）放到线程中执行，不阻塞事件循环。
+        """
+
+        request = self.next_request()
+        while request is not None:
+            payload = await client.use_logs_list(**request)
+            await asyncio.to_thread(self.ingest, payload)
+            request = self.next_request()
+        return self.result()
+
+    def _finish(self) -> None:
+        self._done = True
+        if self._first_sync:
+            self._archive.set_coverage_start(self._start)
+        if self._newest is not None:
+            self._archive.set_watermark(self._newest)
+        self._archive.set_synced_until(self._now)
+        self._archive.set_cursor(_SYNC_CURSOR, None)
+
+
+def _newer(a: SyncWatermark | None, b: SyncWatermark | None) -> SyncWatermark | None:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return b if b.ts > a.ts else a
+
+
+def backfill_archive(
+    archive: UseLogArchive,
+    client: Any,
+    *,
+    since: dt.datetime,
+    page_size: int = DEFAULT_SYNC_PAGE_SIZE,
+    max_pages: int | None = None,
+) -> SyncResult:
+    """回填覆盖起点之前的 use-log：拉取 `[since, 覆盖起点]`，完成后把覆盖起点前移到 since。
+
+    说明：
+    - 归档尚未同步过（无覆盖起点）或已覆盖 since 时不请求（首次同步请用 `UseLogSyncer` 的 initial_lookback）
+    - 受 `max_pages` 截断时不前移覆盖起点，而是记录续传游标（固定的 `[since, 覆盖起点]` + 下一页）；
+      下次回填优先从游标继续（此时沿用上次的 since），完成后才前移覆盖起点
+    - 使用同步 client（RightCodesApiClient）
+    """
+
+    watermark = archive.get_watermark()
+    cursor = archive.get_cursor(_BACKFILL_CURSOR)
+    if cursor is not None:
+        since, until, start_page = cursor.start_time, cursor.end_time, cursor.page
+    else:
+        until = archive.get_coverage_start()
+        start_page = 1
+        if until is None or until <= since:
+            return SyncResult(pages=0, fetched=0, inserted=0, watermark=watermark)
+
+    page_size = max(1, int(page_size))
+    pages = fetched = inserted = 0
+    truncated = False
+    last_page = start_page - 1
+    for page in iter_use_log_pages(
+        client,
+        page_size=page_size,
+        start_date=since.strftime("%Y-%m-%dT%H:%M:%S"),
+        end_date=until.strftime("%Y-%m-%dT%H:%M:%S"),
+        start_page=start_page,
+        max_pages=max_pages,
+    ):
+        pages += 1
+        fetched += len(page.items)
+        inserted += archive.upsert_items(page.items)
+        last_page = page.page
+        truncated = max_pages is not None and pages >= max_pages and has_more_pages(
+            page=page.page, page_size=page_size, item_count=len(page.items), total=page.total
+        )
+
+    if truncated:
+        archive.set_cursor(
+            _BACKFILL_CURSOR, SyncCursor(start=since.timestamp(), end=until.timestamp(), page=last_page + 1)
+        )
+    else:
+        archive.set_coverage_start(since)
+        archive.set_cursor(_BACKFILL_CURSOR, None)
+    return SyncResult(
+        pages=pages,
+        fetched=fetched,
+        inserted=inserted,
+        watermark=watermark,
+        truncated=truncated,
+        resumed=cursor is not None,
+    )
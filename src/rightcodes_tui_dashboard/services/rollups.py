@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import datetime as dt
+from typing import Any
+
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogAggregate, UseLogArchive
+
+_BUCKET_FORMATS = {
+    "hour": ("%Y-%m-%d %H:00", dt.timedelta(hours=1)),
+    "day": ("%Y-%m-%d", dt.timedelta(days=1)),
+}
+
+
+class LocalRollups:
+    """由本地 use-log 归档计算 stats / advanced 形状的 payload（替代对应的 API 请求）。
+
+    口径：
+    - 只有 `[start, end]` 完全落在归档的连续覆盖区间内（见 `UseLogArchive.covers`）才可使用
+    - 输出形状与 `/use-log/stats`、`/use-log/stats/advanced` 一致，可直接交给
+      `extract_stats_totals` / `extract_model_usage_rows` / `extract_advanced_buckets`
+    - 趋势 bucket 按本地时间分桶；区间内没有记录的 bucket 补 0（与服务端按时间序列返回的口径一致）
+    """
+
+    def __init__(self, archive: UseLogArchive) -> None:
+        self._archive = archive
+
+    def covers(self, start: dt.datetime, end: dt.datetime) -> bool:
+        return self._archive.covers(start, end)
+
+    def stats_payload(self, *, start: dt.datetime, end: dt.datetime) -> dict[str, Any]:
+        """区间汇总（total_requests/total_tokens/total_cost）。"""
+
+        return _totals_payload(self._archive.aggregate(group_by="model", start=start, end=end))
+
+    def advanced_payload(self, *, start: dt.datetime, end: dt.datetime, granularity: str) -> dict[str, Any]:
+        """趋势 buckets + 按模型汇总（details_by_model）。
+
+        Raises:
+            ValueError: 不支持的 granularity（仅 hour/day）。
+        """
+
+        spec = _BUCKET_FORMATS.get(granularity)
+        if spec is None:
+            raise ValueError(f"Unsupported granularity: {granularity}")
+        fmt, step = spec
+
+        by_bucket = {
+            row.group: row for row in self._archive.aggregate(group_by=granularity, start=start, end=end)
+        }
+        buckets: list[dict[str, Any]] = []
+        for label in _bucket_labels(start, end, fmt=fmt, step=step):
+            row = by_bucket.get(label)
+            buckets.append(
+                {
+                    "time": label,
+                    "requests": row.requests if row else 0,
+                    "tokens": (row.tokens or 0.0) if row else 0.0,
+                    "cost": (row.cost or 0.0) if row else 0.0,
+                }
+            )
+
+        models = self._archive.aggregate(group_by="model", start=start, end=end)
+        return {
+            "data": buckets,
+            "details_by_model": [_model_row(row) for row in models],
+        }
+
+
+def _bucket_labels(start: dt.datetime, end: dt.datetime, *, fmt: str, step: dt.timedelta) -> list[str]:
+    cur = start.replace(minute=0, second=0, microsecond=0)
+    if step >= dt.timedelta(days=1):
+        cur = cur.replace(hour=0)
+    labels: list[str] = []
+    while cur <= end:
+        labels.append(cur.strftime(fmt))
+        cur += step
+    return labels
+
+
+def _model_row(row: UseLogAggregate) -> dict[str, Any]:
+    out: dict[str, Any] = {"model": row.group, "total_requests": row.requests}
+    if row.tokens is not None:
+        out["total_tokens"] = row.tokens
+    if row.cost is not None:
+        out["total_cost"] = row.cost
+    return out
+
+
+def _totals_payload(rows: list[UseLogAggregate]) -> dict[str, Any]:
+    out: dict[str, Any] = {"total_requests": sum(r.requests for r in rows)}
+    tokens = [r.tokens for r in rows if r.tokens is not None]
+    costs = [r.cost for r in rows if r.cost is not None]
+    if tokens:
+        out["total_tokens"] = sum(tokens)
+    if costs:
+        out["total_cost"] = sum(costs)
+    return out
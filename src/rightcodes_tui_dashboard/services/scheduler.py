@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+from typing import Iterable, Mapping
+
+
+class RefreshScheduler:
+    """按数据源独立调度刷新（各自的间隔 + jitter）。
+
+    口径：
+    - 每个数据源有独立间隔（秒）；间隔为 None/<=0 表示该数据源不自动刷新（仅手动刷新）。
+    - 下一次刷新时间 = 本次刷新时间 + interval × (1 ± jitter)，避免多个数据源/多个实例同一时刻扎堆请求。
+    - 尚未刷新过的数据源视为“立即到期”。
+    """
+
+    def __init__(
+        self,
+        intervals: Mapping[str, int | None],
+        *,
+        jitter: float = 0.1,
+        rng: random.Random | None = None,
+    ) -> None:
+        self._intervals: dict[str, int] = {
+            name: int(seconds) for name, seconds in intervals.items() if seconds is not None and int(seconds) > 0
+        }
+        self._jitter = min(0.5, max(0.0, float(jitter)))
+        self._rng = rng or random.Random()
+        self._next_at: dict[str, dt.datetime] = {}
+
+    @property
+    def active(self) -> bool:
+        """是否存在任一自动刷新的数据源。"""
+
+        return bool(self._intervals)
+
+    def interval_of(self, name: str) -> int | None:
+        """返回数据源的刷新间隔（秒）；不自动刷新时返回 None。"""
+
+        return self._intervals.get(name)
+
+    def min_interval_of(self, name: str) -> float | None:
+        """返回数据源两次定时刷新之间的最短间隔（秒；interval × (1 - jitter)）；不自动刷新时返回 None。"""
+
+        interval = self._intervals.get(name)
+        return None if interval is None else interval * (1.0 - self._jitter)
+
+    def due(self, now: dt.datetime) -> list[str]:
+        """返回当前已到期的数据源（按配置顺序）。"""
+
+        out: list[str] = []
+        for name in self._intervals:
+            next_at = self._next_at.get(name)
+            if next_at is None or now >= next_at:
+                out.append(name)
+        return out
+
+    def mark_scheduled(self, names: Iterable[str], now: dt.datetime) -> None:
+        """登记数据源已发起刷新，并计算各自下一次刷新时间。"""
+
+        for name in names:
+            interval = self._intervals.get(name)
+            if interval is None:
+                continue
+            factor = 1.0 + self._rng.uniform(-self._jitter, self._jitter) if self._jitter else 1.0
+            self._next_at[name] = now + dt.timedelta(seconds=interval * factor)
+
+    def next_due_at(self) -> dt.datetime | None:
+        """最近一次将到期的时间（用于状态栏展示）。"""
+
+        pending = [self._next_at[name] for name in self._intervals if name in self._next_at]
+        return min(pending) if pending else None
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from operator import itemgetter
+from typing import AbstractSet, Any, Callable, Iterable, Mapping, Sequence
+
+Accessor = Callable[[Mapping[str, Any]], Any]
+ColumnParser = Callable[[Sequence[Any]], list]
+
+
+@dataclass(frozen=True)
+class CompiledField:
+    """针对某个形状编译后的字段访问方式。
+
+    Attributes:
+        key: 直接读取的顶层 key（None 表示该形状下字段必然缺失）。
+        parse: 对 `item[key]` 的解析器（返回 None 表示不可用）。
+        fallback: `parse` 返回 None 时的补充探测（None 表示无需补充，直接视为缺失）。
+        column: `parse` 的整列版本（可选；用于批量抽取时减少逐值函数调用）。
+    """
+
+    key: str | None
+    parse: Callable[[Any], Any]
+    fallback: Accessor | None = None
+    column: ColumnParser | None = None
+
+
+@dataclass(frozen=True)
+class FieldSpec:
+    """字段抽取规则：按优先级排列的候选 keys + 值解析器（解析失败返回 None）。
+
+    Attributes:
+        keys: 候选 keys（优先级从高到低）。
+        parse: 值解析器；返回 None 表示该 key 的值不可用，继续尝试下一个 key。
+        probe: 完整探测实现（形状不匹配时回退）；默认按 keys 逐个探测。
+        compile: 自定义编译（用于嵌套字段等无法按顶层 keys 描述的规则）；入参为形状（顶层 keys）。
+        column: `parse` 的整列版本（可选）。
+    """
+
+    keys: tuple[str, ...]
+    parse: Callable[[Any], Any]
+    probe: Accessor | None = None
+    compile: Callable[[AbstractSet[str]], CompiledField] | None = None
+    column: ColumnParser | None = None
+
+
+def probe_first(item: Mapping[str, Any], keys: Sequence[str], parse: Callable[[Any], Any]) -> Any:
+    """逐个 key 探测，返回第一个可解析的值（即“未编译”的通用口径）。"""
+
+    for k in keys:
+        v = parse(item.get(k))
+        if v is not None:
+            return v
+    return None
+
+
+def compile_first(
+    shape: AbstractSet[str],
+    keys: Sequence[str],
+    parse: Callable[[Any], Any],
+    column: ColumnParser | None = None,
+) -> CompiledField:
+    """针对给定形状（顶层 keys 集合）编译 `probe_first`。
+
+    形状中不存在的候选 key 直接剔除：对同形状的 item，结果与 `probe_first` 完全一致，
+    但无需再逐个探测缺失的 key 变体。
+    """
+
+    present = tuple(k for k in keys if k in shape)
+    if not present:
+        return CompiledField(key=None, parse=_always_none)
+    rest = present[1:]
+    fallback = (lambda item: probe_first(item, rest, parse)) if rest else None
+    return CompiledField(key=present[0], parse=parse, fallback=fallback, column=column)
+
+
+class ShapePlan:
+    """按 payload 形状“编译”的多字段抽取器（每个响应检测一次形状，逐条复用）。
+
+    口径：
+    - 以样本 item 的顶层 keys 作为形状；item 形状一致时，一次 itemgetter 取出全部字段的原始值
+      再逐个解析（只有解析失败的字段才补充探测）
+    - 形状不一致的 item 回退到逐 key 探测（结果与未编译时一致）
+    """
+
+    def __init__(self, specs: Sequence[FieldSpec], sample: Mapping[str, Any] | None) -> None:
+        self._specs = tuple(specs)
+        self._probes: tuple[Accessor, ...] = tuple(_probe_of(spec) for spec in self._specs)
+        self._shape: frozenset[str] | None = None
+        if not isinstance(sample, Mapping) or not sample or not self._specs:
+            return
+
+        shape = frozenset(sample)
+        compiled = [
+            spec.compile(shape) if spec.compile else compile_first(shape, spec.keys, spec.parse, spec.column)
+            for spec in self._specs
+        ]
+        # 必然缺失的字段也映射到一个存在的 key（解析器恒返回 None），以便用单个 itemgetter 取值。
+        any_key = next(iter(shape))
+        keys = [c.key if c.key is not None else any_key for c in compiled]
+        self._keys = tuple(c.key for c in compiled)
+        self._getter = itemgetter(*keys) if len(keys) > 1 else (lambda item, _k=keys[0]: (item[_k],))
+        self._parsers = tuple(c.parse for c in compiled)
+        self._columns: tuple[ColumnParser, ...] = tuple(
+            c.column or (lambda values, _p=c.parse: [_p(v) for v in values]) for c in compiled
+        )
+        self._fallbacks = tuple(c.fallback for c in compiled)
+        self._has_fallback = any(f is not None for f in self._fallbacks)
+        self._shape = shape
+
+    @classmethod
+    def for_items(cls, specs: Sequence[FieldSpec], items: Iterable[Any]) -> "ShapePlan":
+        """以第一条 dict item 作为样本构建 plan。"""
+
+        sample = next((x for x in items if isinstance(x, dict)), None)
+        return cls(specs, sample)
+
+    def matches(self, item: Mapping[str, Any]) -> bool:
+        """item 是否与样本同形状（可走预编译路径）。"""
+
+        return self._shape is not None and item.keys() == self._shape
+
+    def extract(self, item: Mapping[str, Any]) -> tuple[Any, ...]:
+        """抽取全部字段（顺序与 specs 一致）。"""
+
+        if self._shape is None or item.keys() != self._shape:
+            return tuple([fn(item) for fn in self._probes])
+
+        values = [parse(raw) for parse, raw in zip(self._parsers, self._getter(item))]
+        if self._has_fallback and None in values:
+            for i, fallback in enumerate(self._fallbacks):
+                if fallback is not None and values[i] is None:
+                    values[i] = fallback(item)
+        return tuple(values)
+
+    def extract_columns(self, items: Sequence[Mapping[str, Any]]) -> list[list[Any]]:
+        """按列批量抽取（每个字段一列，行顺序与 items 一致）。
+
+        全部 item 同形状时：逐列用 itemgetter 取出原始值后整列解析；否则逐条 `extract`。
+        """
+
+        if not items:
+            return [[] for _ in self._specs]
+        shape = self._shape
+        if shape is None or not all(item.keys() == shape for item in items):
+            rows = [self.extract(item) for item in items]
+            return [list(col) for col in zip(*rows)]
+
+        columns: list[list[Any]] = []
+        for key, to_column, fallback in zip(self._keys, self._columns, self._fallbacks):
+            if key is None:
+                columns.append([None] * len(items))
+                continue
+            values = to_column(list(map(itemgetter(key), items)))
+            if fallback is not None and None in values:
+                for i, v in enumerate(values):
+                    if v is None:
+                        values[i] = fallback(items[i])
+            columns.append(values)
+        return columns
+
+
+def str_column(values: Sequence[Any]) -> list[str | None]:
+    """整列解析非空 str（strip 后；其它类型视为无效）。"""
+
+    return [(v.strip() or None) if isinstance(v, str) else None for v in values]
+
+
+def real_column(values: Sequence[Any]) -> list[float | None]:
+    """整列解析 int/float（bool 视为无效）。"""
+
+    return [
+        float(v) if v.__class__ is float or v.__class__ is int else _real_or_none(v)
+        for v in values
+    ]
+
+
+def _real_or_none(value: Any) -> float | None:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _probe_of(spec: FieldSpec) -> Accessor:
+    if spec.probe is not None:
+        return spec.probe
+    keys, parse = spec.keys, spec.parse
+    return lambda item: probe_first(item, keys, parse)
+
+
+def _always_none(_value: Any) -> None:
+    return None
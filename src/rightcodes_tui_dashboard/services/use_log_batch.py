@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import math
+import sys
+from array import array
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+from rightcodes_tui_dashboard.services.calculations import extract_use_logs_items
+from rightcodes_tui_dashboard.services.use_logs import UseLogRecord, parse_use_log_time, use_log_plan
+
+_NAN = float("nan")
+
+# `to_items` 使用的规范字段名（与 UseLogRecord 字段一一对应；均为抽取时的首选 key）。
+_ITEM_KEYS = (
+    "id",
+    "time",
+    "model",
+    "api_key_name",
+    "channel",
+    "total_tokens",
+    "cost",
+    "billing_rate",
+    "billing_source",
+    "ip",
+)
+
+
+class UseLogBatch:
+    """一批 use-log 的列式表示（每个响应构建一次，渲染/聚合/归档直接按列读取）。
+
+    口径：
+    - 数值列（epoch/tokens/cost/billing_rate）为 `array('d')`，缺失值为 NaN
+    - 低基数字符串列（model/key/channel/billing_source/ip）做 `sys.intern`，同值共享同一对象
+    - 行顺序与输入中的 dict items 一致（非 dict 元素被忽略）
+    - 字段口径与 `extract_use_log_*` 一致
+
+    说明：epoch 为本地时间戳（与 `parse_use_log_time(...).timestamp()` 一致），时间无法解析时为 NaN。
+    """
+
+    __slots__ = (
+        "ids",
+        "times",
+        "epoch",
+        "models",
+        "keys",
+        "channels",
+        "tokens",
+        "cost",
+        "billing_rate",
+        "billing_sources",
+        "ips",
+    )
+
+    def __init__(
+        self,
+        *,
+        ids: list[str | None],
+        times: list[str | None],
+        epoch: array,
+        models: list[str | None],
+        keys: list[str | None],
+        channels: list[str | None],
+        tokens: array,
+        cost: array,
+        billing_rate: array,
+        billing_sources: list[str | None],
+        ips: list[str | None],
+    ) -> None:
+        self.ids = ids
+        self.times = times
+        self.epoch = epoch
+        self.models = models
+        self.keys = keys
+        self.channels = channels
+        self.tokens = tokens
+        self.cost = cost
+        self.billing_rate = billing_rate
+        self.billing_sources = billing_sources
+        self.ips = ips
+
+    @classmethod
+    def from_items(cls, items: Iterable[Any]) -> "UseLogBatch":
+        """从 `extract_use_logs_items` 的输出构建（一次形状检测 + 按列抽取）。"""
+
+        dict_items = [item for item in items if isinstance(item, dict)]
+        (
+            ids,
+            times,
+            models,
+            keys,
+            channels,
+            tokens,
+            cost,
+            billing_rate,
+            billing_sources,
+            ips,
+        ) = use_log_plan(dict_items).extract_columns(dict_items)
+        return cls(
+            ids=ids,
+            times=times,
+            epoch=array("d", _epoch_column(times)),
+            models=_intern_column(models),
+            keys=_intern_column(keys),
+            channels=_intern_column(channels),
+            tokens=_real_array(tokens),
+            cost=_real_array(cost),
+            billing_rate=_real_array(billing_rate),
+            billing_sources=_intern_column(billing_sources),
+            ips=_intern_column(ips),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def record(self, index: int) -> UseLogRecord:
+        """取第 index 行（缺失值还原为 None）。"""
+
+        return UseLogRecord(
+            self.ids[index],
+            self.times[index],
+            self.models[index],
+            self.keys[index],
+            self.channels[index],
+            _none_if_nan(self.tokens[index]),
+            _none_if_nan(self.cost[index]),
+            _none_if_nan(self.billing_rate[index]),
+            self.billing_sources[index],
+            self.ips[index],
+        )
+
+    def records(self, limit: int | None = None) -> Iterator[UseLogRecord]:
+        """按行顺序迭代（可选只取前 limit 行）。"""
+
+        n = len(self) if limit is None else min(len(self), max(0, limit))
+        for i in range(n):
+            yield self.record(i)
+
+    def to_items(self) -> list[dict[str, Any]]:
+        """还原为规范字段名的 dict items（只含已抽取的字段；用于快照等 JSON 落盘）。"""
+
+        return [
+            {key: value for key, value in zip(_ITEM_KEYS, record) if value is not None} for record in self.records()
+        ]
+
+    def newest_index(self) -> int | None:
+        """epoch 最大的行（时间均无法解析或批次为空时返回 None）。"""
+
+        best: int | None = None
+        best_ts = -math.inf
+        for i, ts in enumerate(self.epoch):
+            if ts > best_ts:  # NaN 比较恒为 False，自然跳过
+                best, best_ts = i, ts
+        return best
+
+
+@dataclass(frozen=True)
+class UseLogPageBatch:
+    """一页 /use-log/list 响应的列式表示（批次 + 分页信息；不再持有原始 dict）。"""
+
+    batch: UseLogBatch
+    total: int | None = None
+    page: int | None = None
+    page_size: int | None = None
+
+    @classmethod
+    def from_payload(cls, payload: dict[str, Any]) -> "UseLogPageBatch":
+        """从 `use_logs_list` 响应构建（每个响应构建一次）。"""
+
+        return cls(
+            batch=UseLogBatch.from_items(extract_use_logs_items(payload)),
+            total=_int_or_none(payload.get("total")),
+            page=_int_or_none(payload.get("page")),
+            page_size=_int_or_none(payload.get("page_size")),
+        )
+
+    def to_payload(self) -> dict[str, Any]:
+        """还原为 `use_logs_list` 形状的 JSON 对象（`from_payload` 可再次读取）。"""
+
+        payload: dict[str, Any] = {"items": self.batch.to_items()}
+        for key in ("total", "page", "page_size"):
+            value = getattr(self, key)
+            if value is not None:
+                payload[key] = value
+        return payload
+
+
+def _int_or_none(value: Any) -> int | None:
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def _epoch_column(times: list[str | None]) -> list[float]:
+    out: list[float] = []
+    cache: dict[str, float] = {}
+    append = out.append
+    for raw in times:
+        if raw is None:
+            append(_NAN)
+            continue
+        ts = cache.get(raw)
+        if ts is None:
+            parsed = parse_use_log_time(raw)
+            ts = _NAN if parsed is None else parsed.timestamp()
+            cache[raw] = ts
+        append(ts)
+    return out
+
+
+def _intern_column(values: list[str | None]) -> list[str | None]:
+    intern = sys.intern
+    return [None if v is None else intern(v) for v in values]
+
+
+def _real_array(values: list[float | None]) -> array:
+    return array("d", [_NAN if v is None else v for v in values])
+
+
+def _none_if_nan(value: float) -> float | None:
+    return None if value != value else value
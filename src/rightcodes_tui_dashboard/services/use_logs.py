@@ -1,6 +1,28 @@
 from __future__ import annotations
 
-from typing import Any
+import datetime as dt
+from typing import AbstractSet, Any, Iterable, NamedTuple
+
+from rightcodes_tui_dashboard.services.shape import (
+    CompiledField,
+    FieldSpec,
+    ShapePlan,
+    compile_first,
+    probe_first,
+    str_column,
+)
+
+_TIME_KEYS = ("time", "ts", "timestamp", "date", "request_time", "created_at")
+_KEY_KEYS = ("api_key_name", "key_name", "api_key", "key", "key_id")
+_MODEL_KEYS = ("model", "model_name", "model_id")
+_COST_KEYS = ("cost", "total_cost", "amount", "charged", "fee")
+_ID_KEYS = ("id", "log_id", "request_id", "uuid")
+_CHANNEL_KEYS = ("upstream_prefix", "channel", "source", "provider", "app", "type", "path", "route")
+_BILLING_RATE_KEYS = ("billing_rate", "billing_multiplier", "rate_multiplier", "multiplier", "ratio")
+_BILLING_SOURCE_KEYS = ("billing_source", "deduct_source", "quota_source", "deduct_from", "balance_type", "note")
+_IP_KEYS = ("ip", "client_ip", "ip_address")
+_USAGE_TOKEN_KEYS = ("total_tokens", "tokens", "token_count", "usage_tokens", "totalTokens")
+_TOP_TOKEN_KEYS = ("total_tokens", "tokens", "token_count", "usage_tokens")
 
 
 def _get_nested(obj: dict[str, Any], path: tuple[str, ...]) -> Any:
@@ -46,23 +68,64 @@ def _parse_number(value: Any) -> float | None:
     return None
 
 
+def _number_column(values: Any) -> list[float | None]:
+    """`_parse_number` 的整列版本（int/float 走快路径）。"""
+
+    return [float(v) if v.__class__ is float or v.__class__ is int else _parse_number(v) for v in values]
+
+
+def _id_column(values: Any) -> list[str | None]:
+    """`_parse_id` 的整列版本（int 走快路径）。"""
+
+    return [str(v) if v.__class__ is int else _parse_id(v) for v in values]
+
+
+def _usage_tokens_column(values: Any) -> list[float | None]:
+    """`usage.total_tokens` 的整列版本。"""
+
+    out: list[float | None] = []
+    append = out.append
+    for usage in values:
+        if usage.__class__ is dict:
+            v = usage.get("total_tokens")
+            append(float(v) if v.__class__ is int or v.__class__ is float else _parse_number(v))
+        else:
+            append(_usage_total_tokens(usage))
+    return out
+
+
+def _parse_str(value: Any) -> str | None:
+    """非空 str（strip 后）；其它类型视为无效。"""
+
+    if isinstance(value, str):
+        text = value.strip()
+        return text or None
+    return None
+
+
+def _parse_id(value: Any) -> str | None:
+    """服务端 ID：int/str（bool 视为无效）。"""
+
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, str)):
+        text = str(value).strip()
+        return text or None
+    return None
+
+
 def extract_use_log_tokens(item: dict[str, Any]) -> float | None:
     """抽取单条 use-log 的 tokens 数（优先 usage.total_tokens）。"""
 
     usage = item.get("usage")
     if isinstance(usage, dict):
-        tokens = _parse_number(usage.get("total_tokens"))
+        tokens = probe_first(usage, _USAGE_TOKEN_KEYS, _parse_number)
         if tokens is not None:
             return tokens
-        for k in ("tokens", "token_count", "usage_tokens", "totalTokens"):
-            tokens = _parse_number(usage.get(k))
-            if tokens is not None:
-                return tokens
 
-    for k in ("total_tokens", "tokens", "token_count", "usage_tokens"):
-        tokens = _parse_number(item.get(k))
-        if tokens is not None:
-            return tokens
+    tokens = probe_first(item, _TOP_TOKEN_KEYS, _parse_number)
+    if tokens is not None:
+        return tokens
 
     nested = _parse_number(_get_nested(item, ("usage", "total_tokens")))
     return nested
@@ -71,21 +134,13 @@ def extract_use_log_tokens(item: dict[str, Any]) -> float | None:
 def extract_use_log_channel(item: dict[str, Any]) -> str | None:
     """抽取“渠道”展示字段（优先 upstream_prefix，其次 channel/source/type）。"""
 
-    for k in ("upstream_prefix", "channel", "source", "provider", "app", "type", "path", "route"):
-        v = item.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+    return probe_first(item, _CHANNEL_KEYS, _parse_str)
 
 
 def extract_use_log_billing_rate(item: dict[str, Any]) -> float | None:
     """抽取计费倍率（优先 billing_rate）。"""
 
-    for k in ("billing_rate", "billing_multiplier", "rate_multiplier", "multiplier", "ratio"):
-        n = _parse_number(item.get(k))
-        if n is not None:
-            return n
-    return None
+    return probe_first(item, _BILLING_RATE_KEYS, _parse_number)
 
 
 def format_billing_rate(rate: float | None) -> str:
@@ -99,11 +154,7 @@ def format_billing_rate(rate: float | None) -> str:
 def extract_use_log_billing_source(item: dict[str, Any]) -> str | None:
     """抽取扣费来源字段。"""
 
-    for k in ("billing_source", "deduct_source", "quota_source", "deduct_from", "balance_type", "note"):
-        v = item.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+    return probe_first(item, _BILLING_SOURCE_KEYS, _parse_str)
 
 
 def format_billing_source(value: str | None) -> str:
@@ -123,9 +174,114 @@ def format_billing_source(value: str | None) -> str:
 def extract_use_log_ip(item: dict[str, Any]) -> str | None:
     """抽取 IP（个人工具：用于本地展示，不做掩码）。"""
 
-    for k in ("ip", "client_ip", "ip_address"):
-        v = item.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
+    return probe_first(item, _IP_KEYS, _parse_str)
+
+
+def extract_use_log_time(item: dict[str, Any]) -> str | None:
+    """抽取时间字段原始字符串（time/ts/timestamp/... 变体）。"""
+
+    return probe_first(item, _TIME_KEYS, _parse_str)
+
+
+def parse_use_log_time(value: str | None) -> dt.datetime | None:
+    """解析 use-log 时间字符串为本地 naive datetime（无法解析返回 None）。"""
+
+    text = (value or "").strip().replace("T", " ")
+    if not text:
+        return None
+    try:
+        if text.endswith("Z"):
+            text = text[:-1] + "+00:00"
+        parsed = dt.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
+
+def extract_use_log_key(item: dict[str, Any]) -> str | None:
+    """抽取“密钥”展示字段（api_key_name/key_name/...）。"""
+
+    return probe_first(item, _KEY_KEYS, _parse_str)
+
+
+def extract_use_log_model(item: dict[str, Any]) -> str | None:
+    """抽取模型名。"""
+
+    return probe_first(item, _MODEL_KEYS, _parse_str)
+
+
+def extract_use_log_cost(item: dict[str, Any]) -> float | None:
+    """抽取单条 use-log 的费用（cost/total_cost/amount/charged/fee）。"""
+
+    return probe_first(item, _COST_KEYS, _parse_number)
+
+
+def extract_use_log_id(item: dict[str, Any]) -> str | None:
+    """抽取单条 use-log 的服务端 ID（若存在）。"""
+
+    return probe_first(item, _ID_KEYS, _parse_id)
+
+
+class UseLogRecord(NamedTuple):
+    """单条 use-log 的常用字段（由 `extract_use_log_records` 批量抽取）。"""
+
+    id: str | None
+    time: str | None
+    model: str | None
+    key: str | None
+    channel: str | None
+    tokens: float | None
+    cost: float | None
+    billing_rate: float | None
+    billing_source: str | None
+    ip: str | None
+
+
+def _usage_total_tokens(usage: Any) -> float | None:
+    if isinstance(usage, dict):
+        return _parse_number(usage.get("total_tokens"))
     return None
 
+
+def _compile_tokens(shape: AbstractSet[str]) -> CompiledField:
+    """tokens 的形状编译：无 usage 时只需按顶层 keys 取值；有 usage 时先走 usage.total_tokens 快路径。"""
+
+    if "usage" not in shape:
+        return compile_first(shape, _TOP_TOKEN_KEYS, _parse_number, _number_column)
+    return CompiledField(
+        key="usage",
+        parse=_usage_total_tokens,
+        fallback=extract_use_log_tokens,  # type: ignore[arg-type]
+        column=_usage_tokens_column,
+    )
+
+
+# 字段顺序与 UseLogRecord 一致。
+_USE_LOG_FIELDS = (
+    FieldSpec(_ID_KEYS, _parse_id, column=_id_column),
+    FieldSpec(_TIME_KEYS, _parse_str, column=str_column),
+    FieldSpec(_MODEL_KEYS, _parse_str, column=str_column),
+    FieldSpec(_KEY_KEYS, _parse_str, column=str_column),
+    FieldSpec(_CHANNEL_KEYS, _parse_str, column=str_column),
+    FieldSpec((), _parse_number, probe=extract_use_log_tokens, compile=_compile_tokens),  # type: ignore[arg-type]
+    FieldSpec(_COST_KEYS, _parse_number, column=_number_column),
+    FieldSpec(_BILLING_RATE_KEYS, _parse_number, column=_number_column),
+    FieldSpec(_BILLING_SOURCE_KEYS, _parse_str, column=str_column),
+    FieldSpec(_IP_KEYS, _parse_str, column=str_column),
+)
+
+
+def use_log_plan(items: Iterable[Any]) -> ShapePlan:
+    """为一批（通常是同一响应的）use-log items 构建形状编译的字段抽取 plan。"""
+
+    return ShapePlan.for_items(_USE_LOG_FIELDS, items)
+
+
+def extract_use_log_records(items: list[dict[str, Any]]) -> list[UseLogRecord]:
+    """批量抽取 use-log 常用字段（每个响应检测一次形状；结果与逐字段 `extract_use_log_*` 一致）。"""
+
+    dict_items = [item for item in items if isinstance(item, dict)]
+    columns = use_log_plan(dict_items).extract_columns(dict_items)
+    return [UseLogRecord(*row) for row in zip(*columns)]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+from pathlib import Path
+from typing import Any, Iterable
+
+from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
+
+
+BUCKET_STORE_FILENAME = "stats-buckets.sqlite3"
+
+# 仅保留最近一段时间的 bucket（更早的 range 不会再被 dashboard 请求）。
+_RETENTION = dt.timedelta(days=120)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS buckets (
+        scope TEXT NOT NULL,
+        granularity TEXT NOT NULL,
+        start REAL NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (scope, granularity, start)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS coverage (
+        scope TEXT NOT NULL,
+        granularity TEXT NOT NULL,
+        start REAL NOT NULL,
+        "end" REAL NOT NULL,
+        PRIMARY KEY (scope, granularity)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS prefix_details (
+        scope TEXT NOT NULL,
+        granularity TEXT NOT NULL,
+        start REAL NOT NULL,
+        "end" REAL NOT NULL,
+        payload TEXT NOT NULL,
+        PRIMARY KEY (scope, granularity, start, "end")
+    )
+    """,
+)
+
+
+class StatsBucketStore:
+    """已结束（不可变）的 `/use-log/stats/advanced` bucket 的本地缓存（SQLite）。
+
+    口径：
+    - bucket 以 (granularity, bucket 起始时间) 为 key；只写入完整落在已结束区间内的 bucket
+    - 每个 granularity 记录一段连续的覆盖区间 [start, end)：区间内没有 bucket 表示该时段无用量
+      （服务端可能省略空 bucket），而不是“未缓存”
+    - 另存已结束前缀区间的窗口级字段（details_by_model 等），用于与未结束尾部的响应拼接
+    - 按 scope（base_url + token 的摘要）隔离账号；默认写入全局数据目录（文件权限尽量 0600）
+    """
+
+    def __init__(self, *, scope: str, path: Path | None = None) -> None:
+        self._scope = scope
+        self._path = path or resolve_app_data_path(BUCKET_STORE_FILENAME)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # dashboard 在事件循环线程中使用；daemon/测试可能在其他线程创建。
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        _chmod_600(self._path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        """关闭 SQLite 连接。"""
+
+        self._conn.close()
+
+    def __enter__(self) -> "StatsBucketStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def covers(self, granularity: str, start: dt.datetime, end: dt.datetime) -> bool:
+        """[start, end) 是否完整落在已缓存的覆盖区间内。"""
+
+        row = self._conn.execute(
+            'SELECT start, "end" FROM coverage WHERE scope = ? AND granularity = ?',
+            (self._scope, granularity),
+        ).fetchone()
+        return row is not None and row[0] <= start.timestamp() and end.timestamp() <= row[1]
+
+    def load_buckets(self, granularity: str, start: dt.datetime, end: dt.datetime) -> list[dict[str, Any]]:
+        """读取 [start, end) 内的 bucket（按起始时间升序）。"""
+
+        rows = self._conn.execute(
+            "SELECT payload FROM buckets WHERE scope = ? AND granularity = ? AND start >= ? AND start < ? ORDER BY start",
+            (self._scope, granularity, start.timestamp(), end.timestamp()),
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def save_buckets(
+        self,
+        granularity: str,
+        buckets: Iterable[tuple[dt.datetime, dict[str, Any]]],
+        *,
+        start: dt.datetime,
+        end: dt.datetime,
+    ) -> None:
+        """写入 [start, end) 的完整拉取结果（(bucket 起始时间, bucket) 列表），并更新覆盖区间。
+
+        新区间与已有覆盖区间相接/重叠时合并，否则替换（保证覆盖区间内没有空洞）。
+        """
+
+        if end <= start:
+            return
+        lo, hi = start.timestamp(), end.timestamp()
+        rows = [
+            (self._scope, granularity, bucket_start.timestamp(), json.dumps(bucket, ensure_ascii=False, default=str))
+            for bucket_start, bucket in buckets
+            if lo <= bucket_start.timestamp() < hi
+        ]
+        with self._conn:
+            current = self._conn.execute(
+                'SELECT start, "end" FROM coverage WHERE scope = ? AND granularity = ?',
+                (self._scope, granularity),
+            ).fetchone()
+            if current is not None and lo <= current[1] and current[0] <= hi:
+                lo, hi = min(lo, current[0]), max(hi, current[1])
+            # 覆盖区间在保留期之外的部分一并裁剪。
+            lo = max(lo, (end - _RETENTION).timestamp())
+            # 本次拉取是 [start, end) 的完整结果：先清掉该区间内的旧 bucket。
+            self._conn.execute(
+                "DELETE FROM buckets WHERE scope = ? AND granularity = ? AND start >= ? AND start < ?",
+                (self._scope, granularity, start.timestamp(), end.timestamp()),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO buckets (scope, granularity, start, payload) VALUES (?, ?, ?, ?)", rows
+            )
+            self._conn.execute(
+                'INSERT OR REPLACE INTO coverage (scope, granularity, start, "end") VALUES (?, ?, ?, ?)',
+                (self._scope, granularity, lo, hi),
+            )
+            self._conn.execute(
+                "DELETE FROM buckets WHERE scope = ? AND granularity = ? AND (start < ? OR start >= ?)",
+                (self._scope, granularity, lo, hi),
+            )
+
+    def load_prefix(self, granularity: str, start: dt.datetime, end: dt.datetime) -> dict[str, Any] | None:
+        """读取已结束区间 [start, end) 的完整 advanced payload（bucket + 窗口级字段）；未缓存返回 None。"""
+
+        row = self._conn.execute(
+            'SELECT payload FROM prefix_details WHERE scope = ? AND granularity = ? AND start = ? AND "end" = ?',
+            (self._scope, granularity, start.timestamp(), end.timestamp()),
+        ).fetchone()
+        if row is None or not self.covers(granularity, start, end):
+            return None
+        details = json.loads(row[0])
+        if not isinstance(details, dict):
+            return None
+        return {**details, "data": self.load_buckets(granularity, start, end)}
+
+    def save_prefix(
+        self,
+        granularity: str,
+        *,
+        start: dt.datetime,
+        end: dt.datetime,
+        buckets: Iterable[tuple[dt.datetime, dict[str, Any]]],
+        details: dict[str, Any],
+    ) -> None:
+        """写入已结束区间 [start, end) 的 bucket 与窗口级字段（同粒度下只保留保留期内的前缀）。"""
+
+        self.save_buckets(granularity, buckets, start=start, end=end)
+        with self._conn:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO prefix_details (scope, granularity, start, "end", payload) VALUES (?, ?, ?, ?, ?)',
+                (
+                    self._scope,
+                    granularity,
+                    start.timestamp(),
+                    end.timestamp(),
+                    json.dumps(details, ensure_ascii=False, default=str),
+                ),
+            )
+            # 前缀随时间推进（每个 bucket 周期一个），旧前缀不会再被命中。
+            self._conn.execute(
+                'DELETE FROM prefix_details WHERE scope = ? AND granularity = ? AND "end" < ?',
+                (self._scope, granularity, (end - dt.timedelta(days=2)).timestamp()),
+            )
+
+
+def bucket_scope(*, base_url: str, token: str | None) -> str:
+    """计算 bucket 缓存 scope（摘要；不可逆推出 token）。"""
+
+    raw = "\n".join([base_url.rstrip("/"), token or ""])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _chmod_600(path: Path) -> None:
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        return
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping
+
+from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
+
+
+SNAPSHOT_FILENAME = "dashboard-snapshot.json"
+
+_SNAPSHOT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Dashboard 上一次成功刷新的数据快照（用于启动时立即渲染）。"""
+
+    data: dict[str, Any]
+    fetched_at: dict[str, dt.datetime]
+    saved_at: dt.datetime
+
+
+class DashboardSnapshotStore:
+    """Dashboard 快照存储（warm start）。
+
+    约束：
+    - 默认写入全局数据目录 `dashboard-snapshot.json`（可用 `RIGHTCODES_DATA_DIR` 覆盖；文件权限尽量 0600）
+    - 紧凑 JSON（无缩进），原子替换写入
+    - 快照带 scope（base_url + token + 统计区间的摘要，不保存 token 本身）：
+      换账号/换区间后不会渲染不匹配的旧数据
+    """
+
+    def __init__(self, *, scope: str, path: Path | None = None) -> None:
+        self._scope = scope
+        self._path = path or resolve_app_data_path(SNAPSHOT_FILENAME)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> DashboardSnapshot | None:
+        """读取快照（不存在/损坏/scope 不匹配返回 None）。"""
+
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(raw, dict) or raw.get("v") != _SNAPSHOT_VERSION or raw.get("scope") != self._scope:
+            return None
+        data = raw.get("data")
+        fetched_raw = raw.get("fetched_at")
+        saved_raw = raw.get("saved_at")
+        if not isinstance(data, dict) or not isinstance(fetched_raw, dict):
+            return None
+        fetched_at: dict[str, dt.datetime] = {}
+        for key, ts in fetched_raw.items():
+            if isinstance(ts, (int, float)) and key in data:
+                fetched_at[str(key)] = dt.datetime.fromtimestamp(float(ts))
+        saved_at = dt.datetime.fromtimestamp(float(saved_raw)) if isinstance(saved_raw, (int, float)) else None
+        if saved_at is None:
+            return None
+        return DashboardSnapshot(data=data, fetched_at=fetched_at, saved_at=saved_at)
+
+    def save(self, data: Mapping[str, Any], fetched_at: Mapping[str, dt.datetime]) -> None:
+        """写入快照（覆盖旧快照）。"""
+
+        payload = {
+            "v": _SNAPSHOT_VERSION,
+            "scope": self._scope,
+            "saved_at": dt.datetime.now().timestamp(),
+            "fetched_at": {key: ts.timestamp() for key, ts in fetched_at.items() if key in data},
+            "data": dict(data),
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str),
+            encoding="utf-8",
+        )
+        _chmod_600(tmp_path)
+        tmp_path.replace(self._path)
+
+
+def snapshot_scope(*, base_url: str, token: str | None, range_mode: str, range_seconds: int) -> str:
+    """计算快照 scope（摘要；不可逆推出 token）。"""
+
+    raw = "\n".join([base_url.rstrip("/"), token or "", range_mode, str(int(range_seconds))])
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _chmod_600(path: Path) -> None:
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        return
@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+import os
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch
+from rightcodes_tui_dashboard.utils.paths import resolve_app_data_path
+
+
+ARCHIVE_FILENAME = "use-logs.sqlite3"
+
+# 支持的聚合维度 -> SQL 分组表达式（时间维度按本地时间分桶）。
+_GROUP_BY_SQL = {
+    "model": "COALESCE(model, '—')",
+    "key": "COALESCE(key_name, '—')",
+    "channel": "COALESCE(channel, '—')",
+    "day": "strftime('%Y-%m-%d', ts, 'unixepoch', 'localtime')",
+    "hour": "strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime')",
+}
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS use_logs (
+        uid TEXT PRIMARY KEY,
+        ts REAL,
+        time_raw TEXT,
+        model TEXT,
+        key_name TEXT,
+        channel TEXT,
+        tokens REAL,
+        cost REAL,
+        payload TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_use_logs_ts ON use_logs (ts)",
+    "CREATE INDEX IF NOT EXISTS idx_use_logs_model_ts ON use_logs (model, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_use_logs_key_ts ON use_logs (key_name, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_use_logs_channel_ts ON use_logs (channel, ts)",
+    "CREATE TABLE IF NOT EXISTS sync_state (name TEXT PRIMARY KEY, value TEXT)",
+)
+
+
+@dataclass(frozen=True)
+class SyncWatermark:
+    """增量同步水位线：已同步到的最新 use-log（时间 + uid，用于边界去重）。"""
+
+    ts: float
+    uid: str | None
+
+    @property
+    def time(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.ts)
+
+
+@dataclass(frozen=True)
+class SyncCursor:
+    """被 `max_pages` 截断的分页同步的续传位置。
+
+    口径：
+    - start/end 为首轮固定下来的时间窗口（续传时不再随当前时间变化，页码才稳定）
+    - page 为下一页页码；newest 为已拉取部分中最新的 use-log（完成后写入水位线）
+    - first_sync 表示该轮是首次同步（完成后记录覆盖起点）
+    """
+
+    start: float
+    end: float
+    page: int
+    newest: SyncWatermark | None = None
+    first_sync: bool = False
+
+    @property
+    def start_time(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.start)
+
+    @property
+    def end_time(self) -> dt.datetime:
+        return dt.datetime.fromtimestamp(self.end)
+
+
+@dataclass(frozen=True)
+class UseLogAggregate:
+    """本地归档聚合结果（一行 = 一个分组）。"""
+
+    group: str
+    requests: int
+    tokens: float | None
+    cost: float | None
+
+
+class UseLogArchive:
+    """本地 use-log 归档（SQLite，按 time/model/key/channel 建索引）。
+
+    约束：
+    - 默认写入全局数据目录 `use-logs.sqlite3`（可用 `RIGHTCODES_DATA_DIR` 覆盖；主文件与 -wal/-shm 权限尽量 0600）
+    - 原始 item 以 JSON 保存（输出时由上层负责脱敏）
+    - 以服务端 ID（缺失时以内容哈希）去重，重复写入幂等
+    """
+
+    def __init__(self, path: Path | None = None) -> None:
+        self._path = path or resolve_app_data_path(ARCHIVE_FILENAME)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # 异步调用方会把写入放到线程池中执行（同一时刻只有一个线程使用该连接）。
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        _chmod_600(self._path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for statement in _SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+        # WAL 模式的 -wal/-shm 旁路文件同样包含明细内容
+        for suffix in ("-wal", "-shm"):
+            _chmod_600(self._path.with_name(self._path.name + suffix))
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def close(self) -> None:
+        """关闭 SQLite 连接。"""
+
+        self._conn.close()
+
+    def __enter__(self) -> "UseLogArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def upsert_items(self, items: Iterable[dict[str, Any]], *, batch: UseLogBatch | None = None) -> int:
+        """写入 use-log items（已存在的按 uid 覆盖）。
+
+        Args:
+            items: use-log items。
+            batch: 由同一批 items 构建的列式批次（可选；调用方已构建时传入以免重复抽取）。
+
+        Returns:
+            新增条数（不含覆盖）。
+        """
+
+        dict_items = [item for item in items if isinstance(item, dict)]
+        if batch is None:
+            batch = UseLogBatch.from_items(dict_items)
+        elif len(batch) != len(dict_items):
+            raise ValueError("batch does not match items")
+        rows = [_to_row(item, batch, i) for i, item in enumerate(dict_items)]
+        if not rows:
+            return 0
+        before = self.count()
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO use_logs (uid, ts, time_raw, model, key_name, channel, tokens, cost, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return self.count() - before
+
+    def get_watermark(self) -> SyncWatermark | None:
+        """读取增量同步水位线（从未同步过返回 None）。"""
+
+        raw = self._get_state("watermark")
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            return SyncWatermark(ts=float(data["ts"]), uid=data.get("uid"))
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def set_watermark(self, watermark: SyncWatermark) -> None:
+        """写入增量同步水位线（仅允许前进，不回退）。"""
+
+        current = self.get_watermark()
+        if current is not None and watermark.ts < current.ts:
+            return
+        self._set_state("watermark", json.dumps({"ts": watermark.ts, "uid": watermark.uid}))
+
+    def get_cursor(self, name: str) -> SyncCursor | None:
+        """读取续传游标（`sync`/`backfill`；无未完成的分页时返回 None）。"""
+
+        raw = self._get_state(f"cursor:{name}")
+        if not raw:
+            return None
+        try:
+            data = json.loads(raw)
+            newest = data.get("newest")
+            return SyncCursor(
+                start=float(data["start"]),
+                end=float(data["end"]),
+                page=max(1, int(data["page"])),
+                newest=None if not newest else SyncWatermark(ts=float(newest["ts"]), uid=newest.get("uid")),
+                first_sync=bool(data.get("first_sync", False)),
+            )
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def set_cursor(self, name: str, cursor: SyncCursor | None) -> None:
+        """写入续传游标（None 表示分页已完成，清除游标）。"""
+
+        if cursor is None:
+            with self._conn:
+                self._conn.execute("DELETE FROM sync_state WHERE name = ?", (f"cursor:{name}",))
+            return
+        newest = None if cursor.newest is None else {"ts": cursor.newest.ts, "uid": cursor.newest.uid}
+        data = {
+            "start": cursor.start,
+            "end": cursor.end,
+            "page": cursor.page,
+            "newest": newest,
+            "first_sync": cursor.first_sync,
+        }
+        self._set_state(f"cursor:{name}", json.dumps(data))
+
+    def get_coverage_start(self) -> dt.datetime | None:
+        """本地归档连续覆盖的起点（首次同步的 start_date）。"""
+
+        raw = self._get_state("coverage_start")
+        try:
+            return dt.datetime.fromtimestamp(float(raw)) if raw else None
+        except ValueError:
+            return None
+
+    def set_coverage_start(self, start: dt.datetime) -> None:
+        """记录覆盖起点（只在首次同步时写入，或更早的回填时前移）。"""
+
+        current = self.get_coverage_start()
+        if current is not None and current <= start:
+            return
+        self._set_state("coverage_start", repr(start.timestamp()))
+
+    def get_synced_until(self) -> dt.datetime | None:
+        """最近一次完整同步的截止时间（此前的 use-log 均已入库）。"""
+
+        raw = self._get_state("synced_until")
+        try:
+            return dt.datetime.fromtimestamp(float(raw)) if raw else None
+        except ValueError:
+            return None
+
+    def set_synced_until(self, until: dt.datetime) -> None:
+        """记录同步截止时间（仅允许前进，不回退）。"""
+
+        current = self.get_synced_until()
+        if current is not None and until <= current:
+            return
+        self._set_state("synced_until", repr(until.timestamp()))
+
+    def covers(self, start: dt.datetime, end: dt.datetime) -> bool:
+        """`[start, end]` 是否完全落在本地归档的连续覆盖区间内。"""
+
+        coverage_start = self.get_coverage_start()
+        synced_until = self.get_synced_until()
+        if coverage_start is None or synced_until is None:
+            return False
+        return coverage_start <= start and end <= synced_until
+
+    def _get_state(self, name: str) -> str | None:
+        row = self._conn.execute("SELECT value FROM sync_state WHERE name = ?", (name,)).fetchone()
+        return str(row[0]) if row and row[0] is not None else None
+
+    def _set_state(self, name: str, value: str) -> None:
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO sync_state (name, value) VALUES (?, ?)", (name, value))
+
+    def count(self) -> int:
+        """归档总条数。"""
+
+        row = self._conn.execute("SELECT COUNT(*) FROM use_logs").fetchone()
+        return int(row[0]) if row else 0
+
+    def query(
+        self,
+        *,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        model: str | None = None,
+        key: str | None = None,
+        channel: str | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """按时间范围/过滤条件查询原始 items（时间倒序）。"""
+
+        where, params = _where_clause(start=start, end=end, model=model, key=key, channel=channel)
+        sql = f"SELECT payload FROM use_logs{where} ORDER BY ts DESC, uid DESC"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([int(limit), max(0, int(offset))])
+        out: list[dict[str, Any]] = []
+        for (payload,) in self._conn.execute(sql, params):
+            try:
+                item = json.loads(payload)
+            except ValueError:
+                continue
+            if isinstance(item, dict):
+                out.append(item)
+        return out
+
+    def aggregate(
+        self,
+        *,
+        group_by: str,
+        start: dt.datetime | None = None,
+        end: dt.datetime | None = None,
+        model: str | None = None,
+        key: str | None = None,
+        channel: str | None = None,
+    ) -> list[UseLogAggregate]:
+        """按维度聚合 requests/tokens/cost。
+
+        Args:
+            group_by: model/key/channel/day/hour。
+
+        Raises:
+            ValueError: 不支持的聚合维度。
+        """
+
+        expr = _GROUP_BY_SQL.get(group_by)
+        if expr is None:
+            raise ValueError(f"Unsupported group_by: {group_by}")
+        where, params = _where_clause(start=start, end=end, model=model, key=key, channel=channel)
+        order = "grp ASC" if group_by in ("day", "hour") else "cost_sum DESC, tokens_sum DESC, grp ASC"
+        sql = (
+            f"SELECT {expr} AS grp, COUNT(*), SUM(tokens) AS tokens_sum, SUM(cost) AS cost_sum "
+            f"FROM use_logs{where} GROUP BY grp ORDER BY {order}"
+        )
+        return [
+            UseLogAggregate(
+                group=str(grp) if grp is not None else "—",
+                requests=int(requests),
+                tokens=None if tokens is None else float(tokens),
+                cost=None if cost is None else float(cost),
+            )
+            for grp, requests, tokens, cost in self._conn.execute(sql, params)
+        ]
+
+
+def _where_clause(
+    *,
+    start: dt.datetime | None,
+    end: dt.datetime | None,
+    model: str | None,
+    key: str | None,
+    channel: str | None,
+) -> tuple[str, list[Any]]:
+    clauses: list[str] = []
+    params: list[Any] = []
+    if start is not None:
+        clauses.append("ts >= ?")
+        params.append(start.timestamp())
+    if end is not None:
+        clauses.append("ts <= ?")
+        params.append(end.timestamp())
+    for column, value in (("model", model), ("key_name", key), ("channel", channel)):
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+    if not clauses:
+        return "", params
+    return " WHERE " + " AND ".join(clauses), params
+
+
+def _to_row(item: dict[str, Any], batch: UseLogBatch, index: int) -> tuple[Any, ...]:
+    payload = json.dumps(item, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    record = batch.record(index)
+    uid = record.id or "sha1:" + hashlib.sha1(payload.encode("utf-8")).hexdigest()
+    ts = batch.epoch[index]
+    return (
+        uid,
+        ts if ts == ts else None,
+        record.time,
+        record.model,
+        record.key,
+        record.channel,
+        record.tokens,
+        record.cost,
+        payload,
+    )
+
+
+def _chmod_600(path: Path) -> None:
+    try:
+        os.chmod(path, 0o600)
+    except OSError:
+        return
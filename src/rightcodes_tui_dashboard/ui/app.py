@@ -1,9 +1,13 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import datetime as dt
+import hashlib
+import json
+import sqlite3
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator, Iterable, Mapping
 
 from rich import box
 from rich.align import Align
@@ -18,16 +22,32 @@ from textual.containers import Vertical, VerticalScroll
 from textual.screen import Screen
 from textual.widgets import DataTable, Header, Sparkline, Static
 
-from rightcodes_tui_dashboard.api.client import RightCodesApiClient
+from rightcodes_tui_dashboard.api.client import (
+    DEFAULT_POOL_IDLE_TIMEOUT,
+    DEFAULT_POOL_SIZE,
+    AsyncRightCodesApiClient,
+)
+from rightcodes_tui_dashboard.api.instrumentation import HistogramSink, default_sinks
+from rightcodes_tui_dashboard.api.response_cache import ResponseCache
 from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
-from rightcodes_tui_dashboard.privacy import redact_sensitive_fields
+from rightcodes_tui_dashboard.privacy import redact_sensitive_fields, redact_sensitive_tree
 from rightcodes_tui_dashboard.services.backoff import compute_next_retry_at
+from rightcodes_tui_dashboard.services.daemon import subscribe
+from rightcodes_tui_dashboard.services.dashboard_fetch import (
+    DASHBOARD_SOURCES,
+    DashboardFetcher,
+    FetchWindow,
+)
+from rightcodes_tui_dashboard.services.log_sync import SyncResult, UseLogSyncer
+from rightcodes_tui_dashboard.services.rollups import LocalRollups
+from rightcodes_tui_dashboard.services.scheduler import RefreshScheduler
 from rightcodes_tui_dashboard.services.calculations import (
     BurnRate,
     extract_advanced_buckets,
     extract_me_balance,
     extract_model_usage_rows,
     extract_stats_totals,
+    extract_trend_series,
     extract_use_logs_items,
     calculate_burn_rate,
     estimate_eta,
@@ -35,19 +55,53 @@ from rightcodes_tui_dashboard.services.calculations import (
     normalize_subscriptions,
     summarize_quota,
 )
-from rightcodes_tui_dashboard.services.use_logs import (
-    extract_use_log_billing_rate,
-    extract_use_log_billing_source,
-    extract_use_log_channel,
-    extract_use_log_ip,
-    extract_use_log_tokens,
-    format_billing_rate,
-    format_billing_source,
-)
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch, UseLogPageBatch
+from rightcodes_tui_dashboard.services.use_logs import format_billing_rate, format_billing_source
 from rightcodes_tui_dashboard.services.update_check import fetch_pypi_latest_version, is_newer_version
+from rightcodes_tui_dashboard.storage.bucket_store import StatsBucketStore, bucket_scope
+from rightcodes_tui_dashboard.storage.snapshot_store import DashboardSnapshotStore, snapshot_scope
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogArchive
 from rightcodes_tui_dashboard import __version__
 
 
+DEFAULT_MAX_CONCURRENCY = 4
+
+DEFAULT_WATCH_JITTER = 0.1
+
+_DASHBOARD_SOURCES = DASHBOARD_SOURCES
+
+# 刷新分组（各自独立的刷新间隔）：组名 -> 数据源 keys。
+# - me/subs：变化很少，可放慢
+# - stats：额度速率/趋势/汇总
+# - logs：使用记录明细（变化最频繁）
+DASHBOARD_REFRESH_GROUPS: dict[str, tuple[str, ...]] = {
+    "me": ("me",),
+    "subs": ("subscriptions",),
+    "stats": ("advanced_rate", "advanced_trend", "stats"),
+    "logs": ("use_logs",),
+}
+
+# 各刷新分组请求的 endpoint（响应缓存 TTL 按分组的刷新间隔收紧）。
+_REFRESH_GROUP_ENDPOINTS: dict[str, tuple[str, ...]] = {
+    "me": ("/auth/me",),
+    "subs": ("/subscriptions/list",),
+    "stats": ("/use-log/stats", "/use-log/stats/advanced"),
+    "logs": ("/use-log/list",),
+}
+
+# 定时刷新由 1s 的 tick 检查：缓存 TTL 额外留出一个 tick，避免到期前一刻的刷新命中旧结果。
+_TICK_SECONDS = 1.0
+
+# 与 daemon 断开后的重连间隔（秒）。
+_DAEMON_RECONNECT_SECONDS = 5
+
+# 后台增量同步（--sync-logs）在调度器中的组名（不属于看板刷新分组）。
+_SYNC_GROUP = "sync"
+
+# 看板内每轮增量同步最多请求的页数（长时间离线后的积压分多轮续传，不拖住单次刷新）。
+_SYNC_MAX_PAGES = 10
+
+
 @dataclass
 class BackoffState:
     attempt: int = 0
@@ -77,26 +131,72 @@ class DashboardScreen(Screen):
         range_mode: str,
         rate_window_seconds: int,
         granularity: str,
+        client: AsyncRightCodesApiClient | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        watch_intervals: Mapping[str, int | None] | None = None,
+        watch_jitter: float = DEFAULT_WATCH_JITTER,
+        sync_seconds: int | None = None,
+        snapshot_store: DashboardSnapshotStore | None = None,
+        daemon_socket: str | None = None,
+        bucket_store: StatsBucketStore | None = None,
     ) -> None:
         super().__init__()
         self._base_url = base_url
         self._token = token
+        self._client = client
+        self._snapshot_store = snapshot_store
+        self._max_concurrency = max_concurrency
         self._watch_seconds = watch_seconds
         self._range_seconds = range_seconds
         self._range_mode = range_mode
         self._rate_window_seconds = rate_window_seconds
         self._granularity = granularity
 
+        # 各刷新分组的独立间隔：未单独指定的分组沿用全局 --watch。
+        overrides = dict(watch_intervals or {})
+        intervals = {group: overrides.get(group, watch_seconds) for group in DASHBOARD_REFRESH_GROUPS}
+        # 后台增量同步 use-log 到本地归档：与看板刷新共用调度器，但不参与看板渲染。
+        intervals[_SYNC_GROUP] = sync_seconds
+        # 订阅 daemon 时不自行请求 API（数据由 daemon 统一拉取并推送）。
+        self._daemon_socket = daemon_socket
+        self._daemon_connected = False
+        self._daemon_tasks: set[asyncio.Task[None]] = set()
+        if daemon_socket is not None:
+            intervals = {group: None for group in intervals}
+        self._scheduler = RefreshScheduler(intervals, jitter=watch_jitter)
+        self._cap_cache_ttls()
+        self._sync_tasks: set[asyncio.Task[None]] = set()
+        self._last_sync: SyncResult | None = None
+        # 最近一轮 stats/advanced_trend 是否由本地归档计算（仅在启用 --sync-logs 时尝试）。
+        self._local_stats = False
+
         self._backoff = BackoffState()
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
         self._last_ok_at: dt.datetime | None = None
         self._stale_since: dt.datetime | None = None
-        self._next_refresh_at: dt.datetime | None = None
 
         self._cached: dict[str, Any] | None = None
+        # 各数据源最近一次成功拉取时间；仍来自启动快照（尚未被实时刷新覆盖）的数据源单独记录。
+        self._fetched_at: dict[str, dt.datetime] = {}
+        self._snapshot_sources: set[str] = set()
+        # 快照在事件循环外写入：写入进行中再次刷新时只保留最新一份待写数据。
+        self._snapshot_pending: tuple[dict[str, Any], dict[str, dt.datetime]] | None = None
+        self._snapshot_tasks: set[asyncio.Task[None]] = set()
         self._burn_cached: BurnRate | None = None
+        # 请求构造/结果合并（含 rate-window 的增量 burn rate）。
+        self._fetcher = DashboardFetcher(
+            range_mode=range_mode,
+            range_seconds=range_seconds,
+            rate_window_seconds=rate_window_seconds,
+            granularity=granularity,
+            max_concurrency=max_concurrency,
+            bucket_store=bucket_store,
+        )
         self._eta_target: dt.datetime | None = None
         self._eta_mode: str | None = None
         self._degraded_reason: str | None = None
+        # 各区块最近一次渲染输入的摘要：输入未变化时跳过重建 Rich renderable（降低空闲刷新 CPU）。
+        self._section_digests: dict[str, str] = {}
 
         # 使用记录明细分页
         self._use_logs_page: int = 1
@@ -126,12 +226,23 @@ class DashboardScreen(Screen):
         self.set_focus(self.query_one("#body_scroll", VerticalScroll))
 
         self._render_static_placeholders()
+        self._render_snapshot()
         asyncio.create_task(self._check_update_available())
+        if self._daemon_socket is not None:
+            _spawn_tracked(self._daemon_tasks, self._follow_daemon())
+            self.set_interval(1.0, self._tick)
+            return
         self._kick_refresh(force=True)
 
-        if self._watch_seconds:
+        if self._scheduler.active:
             self.set_interval(1.0, self._tick)
 
+    def on_unmount(self) -> None:
+        # 退出时取消仍在进行的刷新（异步 client 可直接中断请求）。
+        _cancel_tracked(self._refresh_tasks)
+        _cancel_tracked(self._sync_tasks)
+        _cancel_tracked(self._daemon_tasks)
+
     def on_resize(self, _: object) -> None:
         """终端窗口变化时，使用缓存重绘（不触发网络请求）。"""
 
@@ -169,32 +280,48 @@ class DashboardScreen(Screen):
 
     def action_logs(self) -> None:
         self.app.push_screen(
-            LogsScreen(base_url=self._base_url, token=self._token, range_seconds=self._range_seconds)
+            LogsScreen(
+                base_url=self._base_url,
+                token=self._token,
+                range_seconds=self._range_seconds,
+                client=self._client,
+            )
         )
 
     def action_doctor(self) -> None:
-        self.app.push_screen(DoctorScreen(base_url=self._base_url, token=self._token))
+        self.app.push_screen(DoctorScreen(base_url=self._base_url, token=self._token, client=self._client))
 
     def action_help(self) -> None:
         self.app.push_screen(HelpScreen())
 
     def action_refresh(self) -> None:
+        if self._daemon_socket is not None:
+            self._set_banner("已连接 daemon：数据由 daemon 统一刷新。", kind="info")
+            return
+        if not self._in_backoff(dt.datetime.now()):
+            _drop_response_cache(self._client)
         self._kick_refresh(force=True)
 
     def action_next_use_logs_page(self) -> None:
+        if self._daemon_socket is not None:
+            self._set_banner("已连接 daemon：使用记录明细仅显示第一页。", kind="info")
+            return
         max_page = self._get_use_logs_max_page()
         if max_page is not None and self._use_logs_page >= max_page:
             self._set_banner("使用记录明细：已是最后一页。", kind="info")
             return
         self._use_logs_page += 1
-        self._kick_refresh(force=True)
+        self._kick_refresh(force=True, groups=("logs",))
 
     def action_prev_use_logs_page(self) -> None:
+        if self._daemon_socket is not None:
+            self._set_banner("已连接 daemon：使用记录明细仅显示第一页。", kind="info")
+            return
         if self._use_logs_page <= 1:
             self._set_banner("使用记录明细：已是第一页。", kind="info")
             return
         self._use_logs_page -= 1
-        self._kick_refresh(force=True)
+        self._kick_refresh(force=True, groups=("logs",))
 
     def _get_use_logs_max_page(self) -> int | None:
         if self._use_logs_total is None:
@@ -204,17 +331,66 @@ class DashboardScreen(Screen):
         total_pages = (int(self._use_logs_total) + int(self._use_logs_page_size) - 1) // int(self._use_logs_page_size)
         return max(1, total_pages)
 
+    def _cap_cache_ttls(self) -> None:
+        """把响应缓存 TTL 收紧到各分组最短的定时刷新间隔以内（定时刷新不会命中上一轮的结果）。"""
+
+        cache = getattr(self._client, "response_cache", None)
+        if cache is None:
+            return
+        for group, endpoints in _REFRESH_GROUP_ENDPOINTS.items():
+            interval = self._scheduler.min_interval_of(group)
+            if interval is None:
+                continue
+            for endpoint in endpoints:
+                cache.cap_ttl(endpoint, interval - _TICK_SECONDS)
+
     def _tick(self) -> None:
         self._update_status()
         self._update_burn_eta_live()
-        if not self._watch_seconds:
+        if not self._scheduler.active:
             return
         now = dt.datetime.now()
-        if self._next_refresh_at and now < self._next_refresh_at:
+        due = self._scheduler.due(now)
+        if _SYNC_GROUP in due:
+            self._kick_sync(now)
+            due = [group for group in due if group != _SYNC_GROUP]
+        if not due:
+            return
+        self._kick_refresh(force=False, groups=due)
+
+    def _kick_sync(self, now: dt.datetime) -> None:
+        """发起一次后台增量同步（上一轮未结束/退避中则跳过）。"""
+
+        self._scheduler.mark_scheduled((_SYNC_GROUP,), now)
+        if self._sync_tasks or self._in_backoff(now) or not self._token:
+            return
+        _spawn_tracked(self._sync_tasks, self._sync_once())
+
+    async def _sync_once(self) -> None:
+        """将新增 use-log 增量写入本地归档（失败不影响看板刷新）。"""
+
+        try:
+            async with _api_client_scope(self._client, base_url=self._base_url, token=self._token) as client:
+                archive = await asyncio.to_thread(UseLogArchive)
+                try:
+                    syncer = await asyncio.to_thread(UseLogSyncer, archive, max_pages=_SYNC_MAX_PAGES)
+                    self._last_sync = await syncer.arun(client)
+                finally:
+                    archive.close()
+        except RateLimitError as e:
+            self._enter_backoff(e)
             return
-        self._kick_refresh(force=False)
+        except (ApiError, OSError, sqlite3.Error):
+            return
+
+    def _kick_refresh(self, *, force: bool, groups: Iterable[str] | None = None) -> None:
+        """发起一次刷新。
+
+        Args:
+            force: 是否为手动触发（退避期间手动触发只提示，不请求）。
+            groups: 需要刷新的分组（默认全部；见 DASHBOARD_REFRESH_GROUPS）。
+        """
 
-    def _kick_refresh(self, *, force: bool) -> None:
         now = dt.datetime.now()
         if self._in_backoff(now) and not force:
             return
@@ -222,15 +398,16 @@ class DashboardScreen(Screen):
             self._set_banner("仍在退避中（429），请等待 next retry。", kind="warn")
             return
 
-        if self._watch_seconds:
-            self._next_refresh_at = now + dt.timedelta(seconds=self._watch_seconds)
+        selected = tuple(groups) if groups is not None else tuple(DASHBOARD_REFRESH_GROUPS)
+        self._scheduler.mark_scheduled(selected, now)
 
-        asyncio.create_task(self._refresh_once())
+        sources = tuple(key for group in selected for key in DASHBOARD_REFRESH_GROUPS.get(group, ()))
+        _spawn_tracked(self._refresh_tasks, self._refresh_once(sources))
 
     def _in_backoff(self, now: dt.datetime) -> bool:
         return bool(self._backoff.next_retry_at and now < self._backoff.next_retry_at)
 
-    async def _refresh_once(self) -> None:
+    async def _refresh_once(self, sources: Iterable[str] = _DASHBOARD_SOURCES) -> None:
         if not self._token:
             self._set_banner("未登录：请先执行 `rightcodes login`。", kind="warn")
             self._stale_since = self._stale_since or dt.datetime.now()
@@ -239,40 +416,56 @@ class DashboardScreen(Screen):
             return
 
         try:
-            data = await asyncio.to_thread(self._fetch_data)
-        except AuthError:
-            self._set_banner("认证失败（token 可能已过期）：请执行 `rightcodes login`。", kind="error")
-            self._stale_since = self._stale_since or dt.datetime.now()
-            self._render_from_cache()
-            self._update_status()
+            data, failed = await self._fetch_data(sources)
+        except Exception as e:
+            self._apply_fetch_error(e)
             return
-        except RateLimitError as e:
-            self._enter_backoff(e)
+        self._apply_fetch_result(data, failed, sources)
+
+    def _apply_fetch_error(self, error: Exception) -> None:
+        """整体刷新失败：提示并沿用缓存（429 时进入退避）。"""
+
+        if isinstance(error, AuthError):
+            self._set_banner("认证失败（token 可能已过期）：请执行 `rightcodes login`。", kind="error")
+        elif isinstance(error, RateLimitError):
+            self._enter_backoff(error)
             retry_at = self._backoff.next_retry_at.isoformat(sep=" ", timespec="seconds") if self._backoff.next_retry_at else "unknown"
             self._set_banner(f"触发限流（429），已进入退避。Next retry: {retry_at}", kind="warn")
-            self._stale_since = self._stale_since or dt.datetime.now()
-            self._render_from_cache()
-            self._update_status()
-            return
-        except ApiError as e:
-            self._set_banner(f"刷新失败：{e}", kind="error")
-            self._stale_since = self._stale_since or dt.datetime.now()
-            self._render_from_cache()
-            self._update_status()
-            return
-        except Exception as e:
-            self._set_banner(f"刷新失败：{e.__class__.__name__}", kind="error")
-            self._stale_since = self._stale_since or dt.datetime.now()
-            self._render_from_cache()
-            self._update_status()
-            return
+        elif isinstance(error, ApiError):
+            self._set_banner(f"刷新失败：{error}", kind="error")
+        else:
+            self._set_banner(f"刷新失败：{error.__class__.__name__}", kind="error")
+        self._stale_since = self._stale_since or dt.datetime.now()
+        self._render_from_cache()
+        self._update_status()
 
-        # OK
+    def _apply_fetch_result(
+        self,
+        data: dict[str, Any],
+        failed: dict[str, Exception],
+        sources: Iterable[str],
+        *,
+        fetched_at: dt.datetime | None = None,
+    ) -> None:
+        """刷新成功（可能是部分成功：失败的区块沿用上一轮缓存）：更新缓存/快照并重绘。"""
+
+        data = _columnar_use_logs(data)
         self._cached = data
-        self._last_ok_at = dt.datetime.now()
+        self._last_ok_at = fetched_at or dt.datetime.now()
+        for key in sources:
+            if key not in failed:
+                self._fetched_at[key] = self._last_ok_at
+                self._snapshot_sources.discard(key)
+        self._save_snapshot(data)
         self._stale_since = None
         self._backoff = BackoffState()
         self._set_banner("", kind="info")
+        if failed:
+            rate_limited = next((e for e in failed.values() if isinstance(e, RateLimitError)), None)
+            if rate_limited is not None:
+                self._enter_backoff(rate_limited)
+            names = ", ".join(sorted(failed))
+            self._set_banner(f"部分区块刷新失败（沿用上次数据）：{names}", kind="warn")
         try:
             self._render_view(data)
         except Exception as e:
@@ -282,45 +475,114 @@ class DashboardScreen(Screen):
             self._render_from_cache()
         self._update_status()
 
-    def _fetch_data(self) -> dict[str, Any]:
-        now = dt.datetime.now()
-        if self._range_mode == "today":
-            start_dt = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        else:
-            start_dt = now - dt.timedelta(seconds=self._range_seconds)
-        start_range = start_dt.strftime("%Y-%m-%dT%H:%M:%S")
-        end_now = now.strftime("%Y-%m-%dT%H:%M:%S")
-        start_rate = (now - dt.timedelta(seconds=self._rate_window_seconds)).strftime("%Y-%m-%dT%H:%M:%S")
-
-        granularity = self._granularity
-        if granularity == "auto":
-            granularity = "hour" if self._range_seconds <= 48 * 3600 else "day"
-
-        with RightCodesApiClient(base_url=self._base_url, token=self._token) as client:
-            me = client.get_me()
-            subs = client.list_subscriptions()
-            adv_rate = client.stats_advanced(start_date=start_rate, end_date=end_now, granularity="hour")
-            adv_trend = client.stats_advanced(start_date=start_range, end_date=end_now, granularity=granularity)
-            stats = client.stats_range(start_date=start_range, end_date=end_now)
-            use_logs: dict[str, Any] = {}
+    async def _follow_daemon(self) -> None:
+        """订阅 daemon 快照并渲染（断开后定期重连；期间沿用缓存）。"""
+
+        while True:
             try:
-                use_logs = client.use_logs_list(
-                    page=int(self._use_logs_page),
-                    page_size=int(self._use_logs_page_size),
-                    start_date=start_range,
-                    end_date=end_now,
+                async for snapshot in subscribe(self._daemon_socket):
+                    self._daemon_connected = True
+                    self._adopt_daemon_params(snapshot.params)
+                    if snapshot.data is None:
+                        self._apply_fetch_error(snapshot.error or ApiError("daemon error"))
+                        continue
+                    self._fetcher.replay_rate(snapshot.data.get("advanced_rate"), now=dt.datetime.now())
+                    self._apply_fetch_result(
+                        snapshot.data, snapshot.failed, _DASHBOARD_SOURCES, fetched_at=snapshot.published_at
+                    )
+            except (OSError, ValueError):
+                pass
+            self._daemon_connected = False
+            self._set_banner(f"无法连接 daemon（{self._daemon_socket}），{_DAEMON_RECONNECT_SECONDS}s 后重试…", kind="warn")
+            self._stale_since = self._stale_since or dt.datetime.now()
+            self._update_status()
+            await asyncio.sleep(_DAEMON_RECONNECT_SECONDS)
+
+    def _adopt_daemon_params(self, params: Mapping[str, Any]) -> None:
+        """以 daemon 的统计口径渲染（range/rate-window 由 daemon 决定）。"""
+
+        self._range_mode = str(params.get("range_mode") or self._range_mode)
+        self._range_seconds = int(params.get("range_seconds") or self._range_seconds)
+        rate_window = int(params.get("rate_window_seconds") or self._rate_window_seconds)
+        if rate_window != self._rate_window_seconds:
+            self._rate_window_seconds = rate_window
+            self._fetcher = DashboardFetcher(
+                range_mode=self._range_mode,
+                range_seconds=self._range_seconds,
+                rate_window_seconds=rate_window,
+                granularity=self._granularity,
+                max_concurrency=self._max_concurrency,
+                bucket_store=self._fetcher.bucket_store,
+            )
+
+    async def _fetch_data(
+        self,
+        sources: Iterable[str] = _DASHBOARD_SOURCES,
+    ) -> tuple[dict[str, Any], dict[str, Exception]]:
+        """并发拉取 dashboard 端点（有界并发；每个端点单独失败）。
+
+        Args:
+            sources: 本轮需要拉取的数据源 keys（其余沿用上一轮缓存）。
+
+        Returns:
+            (data, failed)：data 为合并后的 payload（失败端点沿用上一轮缓存）；failed 为失败端点 -> 异常。
+
+        Raises:
+            AuthError: 任一端点认证失败（token 失效时整体无意义）。
+            ApiError: 全部端点均失败（优先抛出 RateLimitError 以便进入退避）。
+        """
+
+        async with _api_client_scope(self._client, base_url=self._base_url, token=self._token) as client:
+            local = None
+            if self._scheduler.interval_of(_SYNC_GROUP) is not None:
+
+                async def local(window: FetchWindow) -> dict[str, Any]:
+                    return await self._local_rollups(
+                        client, start=window.start, end=window.end, granularity=window.granularity
+                    )
+
+            return await self._fetcher.fetch(
+                client,
+                sources,
+                previous=self._cached,
+                use_logs_page=self._use_logs_page,
+                use_logs_page_size=self._use_logs_page_size,
+                local=local,
+            )
+
+    async def _local_rollups(
+        self,
+        client: AsyncRightCodesApiClient,
+        *,
+        start: dt.datetime,
+        end: dt.datetime,
+        granularity: str,
+    ) -> dict[str, Any]:
+        """先把归档增量同步到 `end`，再由本地归档计算 stats/advanced_trend。
+
+        说明：每轮最多同步 `_SYNC_MAX_PAGES` 页（积压由续传游标分多轮完成）；SQLite 读写均在线程中执行。
+
+        Returns:
+            数据源 key -> payload；归档未完整覆盖 `[start, end]` 或同步失败时返回空 dict（回退为 API 请求）。
+        """
+
+        self._local_stats = False
+        try:
+            archive = await asyncio.to_thread(UseLogArchive)
+            try:
+                syncer = await asyncio.to_thread(UseLogSyncer, archive, now=end, max_pages=_SYNC_MAX_PAGES)
+                self._last_sync = await syncer.arun(client)
+                payloads = await asyncio.to_thread(
+                    _local_payloads, archive, start=start, end=end, granularity=granularity
                 )
-            except ApiError:
-                # /use-log/list 属于“非关键”区块：接口变更时不应阻塞主面板刷新。
-                use_logs = {}
-            return {
-                "me": me,
-                "subscriptions": subs,
-                "advanced_rate": adv_rate,
-                "advanced_trend": adv_trend,
-                "stats": stats,
-                "use_logs": use_logs,
-            }
+            finally:
+                archive.close()
+        except (ApiError, OSError, sqlite3.Error, ValueError):
+            return {}
+        if payloads is None:
+            return {}
+        self._local_stats = True
+        return payloads
 
     def _render_static_placeholders(self) -> None:
         header = Table.grid(expand=True)
@@ -334,12 +596,67 @@ class DashboardScreen(Screen):
         self.query_one("#details_by_model", Static).update("详细统计数据：—")
         self.query_one("#use_logs", Static).update("使用记录明细：—")
         self.query_one("#trend_tokens", Sparkline).data = []
+        self._section_digests.clear()
         self._burn_cached = None
         self._eta_target = None
         self._eta_mode = None
         self.query_one("#burn_eta", Static).update("Burn: —  ETA: —")
         self._update_status()
 
+    def _render_snapshot(self) -> None:
+        """启动时立即渲染上一次的快照（标记为 stale；实时刷新完成后被覆盖）。"""
+
+        if self._snapshot_store is None:
+            return
+        snapshot = self._snapshot_store.load()
+        if snapshot is None:
+            return
+        self._cached = _columnar_use_logs(snapshot.data)
+        self._fetched_at = dict(snapshot.fetched_at)
+        self._snapshot_sources = set(snapshot.data)
+        try:
+            self._render_view(self._cached)
+        except Exception:
+            # 快照格式与当前版本不兼容时，直接丢弃（等待实时刷新）。
+            self._cached = None
+            self._fetched_at = {}
+            self._snapshot_sources = set()
+            self._render_static_placeholders()
+            return
+        saved_at = snapshot.saved_at.isoformat(sep=" ", timespec="seconds")
+        self._set_banner(f"正在刷新…（当前显示 {saved_at} 的快照）", kind="info")
+        self._update_status()
+
+    def _save_snapshot(self, data: dict[str, Any]) -> None:
+        """脱敏后写入快照（有事件循环时放到线程中写，连续刷新合并为最新一份）。"""
+
+        if self._snapshot_store is None:
+            return
+        self._snapshot_pending = (_redact_snapshot_data(data), dict(self._fetched_at))
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_snapshot(*self._snapshot_pending)
+            self._snapshot_pending = None
+            return
+        if not self._snapshot_tasks:
+            _spawn_tracked(self._snapshot_tasks, self._drain_snapshots())
+
+    async def _drain_snapshots(self) -> None:
+        while self._snapshot_pending is not None:
+            data, fetched_at = self._snapshot_pending
+            self._snapshot_pending = None
+            await asyncio.to_thread(self._write_snapshot, data, fetched_at)
+
+    def _write_snapshot(self, data: dict[str, Any], fetched_at: dict[str, dt.datetime]) -> None:
+        if self._snapshot_store is None:
+            return
+        try:
+            self._snapshot_store.save(data, fetched_at)
+        except (OSError, TypeError, ValueError):
+            # 快照只是启动加速：写入失败不影响看板。
+            return
+
     def _render_from_cache(self) -> None:
         if not self._cached:
             self._render_static_placeholders()
@@ -373,7 +690,11 @@ class DashboardScreen(Screen):
 
         adv_rate_payload = data.get("advanced_rate") if isinstance(data.get("advanced_rate"), dict) else {}
         buckets_rate = extract_advanced_buckets(adv_rate_payload)
-        burn = calculate_burn_rate(buckets_rate, window_seconds=self._rate_window_seconds)
+        burn_engine = self._fetcher.burn_engine
+        if burn_engine.ready:
+            burn = burn_engine.burn(now)
+        else:
+            burn = calculate_burn_rate(buckets_rate, window_seconds=self._rate_window_seconds)
         self._burn_cached = burn
         self._update_eta_targets(quota_remaining=quota.remaining_sum, burn=burn, now=now)
 
@@ -394,9 +715,14 @@ class DashboardScreen(Screen):
     def _render_subscriptions(self, items) -> None:
         """渲染 subscriptions（每包一个卡片 + 进度条）。"""
 
+        digest = _payload_digest(items)
+        if self._section_digests.get("subscriptions") == digest:
+            return
+
         host = self.query_one("#subscriptions", Static)
         if not items:
             host.update("套餐：—")
+            self._section_digests["subscriptions"] = digest
             return
 
         cards: list[Any] = []
@@ -436,6 +762,7 @@ class DashboardScreen(Screen):
             )
 
         host.update(Columns(cards, equal=True, expand=True))
+        self._section_digests["subscriptions"] = digest
 
     def _render_quota_overview(self, label: str, pct: float | None, *, balance: float | None) -> None:
         """渲染总览额度（两行）：
@@ -469,15 +796,21 @@ class DashboardScreen(Screen):
     def _render_details_by_model(self, data: dict[str, Any]) -> None:
         """渲染“详细统计数据”（按模型汇总表格，含合计行）。"""
 
-        host = self.query_one("#details_by_model", Static)
         adv_payload = data.get("advanced_trend") if isinstance(data.get("advanced_trend"), dict) else {}
-        rows = extract_model_usage_rows(adv_payload)
-
         stats_payload = data.get("stats") if isinstance(data.get("stats"), dict) else {}
+        digest = _payload_digest(
+            [adv_payload.get("details_by_model"), adv_payload.get("tokens_by_model"), stats_payload]
+        )
+        if self._section_digests.get("details_by_model") == digest:
+            return
+
+        host = self.query_one("#details_by_model", Static)
+        rows = extract_model_usage_rows(adv_payload)
         totals = extract_stats_totals(stats_payload)
 
         if not rows and totals.requests is None and totals.tokens is None and totals.cost is None:
             host.update("详细统计数据：—")
+            self._section_digests["details_by_model"] = digest
             return
 
         table = Table(
@@ -511,23 +844,33 @@ class DashboardScreen(Screen):
         )
 
         host.update(Group(Align.center(Text("详细统计数据", style="bold")), table))
+        self._section_digests["details_by_model"] = digest
 
     def _render_use_logs(self, data: dict[str, Any]) -> None:
         """渲染“使用记录明细”（来自 /use-log/list；支持翻页）。"""
 
-        host = self.query_one("#use_logs", Static)
-        payload = data.get("use_logs") if isinstance(data.get("use_logs"), dict) else {}
-        if isinstance(payload.get("total"), int):
-            self._use_logs_total = int(payload["total"])
-        if isinstance(payload.get("page"), int):
-            self._use_logs_page = int(payload["page"])
-        if isinstance(payload.get("page_size"), int):
-            self._use_logs_page_size = int(payload["page_size"])
+        page = _columnar_use_logs(data).get("use_logs")
+        if not isinstance(page, UseLogPageBatch):
+            page = UseLogPageBatch.from_payload({})
+        if page.total is not None:
+            self._use_logs_total = page.total
+        if page.page is not None:
+            self._use_logs_page = page.page
+        if page.page_size is not None:
+            self._use_logs_page_size = page.page_size
+
+        batch = page.batch
+        digest = _payload_digest(
+            [batch.ids, batch.times, self._use_logs_page, self._use_logs_page_size, self._use_logs_total]
+        )
+        if self._section_digests.get("use_logs") == digest:
+            return
 
-        items = extract_use_logs_items(payload)
+        host = self.query_one("#use_logs", Static)
 
-        if not items:
+        if not len(batch):
             host.update("使用记录明细：—")
+            self._section_digests["use_logs"] = digest
             return
 
         table = Table(
@@ -553,38 +896,18 @@ class DashboardScreen(Screen):
         table.add_column("费用", justify="right", no_wrap=True)
         table.add_column("IP", no_wrap=True)
 
-        for item in items[:18]:
-            if not isinstance(item, dict):
-                continue
-
-            time_raw = _first_str(item, ("time", "ts", "timestamp", "date", "request_time", "created_at")) or "—"
-            time_val = _fmt_use_log_time(time_raw)
-            key_raw = _first_str(item, ("api_key_name", "key_name", "api_key", "key", "key_id")) or "—"
-            model = _first_str(item, ("model", "model_name", "model_id")) or "—"
-            channel = extract_use_log_channel(item) or "—"
-
-            tokens_val = extract_use_log_tokens(item)
-            tokens_text = "—" if tokens_val is None else f"{int(tokens_val):,}"
-
-            rate_val = extract_use_log_billing_rate(item)
-            mult_text = format_billing_rate(rate_val)
-
-            bill_from_raw = extract_use_log_billing_source(item)
-            bill_from = format_billing_source(bill_from_raw)
-
-            cost_val = _first_number(item, ("cost", "total_cost", "amount", "charged", "fee"))
-            ip_raw = extract_use_log_ip(item) or "—"
-
+        for record in batch.records(limit=18):
+            tokens_text = "—" if record.tokens is None else f"{int(record.tokens):,}"
             table.add_row(
-                time_val,
-                _mask_key(key_raw),
-                model,
-                channel,
+                _fmt_use_log_time(record.time or "—"),
+                _mask_key(record.key or "—"),
+                record.model or "—",
+                record.channel or "—",
                 tokens_text,
-                mult_text,
-                bill_from,
-                _fmt_cost_full_or_dash(cost_val),
-                ip_raw,
+                format_billing_rate(record.billing_rate),
+                format_billing_source(record.billing_source),
+                _fmt_cost_full_or_dash(record.cost),
+                record.ip or "—",
             )
 
         max_page = self._get_use_logs_max_page()
@@ -594,24 +917,20 @@ class DashboardScreen(Screen):
         hint = Text(f"翻页：p 上一页 / n 下一页    {page_note}", style="dim")
 
         host.update(Group(Align.center(Text("使用记录明细", style="bold")), table, Align.right(hint)))
+        self._section_digests["use_logs"] = digest
 
     def _render_trend(self, data: dict[str, Any]) -> None:
         """渲染 tokens 趋势（sparkline）。"""
 
         adv_payload = data.get("advanced_trend") if isinstance(data.get("advanced_trend"), dict) else {}
         buckets = extract_advanced_buckets(adv_payload) or []
+        digest = _payload_digest(buckets)
+        if self._section_digests.get("trend") == digest:
+            return
 
-        series: list[float] = []
-        for b in buckets:
-            t = b.get("tokens")
-            if isinstance(t, (int, float)) and not isinstance(t, bool):
-                series.append(float(t))
-                continue
-            tt = b.get("total_tokens")
-            if isinstance(tt, (int, float)) and not isinstance(tt, bool):
-                series.append(float(tt))
-
+        series = extract_trend_series(buckets)
         self.query_one("#trend_tokens", Sparkline).data = series[-120:]
+        self._section_digests["trend"] = digest
 
     def _format_burn_line(self, burn: BurnRate | None) -> str:
         tph = "—" if not burn or burn.tokens_per_hour is None else f"{burn.tokens_per_hour:.2f}"
@@ -691,7 +1010,7 @@ class DashboardScreen(Screen):
     def _update_burn_eta_live(self) -> None:
         """每秒更新倒计时（不触发任何网络请求）。"""
 
-        if not self._watch_seconds:
+        if not self._scheduler.active:
             return
         self.query_one("#burn_eta", Static).update(self._format_burn_eta_block(dt.datetime.now()))
 
@@ -718,18 +1037,46 @@ class DashboardScreen(Screen):
     def _update_status(self) -> None:
         now = dt.datetime.now()
         last_ok = self._last_ok_at.isoformat(sep=" ", timespec="seconds") if self._last_ok_at else "—"
-        next_refresh = self._next_refresh_at.isoformat(sep=" ", timespec="seconds") if self._next_refresh_at else "—"
+        next_due = self._scheduler.next_due_at()
+        next_refresh = next_due.isoformat(sep=" ", timespec="seconds") if next_due else "—"
         backoff = "—"
         if self._backoff.next_retry_at:
             backoff = f"attempt={self._backoff.attempt} next={self._backoff.next_retry_at.isoformat(sep=' ', timespec='seconds')}"
         stale = "no"
-        if self._stale_since:
+        if self._snapshot_sources:
+            oldest = min(self._fetched_at.get(key, now) for key in self._snapshot_sources)
+            stale = f"snapshot ({int((now - oldest).total_seconds())}s)"
+        elif self._stale_since:
             delta = now - self._stale_since
             stale = f"yes ({int(delta.total_seconds())}s)"
         degraded = "—" if not self._degraded_reason else self._degraded_reason
         range_mode = self._range_mode
+        conn = "—"
+        if self._daemon_socket is not None:
+            conn = "daemon" if self._daemon_connected else "daemon (disconnected)"
+        elif self._client is not None:
+            stats = self._client.stats
+            conn = f"{stats.connections_opened} new/{stats.reused} reused"
+            if stats.coalesced:
+                conn += f"/{stats.coalesced} dedup"
+            if stats.http2_requests:
+                conn += " (h2)"
+            if stats.wire_bytes:
+                conn += f" | Wire: {_format_bytes(stats.wire_bytes)}/{_format_bytes(stats.decoded_bytes)}"
+            latency = _latency_summary(getattr(self._client, "sinks", ()))
+            if latency is not None:
+                conn += f" | Lat: {latency}"
+            cache = getattr(self._client, "response_cache", None)
+            if cache is not None and (cache.stats.hits or cache.stats.misses):
+                conn += f" | Cache: {cache.stats.hits} hit/{cache.stats.misses} miss"
+        sync = ""
+        if self._scheduler.interval_of(_SYNC_GROUP) is not None:
+            synced = "—"
+            if self._last_sync is not None and self._last_sync.watermark is not None:
+                synced = f"{self._last_sync.watermark.time.isoformat(sep=' ', timespec='seconds')} (+{self._last_sync.inserted})"
+            sync = f" | Sync: {synced}" + (" | Stats: local" if self._local_stats else "")
         self.query_one("#status", Static).update(
-            f"Last OK: {last_ok} | Next refresh: {next_refresh} | Backoff: {backoff} | Stale: {stale} | Degraded: {degraded} | Range: {range_mode}"
+            f"Last OK: {last_ok} | Next refresh: {next_refresh} | Backoff: {backoff} | Stale: {stale} | Degraded: {degraded} | Range: {range_mode} | Conn: {conn}{sync}"
         )
 
 
@@ -738,12 +1085,21 @@ class LogsScreen(Screen):
 
     BINDINGS = [("q", "pop", "Back"), ("escape", "pop", "Back"), ("r", "refresh", "Refresh")]
 
-    def __init__(self, *, base_url: str, token: str | None, range_seconds: int) -> None:
+    def __init__(
+        self,
+        *,
+        base_url: str,
+        token: str | None,
+        range_seconds: int,
+        client: AsyncRightCodesApiClient | None = None,
+    ) -> None:
         super().__init__()
         self._base_url = base_url
         self._token = token
+        self._client = client
         self._range_seconds = range_seconds
-        self._cached: list[dict[str, Any]] | None = None
+        self._cached: _LogRows | None = None
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -761,55 +1117,60 @@ class LogsScreen(Screen):
         self.app.pop_screen()
 
     def action_refresh(self) -> None:
+        _drop_response_cache(self._client)
         self._kick_refresh()
 
     def _kick_refresh(self) -> None:
-        asyncio.create_task(self._refresh_once())
+        _spawn_tracked(self._refresh_tasks, self._refresh_once())
+
+    def on_unmount(self) -> None:
+        # 离开屏幕时取消仍在进行的请求（异步 client 可直接中断，不会残留后台线程）。
+        _cancel_tracked(self._refresh_tasks)
 
     async def _refresh_once(self) -> None:
         if not self._token:
             self.query_one("#logs_banner", Static).update("未登录：请先执行 `rightcodes login`。")
-            self._render_view([])
+            self._render_view(None)
             return
 
         try:
-            items = await asyncio.to_thread(self._fetch_logs)
+            items = await self._fetch_logs()
         except AuthError:
             self.query_one("#logs_banner", Static).update("认证失败（token 可能已过期）：请执行 `rightcodes login`。")
-            self._render_view(self._cached or [])
+            self._render_view(self._cached)
             return
         except RateLimitError as e:
             retry_at = e.next_retry_at.isoformat(sep=" ", timespec="seconds") if e.next_retry_at else "unknown"
             self.query_one("#logs_banner", Static).update(f"触发限流（429），请稍后重试。Next retry: {retry_at}")
-            self._render_view(self._cached or [])
+            self._render_view(self._cached)
             return
         except ApiError as e:
             self.query_one("#logs_banner", Static).update(f"刷新失败：{e}")
-            self._render_view(self._cached or [])
+            self._render_view(self._cached)
             return
         except Exception as e:
             self.query_one("#logs_banner", Static).update(f"刷新失败：{e.__class__.__name__}")
-            self._render_view(self._cached or [])
+            self._render_view(self._cached)
             return
 
         self.query_one("#logs_banner", Static).update("")
-        self._cached = items
+        self._cached = _LogRows.from_items(items)
         try:
-            self._render_view(items)
+            self._render_view(self._cached)
         except Exception as e:
             self.query_one("#logs_banner", Static).update(f"渲染失败：{e.__class__.__name__}")
-            self._render_view(self._cached or [])
+            self._render_view(self._cached)
 
-    def _fetch_logs(self) -> list[dict[str, Any]]:
+    async def _fetch_logs(self) -> list[dict[str, Any]]:
         now = dt.datetime.now()
         start = (now - dt.timedelta(seconds=self._range_seconds)).strftime("%Y-%m-%dT%H:%M:%S")
         end = now.strftime("%Y-%m-%dT%H:%M:%S")
 
-        with RightCodesApiClient(base_url=self._base_url, token=self._token) as client:
-            payload = client.use_logs_list(page=1, page_size=50, start_date=start, end_date=end)
+        async with _api_client_scope(self._client, base_url=self._base_url, token=self._token) as client:
+            payload = await client.use_logs_list(page=1, page_size=50, start_date=start, end_date=end)
             return extract_use_logs_items(payload)
 
-    def _render_view(self, items: list[dict[str, Any]]) -> None:
+    def _render_view(self, rows: _LogRows | None) -> None:
         """将 logs 列表渲染到表格视图。
 
         注意：不要命名为 `_render`，以避免覆盖 Textual 内部渲染方法。
@@ -817,13 +1178,27 @@ class LogsScreen(Screen):
 
         table = self.query_one("#logs_table", DataTable)
         table.clear()
-        for item in items:
-            safe = redact_sensitive_fields(item)
-            time_val = _first_str(safe, ("time", "ts", "timestamp", "date", "request_time", "created_at")) or "—"
-            tokens_val = extract_use_log_tokens(safe)
-            tokens = "—" if tokens_val is None else f"{int(tokens_val):,}"
-            cost = _first_number_str(safe, ("cost", "total_cost", "amount")) or "—"
+        if rows is None:
+            return
+        for record, summary_text in zip(rows.batch.records(), rows.summaries):
+            time_val = record.time or "—"
+            tokens = "—" if record.tokens is None else f"{int(record.tokens):,}"
+            cost = _fmt_number_str(record.cost)
+            table.add_row(time_val, tokens, cost, summary_text)
+
+
+@dataclass(frozen=True)
+class _LogRows:
+    """logs 屏的渲染输入：列式批次 + 脱敏后的摘要文本（响应到达时构建一次，不保留原始 dict）。"""
+
+    batch: UseLogBatch
+    summaries: list[str]
 
+    @classmethod
+    def from_items(cls, items: list[dict[str, Any]]) -> "_LogRows":
+        safe_items = [redact_sensitive_fields(item) for item in items if isinstance(item, dict)]
+        summaries: list[str] = []
+        for safe in safe_items:
             summary = safe.copy()
             for k in (
                 "time",
@@ -839,8 +1214,8 @@ class LogsScreen(Screen):
                 "amount",
             ):
                 summary.pop(k, None)
-            summary_text = _json_compact(summary, max_len=96)
-            table.add_row(time_val, tokens, cost, summary_text)
+            summaries.append(_json_compact(summary, max_len=96))
+        return cls(batch=UseLogBatch.from_items(safe_items), summaries=summaries)
 
 
 class DoctorScreen(Screen):
@@ -848,10 +1223,12 @@ class DoctorScreen(Screen):
 
     BINDINGS = [("q", "pop", "Back"), ("escape", "pop", "Back"), ("r", "refresh", "Refresh")]
 
-    def __init__(self, *, base_url: str, token: str | None) -> None:
+    def __init__(self, *, base_url: str, token: str | None, client: AsyncRightCodesApiClient | None = None) -> None:
         super().__init__()
         self._base_url = base_url
         self._token = token
+        self._client = client
+        self._refresh_tasks: set[asyncio.Task[None]] = set()
 
     def compose(self) -> ComposeResult:
         yield Header(show_clock=True)
@@ -872,7 +1249,11 @@ class DoctorScreen(Screen):
         self._kick_refresh()
 
     def _kick_refresh(self) -> None:
-        asyncio.create_task(self._refresh_once())
+        _spawn_tracked(self._refresh_tasks, self._refresh_once())
+
+    def on_unmount(self) -> None:
+        # 离开屏幕时取消仍在进行的请求（异步 client 可直接中断，不会残留后台线程）。
+        _cancel_tracked(self._refresh_tasks)
 
     async def _refresh_once(self) -> None:
         if not self._token:
@@ -881,7 +1262,7 @@ class DoctorScreen(Screen):
             return
 
         try:
-            summary = await asyncio.to_thread(self._fetch_doctor)
+            summary = await self._fetch_doctor()
         except AuthError:
             self.query_one("#doctor_banner", Static).update("认证失败（token 可能已过期）：请执行 `rightcodes login`。")
             self._render_view({})
@@ -899,12 +1280,12 @@ class DoctorScreen(Screen):
         self.query_one("#doctor_banner", Static).update("")
         self._render_view(summary)
 
-    def _fetch_doctor(self) -> dict[str, Any]:
-        with RightCodesApiClient(base_url=self._base_url, token=self._token) as client:
+    async def _fetch_doctor(self) -> dict[str, Any]:
+        async with _api_client_scope(self._client, base_url=self._base_url, token=self._token) as client:
             out: dict[str, Any] = {}
-            out["GET /auth/me"] = client.get_me()
-            out["GET /subscriptions/list"] = client.list_subscriptions()
-            out["GET /use-log/stats/overall"] = client.stats_overall()
+            out["GET /auth/me"] = await client.get_me()
+            out["GET /subscriptions/list"] = await client.list_subscriptions()
+            out["GET /use-log/stats/overall"] = await client.stats_overall()
             return out
 
     def _render_view(self, summary: dict[str, Any]) -> None:
@@ -981,15 +1362,67 @@ class RightCodesDashboardApp(App):
         range_mode: str,
         rate_window_seconds: int,
         granularity: str,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        pool_idle_timeout: float = DEFAULT_POOL_IDLE_TIMEOUT,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        watch_intervals: Mapping[str, int | None] | None = None,
+        watch_jitter: float = DEFAULT_WATCH_JITTER,
+        sync_seconds: int | None = None,
+        snapshot: bool = True,
+        daemon_socket: str | None = None,
+        http2: bool = False,
     ) -> None:
         super().__init__()
+        self._daemon_socket = daemon_socket
         self._base_url = base_url
         self._token = token
         self._watch_seconds = watch_seconds
+        self._sync_seconds = sync_seconds
+        self._watch_intervals = dict(watch_intervals or {})
+        self._watch_jitter = watch_jitter
         self._range_seconds = range_seconds
         self._range_mode = range_mode
         self._rate_window_seconds = rate_window_seconds
         self._granularity = granularity
+        self._max_concurrency = max_concurrency
+
+        # App 级长连接池：所有 Screen 与每轮刷新共用，避免每次刷新重新握手（TCP+TLS）。
+        # 使用异步 client：直接在事件循环内请求，不占用 Textual 也在使用的默认线程池。
+        # 响应缓存：重复查看/切屏（Logs/Details 等）在 TTL 内直接使用本地结果。
+        self._api_client = AsyncRightCodesApiClient(
+            base_url=base_url,
+            token=token,
+            pool_size=pool_size,
+            pool_idle_timeout=pool_idle_timeout,
+            response_cache=ResponseCache(),
+            http2=http2,
+            sinks=[*default_sinks(), HistogramSink()],
+        )
+
+        # warm start：启动时先渲染上一次成功刷新的快照，实时刷新在后台进行。
+        self._snapshot_store: DashboardSnapshotStore | None = None
+        if snapshot:
+            self._snapshot_store = DashboardSnapshotStore(
+                scope=snapshot_scope(
+                    base_url=base_url,
+                    token=token,
+                    range_mode=range_mode,
+                    range_seconds=range_seconds,
+                )
+            )
+        # 已结束 stats bucket 的本地缓存（与快照一起由 --no-snapshot 关闭）：长区间只请求未结束的尾部。
+        self._bucket_store: StatsBucketStore | None = None
+        if snapshot:
+            try:
+                self._bucket_store = StatsBucketStore(scope=bucket_scope(base_url=base_url, token=token))
+            except Exception:
+                self._bucket_store = None
+
+    @property
+    def api_client(self) -> AsyncRightCodesApiClient:
+        """App 持有的共享 API client（生命周期与 App 一致）。"""
+
+        return self._api_client
 
     def _watch_theme(self, theme_name: str) -> None:
         """主题切换时强制 repaint，避免少数终端出现“上一帧残影”。
@@ -1017,54 +1450,149 @@ class RightCodesDashboardApp(App):
                 range_mode=self._range_mode,
                 rate_window_seconds=self._rate_window_seconds,
                 granularity=self._granularity,
+                client=self._api_client,
+                max_concurrency=self._max_concurrency,
+                watch_intervals=self._watch_intervals,
+                watch_jitter=self._watch_jitter,
+                sync_seconds=self._sync_seconds,
+                snapshot_store=self._snapshot_store,
+                daemon_socket=self._daemon_socket,
+                bucket_store=self._bucket_store,
             )
         )
 
+    async def on_unmount(self) -> None:
+        """退出时关闭连接池（释放 keep-alive 连接）。"""
 
-def _json_compact(obj: dict[str, Any], *, max_len: int) -> str:
-    """将 dict 压缩为单行 JSON，并做长度截断（用于 logs 摘要）。"""
+        await self._api_client.aclose()
+        if self._bucket_store is not None:
+            self._bucket_store.close()
 
-    import json
 
-    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
-    if len(text) <= max_len:
-        return text
-    return text[: max_len - 1] + "…"
+def _latency_summary(sinks: Iterable[Any]) -> str | None:
+    """状态栏请求耗时概览：全部请求的 p50/p95 + 最慢 endpoint（来自 client 的 HistogramSink）。"""
+
+    sink = next((s for s in sinks if isinstance(s, HistogramSink)), None)
+    if sink is None:
+        return None
+    overall = sink.overall()
+    if not overall.count or overall.p50_ms is None or overall.p95_ms is None:
+        return None
+    slowest = max(sink.summary(), key=lambda row: row.p95_ms or 0.0)
+    text = f"p50 {overall.p50_ms:.0f}ms/p95 {overall.p95_ms:.0f}ms (slowest {slowest.endpoint})"
+    if overall.errors:
+        text += f" {overall.errors} err"
+    return text
+
+
+def _format_bytes(value: int) -> str:
+    """字节数（状态栏用的短格式：B/KB/MB）。"""
+
+    if value < 1024:
+        return f"{value}B"
+    if value < 1024 * 1024:
+        return f"{value / 1024:.0f}KB"
+    return f"{value / (1024 * 1024):.1f}MB"
+
+
+def _local_payloads(
+    archive: UseLogArchive, *, start: dt.datetime, end: dt.datetime, granularity: str
+) -> dict[str, Any] | None:
+    """由本地归档计算 stats/advanced_trend（归档未完整覆盖 `[start, end]` 时返回 None）。"""
+
+    rollups = LocalRollups(archive)
+    if not rollups.covers(start, end):
+        return None
+    return {
+        "advanced_trend": rollups.advanced_payload(start=start, end=end, granularity=granularity),
+        "stats": rollups.stats_payload(start=start, end=end),
+    }
 
 
-def _first_str(payload: dict[str, Any], keys: tuple[str, ...]) -> str | None:
-    """从 payload 中按 keys 顺序取第一个非空 str。"""
+def _columnar_use_logs(data: dict[str, Any]) -> dict[str, Any]:
+    """把 use_logs 响应转换为列式批次（每个响应只转换一次；缓存中不再保留原始 dict）。"""
 
-    for k in keys:
-        v = payload.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+    payload = data.get("use_logs")
+    if not isinstance(payload, dict):
+        return data
+    return {**data, "use_logs": UseLogPageBatch.from_payload(payload)}
 
 
-def _first_number_str(payload: dict[str, Any], keys: tuple[str, ...]) -> str | None:
-    """从 payload 中按 keys 顺序取第一个 number 并格式化为字符串。"""
+def _redact_snapshot_data(data: dict[str, Any]) -> dict[str, Any]:
+    """快照落盘前脱敏全部数据源（任意层级的 token/IP/密钥名等不写入磁盘）。"""
 
-    for k in keys:
-        v = payload.get(k)
-        if isinstance(v, bool):
-            continue
-        if isinstance(v, (int, float)):
-            number = float(v)
-            return f"{number:.0f}" if number.is_integer() else f"{number:.4f}"
-    return None
+    out = dict(data)
+    payload = out.get("use_logs")
+    if isinstance(payload, UseLogPageBatch):
+        payload = payload.to_payload()
+    if isinstance(payload, dict):
+        safe: dict[str, Any] = {key: payload[key] for key in ("total", "page", "page_size") if key in payload}
+        safe["items"] = extract_use_logs_items(payload)
+        out["use_logs"] = safe
+    return redact_sensitive_tree(out)
 
 
-def _first_number(payload: dict[str, Any], keys: tuple[str, ...]) -> float | None:
-    """从 payload 中按 keys 顺序取第一个 number（float/int），返回 float。"""
+def _spawn_tracked(tasks: set[asyncio.Task[None]], coro: Any) -> None:
+    """创建后台任务并登记到集合（完成后自动移除），便于屏幕卸载时统一取消。"""
 
-    for k in keys:
-        v = payload.get(k)
-        if isinstance(v, bool):
-            continue
-        if isinstance(v, (int, float)):
-            return float(v)
-    return None
+    task = asyncio.create_task(coro)
+    tasks.add(task)
+    task.add_done_callback(tasks.discard)
+
+
+def _cancel_tracked(tasks: set[asyncio.Task[None]]) -> None:
+    """取消集合中所有未完成的任务。"""
+
+    for task in list(tasks):
+        task.cancel()
+
+
+def _drop_response_cache(client: AsyncRightCodesApiClient | None) -> None:
+    """手动刷新（r）总是请求服务端：清空共享 client 的响应缓存。"""
+
+    cache = getattr(client, "response_cache", None)
+    if cache is not None:
+        cache.clear()
+
+
+@contextlib.asynccontextmanager
+async def _api_client_scope(
+    client: AsyncRightCodesApiClient | None,
+    *,
+    base_url: str,
+    token: str | None,
+) -> AsyncIterator[AsyncRightCodesApiClient]:
+    """优先复用注入的共享 client（不关闭）；未注入时退化为一次性 client（用完即关）。"""
+
+    if client is not None:
+        yield client
+        return
+    async with AsyncRightCodesApiClient(base_url=base_url, token=token) as owned:
+        yield owned
+
+
+def _payload_digest(obj: Any) -> str:
+    """计算渲染输入的稳定摘要（key 排序；非 JSON 类型按 repr，例如 dataclass）。"""
+
+    text = json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _json_compact(obj: dict[str, Any], *, max_len: int) -> str:
+    """将 dict 压缩为单行 JSON，并做长度截断（用于 logs 摘要）。"""
+
+    text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+    if len(text) <= max_len:
+        return text
+    return text[: max_len - 1] + "…"
+
+
+def _fmt_number_str(value: float | None) -> str:
+    """格式化 number 为紧凑字符串（整数不带小数；缺失为 `—`）。"""
+
+    if value is None:
+        return "—"
+    return f"{value:.0f}" if value.is_integer() else f"{value:.4f}"
 
 
 def _truncate_plain(text: str, max_len: int) -> str:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import sys
 from pathlib import Path
 
@@ -12,3 +13,6 @@ def pytest_configure() -> None:
     if str(src) not in sys.path:
         sys.path.insert(0, str(src))
 
+    # 默认限流器的状态文件位于用户全局数据目录：测试不应读写（需要限流的测试显式构造 TokenBucket）。
+    os.environ.setdefault("RIGHTCODES_RATE_LIMIT", "off")
+
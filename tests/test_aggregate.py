@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from rightcodes_tui_dashboard.services import aggregate
+from rightcodes_tui_dashboard.services.calculations import (
+    calculate_burn_rate,
+    extract_model_usage_rows,
+    extract_trend_series,
+)
+
+
+def _buckets(n: int) -> list[dict]:
+    rng = random.Random(3)
+    out: list[dict] = []
+    for i in range(n):
+        b: dict = {"time": i, "tokens": rng.randint(0, 5000), "cost": rng.random()}
+        if i % 7 == 0:
+            b["tokens"] = None
+            b["total_tokens"] = 11
+        if i % 11 == 0:
+            b["cost"] = True
+        out.append(b)
+    return out
+
+
+def _model_payload(n: int) -> dict:
+    rng = random.Random(5)
+    rows = []
+    for i in range(n):
+        rows.append(
+            {
+                "model": f"m{i % 40}",
+                "total_requests": rng.randint(1, 9),
+                "total_tokens": rng.choice([None, rng.randint(1, 100)]),
+                "total_cost": rng.choice([None, 0.5, 1.0, rng.random()]),
+            }
+        )
+    return {"details_by_model": rows}
+
+
+def test_column_helpers() -> None:
+    assert aggregate.sum_present([None, 1.0, 2.5]) == 3.5
+    assert aggregate.sum_present([None]) is None
+    assert aggregate.drop_missing([None, 1.0, None, 2.0]) == [1.0, 2.0]
+    assert aggregate.shares_of([None, 1.0], 4.0) == [None, 0.25]
+    assert aggregate.order_desc([1.0, None, 1.0], [0.0, 5.0, 0.0], ["a", "b", "a"]) == [0, 2, 1]
+
+
+def test_column_aggregation_matches_per_item_reference() -> None:
+    buckets = _buckets(2000)
+    burn = calculate_burn_rate(buckets, window_seconds=6 * 3600)
+    tokens = [b["tokens"] if b["tokens"] is not None else b["total_tokens"] for b in buckets]
+    costs = [b["cost"] for b in buckets if not isinstance(b["cost"], bool)]
+    assert burn.tokens_per_hour == pytest.approx(sum(tokens) / 6)
+    assert burn.cost_per_day == pytest.approx(sum(costs) / 6 * 24)
+    assert extract_trend_series(buckets) == [float(t) for t in tokens]
+
+    rows = extract_model_usage_rows(_model_payload(500))
+    keys = [(r.cost or 0.0, r.tokens or 0.0, r.model) for r in rows]
+    assert keys == sorted(keys, reverse=True)
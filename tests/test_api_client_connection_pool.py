@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rightcodes_tui_dashboard.api.client import RightCodesApiClient
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:  # noqa: ANN002
+        return None
+
+
+@pytest.fixture()
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_api_client_reuses_keep_alive_connection(local_server) -> None:
+    with RightCodesApiClient(base_url=local_server, token="t", pool_size=2, pool_idle_timeout=30) as client:
+        client.get_me()
+        client.list_subscriptions()
+        client.stats_overall()
+
+        assert client.stats.requests == 3
+        assert client.stats.connections_opened == 1
+        assert client.stats.reused == 2
+
+
+def test_async_api_client_reuses_keep_alive_connection(local_server) -> None:
+    import asyncio
+
+    from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient
+
+    async def _calls() -> AsyncRightCodesApiClient:
+        async with AsyncRightCodesApiClient(base_url=local_server, token="t", pool_size=2) as client:
+            await client.get_me()
+            await client.list_subscriptions()
+            await client.stats_overall()
+            return client
+
+    client = asyncio.run(_calls())
+    assert client.stats.requests == 3
+    assert client.stats.connections_opened == 1
+    assert client.stats.reused == 2
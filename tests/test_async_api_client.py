@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import httpx
+import pytest
+import respx
+
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient
+from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
+
+
+def _run(coro):
+    return asyncio.run(coro)
+
+
+@respx.mock
+def test_async_api_client_maps_403_to_auth_error() -> None:
+    respx.get("https://example.test/auth/me").mock(return_value=httpx.Response(403, json={"detail": "nope"}))
+
+    async def _call() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t") as client:
+            await client.get_me()
+
+    with pytest.raises(AuthError):
+        _run(_call())
+
+
+@respx.mock
+def test_async_api_client_maps_429_with_retry_after() -> None:
+    now = dt.datetime.now()
+    respx.get("https://example.test/subscriptions/list").mock(
+        return_value=httpx.Response(429, headers={"Retry-After": "60"}, json={"detail": "slow down"})
+    )
+
+    async def _call() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t") as client:
+            await client.list_subscriptions()
+
+    with pytest.raises(RateLimitError) as exc:
+        _run(_call())
+    assert exc.value.retry_after_seconds == 60
+    assert exc.value.next_retry_at is not None
+    assert 58 <= (exc.value.next_retry_at - now).total_seconds() <= 62
+
+
+@respx.mock
+def test_async_api_client_maps_non_2xx_to_api_error() -> None:
+    respx.get("https://example.test/use-log/stats/overall").mock(return_value=httpx.Response(502))
+
+    async def _call() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t") as client:
+            await client.stats_overall()
+
+    with pytest.raises(ApiError):
+        _run(_call())
+
+
+@respx.mock
+def test_async_api_client_sends_bearer_and_params() -> None:
+    route = respx.get("https://example.test/use-log/list").mock(
+        return_value=httpx.Response(200, json={"logs": [], "total": 0})
+    )
+
+    async def _call() -> dict:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="tok") as client:
+            return await client.use_logs_list(page=2, page_size=5, start_date="2026-02-08T00:00:00")
+
+    assert _run(_call()) == {"logs": [], "total": 0}
+    request = route.calls.last.request
+    assert request.headers["Authorization"] == "Bearer tok"
+    assert request.url.params["page"] == "2"
+    assert request.url.params["page_size"] == "5"
+    assert request.url.params["start_date"] == "2026-02-08T00:00:00"
+    assert "end_date" not in request.url.params
+
+
+@respx.mock
+def test_async_api_client_login_stores_token() -> None:
+    respx.post("https://example.test/auth/login").mock(return_value=httpx.Response(200, json={"userToken": "new"}))
+
+    async def _call() -> str:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token=None) as client:
+            return await client.login(username="u", password="p")
+
+    assert _run(_call()) == "new"
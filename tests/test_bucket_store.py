@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import pytest
+
+from rightcodes_tui_dashboard.services.dashboard_fetch import DashboardFetcher, stitch_advanced_payloads
+from rightcodes_tui_dashboard.storage.bucket_store import StatsBucketStore
+
+_FMT = "%Y-%m-%dT%H:%M:%S"
+_STEPS = {"hour": dt.timedelta(hours=1), "day": dt.timedelta(days=1)}
+
+
+class _UniformUsageClient:
+    """每小时 1 token 的均匀用量：bucket 值 = 与请求区间重叠的小时数。"""
+
+    def __init__(self) -> None:
+        self.advanced_calls: list[tuple[str, str, str]] = []
+
+    async def stats_advanced(self, *, start_date: str, end_date: str, granularity: str) -> dict:
+        self.advanced_calls.append((start_date, end_date, granularity))
+        return _advanced(dt.datetime.strptime(start_date, _FMT), dt.datetime.strptime(end_date, _FMT), granularity)
+
+
+def _advanced(start: dt.datetime, end: dt.datetime, granularity: str) -> dict:
+    step = _STEPS[granularity]
+    cur = start.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        cur = cur.replace(hour=0)
+    data = []
+    total = 0.0
+    while cur < end:
+        hours = (min(cur + step, end) - max(cur, start)).total_seconds() / 3600
+        data.append({"time": cur.isoformat(), "tokens": hours})
+        total += hours
+        cur += step
+    return {"data": data, "details_by_model": [{"model": "m", "total_tokens": total}], "tokens_by_model": {"m": total}}
+
+
+def _trend(fetcher: DashboardFetcher, client: _UniformUsageClient, now: dt.datetime) -> dict:
+    return asyncio.run(fetcher._fetch_trend(client, fetcher.window(now)))
+
+
+def test_closed_prefix_is_served_from_disk(tmp_path) -> None:
+    store = StatsBucketStore(scope="s", path=tmp_path / "b.sqlite3")
+    fetcher = DashboardFetcher(
+        range_mode="rolling", range_seconds=7 * 86400, rate_window_seconds=3600, granularity="day", bucket_store=store
+    )
+    client = _UniformUsageClient()
+    now = dt.datetime(2026, 2, 8, 12, 34, 0)
+
+    first = _trend(fetcher, client, now)
+    assert len(client.advanced_calls) == 3  # 前缀 + 起点不完整 bucket + 未结束尾部
+
+    client.advanced_calls.clear()
+    later = now + dt.timedelta(minutes=30)
+    second = _trend(fetcher, client, later)
+    # 已结束的 6 个整天来自本地缓存：只请求两端的不完整 bucket。
+    assert [(s[:10], e[:10]) for s, e, _ in client.advanced_calls] == [("2026-02-01", "2026-02-02"), ("2026-02-08", "2026-02-08")]
+
+    window = fetcher.window(later)
+    expected = _advanced(window.start, window.end, "day")
+    assert second["data"] == expected["data"]
+    assert second["details_by_model"] == expected["details_by_model"]
+    assert second["tokens_by_model"] == pytest.approx(expected["tokens_by_model"])
+    assert len(first["data"]) == 8
+    store.close()
+
+
+def test_rate_window_restart_only_fetches_open_tail(tmp_path) -> None:
+    path = tmp_path / "b.sqlite3"
+    now = dt.datetime(2026, 2, 8, 12, 34, 0)
+
+    def _fetcher(store: StatsBucketStore) -> DashboardFetcher:
+        return DashboardFetcher(
+            range_mode="today", range_seconds=86400, rate_window_seconds=6 * 3600, granularity="hour", bucket_store=store
+        )
+
+    with StatsBucketStore(scope="s", path=path) as store:
+        client = _UniformUsageClient()
+        warm = _fetcher(store)
+        asyncio.run(warm._fetch_rate(client, warm.window(now)))
+        assert client.advanced_calls[0][0] == "2026-02-08T06:00:00"
+
+    # “重启”：新的 fetcher/engine，已结束的小时 bucket 从磁盘读取。
+    with StatsBucketStore(scope="s", path=path) as store:
+        client = _UniformUsageClient()
+        cold = _fetcher(store)
+        payload = asyncio.run(cold._fetch_rate(client, cold.window(now)))
+        assert client.advanced_calls == [("2026-02-08T12:00:00", "2026-02-08T12:34:00", "hour")]
+        assert len(payload["data"]) == 7
+
+    # 不同账号（scope）互不可见。
+    with StatsBucketStore(scope="other", path=path) as store:
+        assert not store.covers("hour", dt.datetime(2026, 2, 8, 6), dt.datetime(2026, 2, 8, 12))
+
+
+def test_coverage_merges_adjacent_ranges_and_replaces_gaps(tmp_path) -> None:
+    with StatsBucketStore(scope="s", path=tmp_path / "b.sqlite3") as store:
+        h = lambda hour: dt.datetime(2026, 2, 8, hour)  # noqa: E731
+        store.save_buckets("hour", [(h(1), {"time": "1"})], start=h(1), end=h(3))
+        store.save_buckets("hour", [(h(3), {"time": "3"})], start=h(3), end=h(4))
+        assert store.covers("hour", h(1), h(4))
+        assert [b["time"] for b in store.load_buckets("hour", h(0), h(5))] == ["1", "3"]
+
+        store.save_buckets("hour", [(h(8), {"time": "8"})], start=h(8), end=h(9))
+        assert not store.covers("hour", h(1), h(4))
+        assert [b["time"] for b in store.load_buckets("hour", h(0), h(10))] == ["8"]
+
+
+def test_stitch_sums_overlapping_buckets_and_model_rows() -> None:
+    stitched = stitch_advanced_payloads(
+        [
+            {"items": [{"time": "2026-02-08T10:00:00", "tokens": 1}], "details_by_model": [{"name": "a", "total_cost": 1.0}]},
+            {
+                "data": [{"time": "2026-02-08T10:00:00", "tokens": 2}, {"time": "2026-02-08T11:00:00", "tokens": 5}],
+                "details_by_model": [{"name": "a", "total_cost": 0.5}, {"name": "b", "total_cost": 2.0}],
+            },
+        ]
+    )
+    assert [b["tokens"] for b in stitched["data"]] == [3, 5]
+    assert stitched["details_by_model"] == [{"name": "a", "total_cost": 1.5}, {"name": "b", "total_cost": 2.0}]
+
+
+def test_stitch_keeps_last_value_for_non_additive_fields() -> None:
+    stitched = stitch_advanced_payloads(
+        [
+            {
+                "data": [{"time": "2026-02-08T10:00:00", "tokens": 1, "billing_rate": 1.5, "avg_tokens": 1.0}],
+                "details_by_model": [{"name": "a", "total_cost": 1.0, "ratio": 0.25, "cost_per_token": 0.1}],
+                "tokens_by_model": {"a": 10},
+                "avg_cost": 2.0,
+            },
+            {
+                "data": [{"time": "2026-02-08T10:00:00", "tokens": 2, "billing_rate": 1.5, "avg_tokens": 2.0}],
+                "details_by_model": [{"name": "a", "total_cost": 0.5, "ratio": 0.75, "cost_per_token": 0.2}],
+                "tokens_by_model": {"a": 5},
+                "avg_cost": 3.0,
+            },
+        ]
+    )
+    assert stitched["data"] == [{"time": "2026-02-08T10:00:00", "tokens": 3, "billing_rate": 1.5, "avg_tokens": 2.0}]
+    assert stitched["details_by_model"] == [{"name": "a", "total_cost": 1.5, "ratio": 0.75, "cost_per_token": 0.2}]
+    assert stitched["tokens_by_model"] == {"a": 15}
+    assert stitched["avg_cost"] == 3.0
+
+
+class _InclusiveEndClient(_UniformUsageClient):
+    """end_date 包含端点：响应额外带上从 end_date 起始的 bucket。"""
+
+    async def stats_advanced(self, *, start_date: str, end_date: str, granularity: str) -> dict:
+        payload = await super().stats_advanced(start_date=start_date, end_date=end_date, granularity=granularity)
+        end = dt.datetime.strptime(end_date, _FMT)
+        if end == end.replace(hour=0, minute=0, second=0):
+            payload["data"].append({"time": end.isoformat(), "tokens": 24.0})
+        return payload
+
+
+def test_trend_stitch_counts_boundary_buckets_once(tmp_path) -> None:
+    with StatsBucketStore(scope="s", path=tmp_path / "b.sqlite3") as store:
+        fetcher = DashboardFetcher(
+            range_mode="rolling", range_seconds=7 * 86400, rate_window_seconds=3600, granularity="day", bucket_store=store
+        )
+        client = _InclusiveEndClient()
+        now = dt.datetime(2026, 2, 8, 12, 34, 0)
+        _trend(fetcher, client, now)
+        stitched = _trend(fetcher, client, now + dt.timedelta(minutes=30))
+
+        window = fetcher.window(now + dt.timedelta(minutes=30))
+        assert stitched["data"] == _advanced(window.start, window.end, "day")["data"]
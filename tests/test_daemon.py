@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import os
+import socket
+from types import SimpleNamespace
+
+import pytest
+
+from rightcodes_tui_dashboard.errors import AuthError, RateLimitError
+from rightcodes_tui_dashboard.services.daemon import (
+    DashboardDaemon,
+    decode_snapshot,
+    encode_snapshot,
+    start_unix_server,
+    subscribe,
+)
+from rightcodes_tui_dashboard.services.dashboard_fetch import DASHBOARD_SOURCES, DashboardFetcher
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="requires Unix sockets")
+
+
+class _FakeAsyncClient:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.rate_limited = False
+
+    async def _call(self, payload: dict) -> dict:
+        self.calls += 1
+        if self.rate_limited:
+            raise RateLimitError("429", next_retry_at=dt.datetime.now() + dt.timedelta(seconds=120))
+        return payload
+
+    async def get_me(self) -> dict:
+        return await self._call({"balance": 2.0})
+
+    async def list_subscriptions(self) -> dict:
+        return await self._call({"subscriptions": [{"tier_id": 1, "total_quota": 100, "remaining_quota": 40}]})
+
+    async def stats_advanced(self, *, start_date: str, end_date: str, granularity: str) -> dict:
+        hour = dt.datetime.now().replace(minute=0, second=0, microsecond=0)
+        return await self._call({"data": [{"time": hour.isoformat(), "tokens": 10, "cost": 0.1}]})
+
+    async def stats_range(self, *, start_date: str, end_date: str) -> dict:
+        return await self._call({"total_tokens": 10})
+
+    async def use_logs_list(self, **params) -> dict:
+        return await self._call({"logs": [], "total": 0})
+
+
+def _daemon(client: _FakeAsyncClient) -> DashboardDaemon:
+    fetcher = DashboardFetcher(range_mode="today", range_seconds=86400, rate_window_seconds=6 * 3600)
+    return DashboardDaemon(client, fetcher, interval_seconds=30)
+
+
+def test_snapshot_roundtrip_keeps_error_types() -> None:
+    retry = dt.datetime(2026, 2, 8, 12, 5, 0)
+    line = encode_snapshot(
+        seq=3,
+        published_at=dt.datetime(2026, 2, 8, 12, 0, 0),
+        params={"range_mode": "today"},
+        data={"me": {"balance": 1}},
+        failed={"stats": RateLimitError("slow", next_retry_at=retry)},
+    )
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+
+    snap = decode_snapshot(line)
+    assert (snap.seq, snap.data, snap.params) == (3, {"me": {"balance": 1}}, {"range_mode": "today"})
+    assert isinstance(snap.failed["stats"], RateLimitError)
+    assert snap.failed["stats"].next_retry_at == retry
+
+    failed = decode_snapshot(
+        encode_snapshot(seq=4, published_at=retry, params={}, data=None, error=AuthError("expired"))
+    )
+    assert failed.data is None and isinstance(failed.error, AuthError)
+
+
+@pytest.mark.parametrize(
+    "line",
+    [b'{"type":"snapshot","seq":1}\n', b'{"type":"snapshot","published_at":"x"}\n', b'{"type":"snapshot","seq":[]}\n'],
+)
+def test_malformed_snapshot_raises_value_error(line: bytes) -> None:
+    with pytest.raises(ValueError):
+        decode_snapshot(line)
+
+
+def test_many_subscribers_share_one_poll(tmp_path) -> None:
+    path = tmp_path / "d.sock"
+    client = _FakeAsyncClient()
+    daemon = _daemon(client)
+
+    async def scenario() -> list[list[int]]:
+        server = await start_unix_server(daemon.hub.handle, path)
+        try:
+            await daemon.poll_once()
+            streams = [subscribe(path) for _ in range(3)]
+            firsts = [await s.__anext__() for s in streams]
+            assert daemon.hub.subscribers == 3
+            await daemon.poll_once()
+            seconds = [await s.__anext__() for s in streams]
+            for s in streams:
+                await s.aclose()
+            return [[a.seq, b.seq] for a, b in zip(firsts, seconds)]
+        finally:
+            server.close()
+            await daemon.hub.aclose()
+            await server.wait_closed()
+
+    assert asyncio.run(scenario()) == [[1, 2]] * 3
+    # 每轮 6 个端点；viewer 数量不影响请求量。
+    assert client.calls == 2 * len(DASHBOARD_SOURCES)
+
+
+def test_rate_limit_publishes_error_and_backs_off() -> None:
+    client = _FakeAsyncClient()
+    daemon = _daemon(client)
+    client.rate_limited = True
+
+    delay = asyncio.run(daemon.poll_once())
+    assert delay > 100
+
+    snap = decode_snapshot(daemon.hub._latest)  # type: ignore[arg-type]
+    assert snap.data is None and isinstance(snap.error, RateLimitError)
+
+
+def test_stale_socket_is_replaced_but_live_one_is_kept(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "d.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(str(path))
+    stale.close()
+
+    modes_at_chmod: list[int] = []
+    real_chmod = os.chmod
+
+    def _chmod(target, mode):  # noqa: ANN001
+        modes_at_chmod.append(os.stat(target).st_mode & 0o777)
+        real_chmod(target, mode)
+
+    monkeypatch.setattr(os, "chmod", _chmod)
+
+    async def scenario() -> None:
+        async def handler(reader, writer) -> None:  # noqa: ANN001
+            writer.close()
+
+        server = await start_unix_server(handler, path, mode=0o600)
+        try:
+            with pytest.raises(FileExistsError):
+                await start_unix_server(handler, path)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+    assert (path.stat().st_mode & 0o777) == 0o600
+    assert modes_at_chmod == [0o600]  # bind 时即为 0600（不依赖进程 umask）
+
+
+def test_attached_dashboard_renders_daemon_snapshots(tmp_path) -> None:
+    from rightcodes_tui_dashboard.ui import app as ui_app
+
+    path = tmp_path / "d.sock"
+    daemon = _daemon(_FakeAsyncClient())
+    screen = ui_app.DashboardScreen(
+        base_url="https://example.invalid",
+        token=None,
+        watch_seconds=30,
+        range_seconds=3600,
+        range_mode="rolling",
+        rate_window_seconds=3600,
+        granularity="hour",
+        daemon_socket=str(path),
+    )
+    widgets: dict[str, SimpleNamespace] = {}
+
+    def _query_one(selector: str, _cls=None):  # noqa: ANN001
+        return widgets.setdefault(
+            selector, SimpleNamespace(update=lambda r, s=selector: widgets[s].__dict__.update(last=r), data=[], size=SimpleNamespace(width=80))
+        )
+
+    screen.query_one = _query_one  # type: ignore[method-assign]
+    assert not screen._scheduler.active
+
+    async def scenario() -> None:
+        server = await start_unix_server(daemon.hub.handle, path)
+        try:
+            await daemon.poll_once()
+            follower = asyncio.ensure_future(screen._follow_daemon())
+            for _ in range(100):
+                if screen._cached is not None:
+                    break
+                await asyncio.sleep(0.01)
+            follower.cancel()
+        finally:
+            server.close()
+            await daemon.hub.aclose()
+            await server.wait_closed()
+
+    asyncio.run(scenario())
+    assert screen._cached["me"] == {"balance": 2.0}
+    assert (screen._range_mode, screen._rate_window_seconds) == ("today", 6 * 3600)
+    assert screen._fetcher.burn_engine.ready
+    assert "Conn: daemon" in str(widgets["#status"].last)
+
+
+def test_adopting_daemon_params_keeps_bucket_store(tmp_path) -> None:
+    from rightcodes_tui_dashboard.storage.bucket_store import StatsBucketStore
+    from rightcodes_tui_dashboard.ui import app as ui_app
+
+    with StatsBucketStore(scope="s", path=tmp_path / "b.sqlite3") as store:
+        screen = ui_app.DashboardScreen(
+            base_url="https://example.invalid",
+            token=None,
+            watch_seconds=30,
+            range_seconds=3600,
+            range_mode="rolling",
+            rate_window_seconds=3600,
+            granularity="hour",
+            daemon_socket=str(tmp_path / "d.sock"),
+            bucket_store=store,
+        )
+        screen._adopt_daemon_params({"range_mode": "today", "range_seconds": 86400, "rate_window_seconds": 6 * 3600})
+        assert screen._fetcher.rate_window_seconds == 6 * 3600
+        assert screen._fetcher.bucket_store is store
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from rightcodes_tui_dashboard.ui.app import DashboardScreen
+
+
+class _FakeWidget:
+    def __init__(self) -> None:
+        self.updates = 0
+        self.data: list[float] = []
+        self.size = SimpleNamespace(width=80)
+
+    def update(self, _renderable) -> None:  # noqa: ANN001
+        self.updates += 1
+
+
+def _make_screen() -> tuple[DashboardScreen, dict[str, _FakeWidget]]:
+    screen = DashboardScreen(
+        base_url="https://example.invalid",
+        token="t",
+        watch_seconds=None,
+        range_seconds=24 * 3600,
+        range_mode="rolling",
+        rate_window_seconds=6 * 3600,
+        granularity="hour",
+    )
+    widgets: dict[str, _FakeWidget] = {}
+
+    def _query_one(selector: str, _cls=None):  # noqa: ANN001
+        return widgets.setdefault(selector, _FakeWidget())
+
+    screen.query_one = _query_one  # type: ignore[method-assign]
+    return screen, widgets
+
+
+def _payload(tokens: int) -> dict:
+    return {
+        "me": {"balance": 1.5},
+        "subscriptions": {"subscriptions": [{"tier_id": 1, "total_quota": 100, "remaining_quota": 40}]},
+        "advanced_rate": {"data": [{"tokens": 10, "cost": 0.1}]},
+        "advanced_trend": {
+            "data": [{"tokens": tokens}],
+            "details_by_model": [{"model": "m", "total_requests": 1, "total_tokens": tokens, "total_cost": 0.1}],
+        },
+        "stats": {"total_tokens": tokens, "total_cost": 0.1, "total_requests": 1},
+        "use_logs": {"logs": [{"time": "2026-02-08T00:00:00", "model": "m"}], "total": 1, "page": 1, "page_size": 20},
+    }
+
+
+def test_render_view_skips_sections_with_unchanged_inputs() -> None:
+    screen, widgets = _make_screen()
+
+    screen._render_view(_payload(100))
+    first = {name: w.updates for name, w in widgets.items()}
+    assert first["#subscriptions"] == 1
+    assert first["#details_by_model"] == 1
+    assert first["#use_logs"] == 1
+
+    screen._render_view(_payload(100))
+    for name in ("#subscriptions", "#details_by_model", "#use_logs"):
+        assert widgets[name].updates == first[name]
+
+
+def test_render_view_rerenders_only_changed_sections() -> None:
+    screen, widgets = _make_screen()
+
+    screen._render_view(_payload(100))
+    screen._render_view(_payload(200))
+
+    assert widgets["#subscriptions"].updates == 1
+    assert widgets["#use_logs"].updates == 1
+    assert widgets["#details_by_model"].updates == 2
+    assert widgets["#trend_tokens"].data == [200.0]
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import json
+import os
+import stat
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+from rightcodes_tui_dashboard.privacy import _SENSITIVE_KEYS
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogPageBatch
+from rightcodes_tui_dashboard.storage.snapshot_store import DashboardSnapshotStore, snapshot_scope
+from rightcodes_tui_dashboard.ui.app import DashboardScreen
+
+
+class _FakeWidget:
+    def __init__(self) -> None:
+        self.last = None
+        self.data: list[float] = []
+        self.size = SimpleNamespace(width=80)
+
+    def update(self, renderable) -> None:  # noqa: ANN001
+        self.last = renderable
+
+
+def _payload(tokens: int) -> dict:
+    return {
+        "me": {"balance": 1.5},
+        "subscriptions": {"subscriptions": [{"tier_id": 1, "total_quota": 100, "remaining_quota": 40}]},
+        "advanced_rate": {"data": [{"tokens": 10, "cost": 0.1}]},
+        "advanced_trend": {"data": [{"tokens": tokens}], "details_by_model": []},
+        "stats": {"total_tokens": tokens, "total_cost": 0.1, "total_requests": 1},
+        "use_logs": {"logs": [], "total": 0, "page": 1, "page_size": 20},
+    }
+
+
+def _make_screen(store: DashboardSnapshotStore) -> tuple[DashboardScreen, dict[str, _FakeWidget]]:
+    screen = DashboardScreen(
+        base_url="https://example.invalid",
+        token="t",
+        watch_seconds=None,
+        range_seconds=24 * 3600,
+        range_mode="rolling",
+        rate_window_seconds=6 * 3600,
+        granularity="hour",
+        snapshot_store=store,
+    )
+    widgets: dict[str, _FakeWidget] = {}
+
+    def _query_one(selector: str, _cls=None):  # noqa: ANN001
+        return widgets.setdefault(selector, _FakeWidget())
+
+    screen.query_one = _query_one  # type: ignore[method-assign]
+    return screen, widgets
+
+
+def test_snapshot_store_roundtrip_and_scope(tmp_path) -> None:
+    path = tmp_path / "snap.json"
+    scope = snapshot_scope(base_url="https://right.codes", token="t1", range_mode="today", range_seconds=86400)
+    fetched = dt.datetime(2026, 2, 8, 10, 0, 0)
+
+    DashboardSnapshotStore(scope=scope, path=path).save(_payload(5), {"me": fetched})
+    loaded = DashboardSnapshotStore(scope=scope, path=path).load()
+
+    assert loaded is not None
+    assert loaded.data == _payload(5)
+    assert loaded.fetched_at == {"me": fetched}
+    assert "\n" not in path.read_text(encoding="utf-8")
+    if os.name == "posix":
+        assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    other = snapshot_scope(base_url="https://right.codes", token="t2", range_mode="today", range_seconds=86400)
+    assert DashboardSnapshotStore(scope=other, path=path).load() is None
+    assert "t1" not in path.read_text(encoding="utf-8")
+
+
+def test_dashboard_renders_snapshot_as_stale_then_replaces_it(tmp_path) -> None:
+    store = DashboardSnapshotStore(scope="s", path=tmp_path / "snap.json")
+    old = dt.datetime.now() - dt.timedelta(minutes=5)
+    store.save(_payload(100), {key: old for key in _payload(100)})
+
+    screen, widgets = _make_screen(store)
+    screen._render_snapshot()
+
+    cached = dict(screen._cached)
+    assert cached.pop("use_logs").total == 0
+    assert cached == {key: value for key, value in _payload(100).items() if key != "use_logs"}
+    assert widgets["#trend_tokens"].data == [100.0]
+    assert "Stale: snapshot (" in str(widgets["#status"].last)
+
+    async def _fetch(sources):  # noqa: ANN001
+        return {key: _payload(200)[key] for key in _payload(200)}, {}
+
+    screen._fetch_data = _fetch  # type: ignore[method-assign]
+
+    async def _refresh_and_flush() -> None:
+        await screen._refresh_once()
+        await asyncio.gather(*screen._snapshot_tasks)
+
+    asyncio.run(_refresh_and_flush())
+
+    assert "Stale: no" in str(widgets["#status"].last)
+    assert widgets["#trend_tokens"].data == [200.0]
+    assert isinstance(screen._cached["use_logs"], UseLogPageBatch)  # 缓存只保留列式批次
+    saved = store.load()
+    assert saved is not None and saved.data["stats"]["total_tokens"] == 200
+    assert all(ts > old for ts in saved.fetched_at.values())
+
+
+def test_snapshot_redacts_use_logs_and_coalesces_writes(tmp_path) -> None:
+    store = DashboardSnapshotStore(scope="s", path=tmp_path / "snap.json")
+    screen, _widgets = _make_screen(store)
+    writes: list[dict] = []
+    original_save = store.save
+
+    def _save(data, fetched_at):  # noqa: ANN001
+        writes.append(data)
+        original_save(data, fetched_at)
+
+    store.save = _save  # type: ignore[method-assign]
+
+    def _with_logs(tokens: int) -> dict:
+        data = _payload(tokens)
+        data["use_logs"] = {"logs": [{"id": 1, "ip": "1.2.3.4", "api_key_name": "prod", "model": "m"}], "total": 1}
+        return data
+
+    async def _scenario() -> None:
+        for tokens in (1, 2, 3):
+            screen._save_snapshot(_with_logs(tokens))
+        await asyncio.gather(*screen._snapshot_tasks)
+
+    asyncio.run(_scenario())
+
+    assert [w["stats"]["total_tokens"] for w in writes] == [3]  # 写入开始前的连续刷新合并为最新一份
+    text = (tmp_path / "snap.json").read_text(encoding="utf-8")
+    assert "1.2.3.4" not in text and "prod" not in text
+    item = store.load().data["use_logs"]["items"][0]
+    assert item["ip"] == "***REDACTED***" and item["model"] == "m"
+
+
+def _keyed_values(value: Any) -> Iterator[tuple[str, Any]]:
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield str(key), child
+            yield from _keyed_values(child)
+    elif isinstance(value, list):
+        for child in value:
+            yield from _keyed_values(child)
+
+
+def test_snapshot_redacts_every_section(tmp_path) -> None:
+    store = DashboardSnapshotStore(scope="s", path=tmp_path / "snap.json")
+    screen, _widgets = _make_screen(store)
+    data = _payload(1)
+    data["me"] = {"balance": 1.5, "user_token": "tok-secret", "ip": "5.6.7.8", "profile": {"api_key": "sk-secret"}}
+    data["subscriptions"]["subscriptions"][0]["key_name"] = "team-key"
+    data["stats"]["details"] = [{"client_ip": "9.9.9.9", "Authorization": "Bearer abc"}]
+    data["use_logs"] = {"logs": [{"id": 1, "ip_address": "1.2.3.4", "api_key_name": "prod"}], "total": 1}
+
+    screen._save_snapshot(data)
+
+    text = (tmp_path / "snap.json").read_text(encoding="utf-8")
+    for secret in ("tok-secret", "5.6.7.8", "sk-secret", "team-key", "9.9.9.9", "Bearer abc", "1.2.3.4", "prod"):
+        assert secret not in text
+    sensitive = [(k, v) for k, v in _keyed_values(json.loads(text)) if k.lower() in _SENSITIVE_KEYS]
+    assert len(sensitive) == 8 and all(v == "***REDACTED***" for _, v in sensitive)
+    assert store.load().data["me"]["balance"] == 1.5
@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import urllib.request
+
+import pytest
+
+from rightcodes_tui_dashboard.errors import ApiError, RateLimitError
+from rightcodes_tui_dashboard.services.exporter import (
+    MetricsCollector,
+    MetricsPoller,
+    make_server,
+    parse_listen,
+    render_metrics,
+)
+
+NOW = dt.datetime(2026, 2, 8, 12, 0, 0)
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.fail: set[str] = set()
+
+    def _maybe_fail(self, name: str) -> None:
+        self.calls.append(name)
+        if name in self.fail:
+            raise ApiError(f"{name} failed")
+
+    def get_me(self) -> dict:
+        self._maybe_fail("me")
+        return {"balance": 12.5}
+
+    def list_subscriptions(self) -> dict:
+        self._maybe_fail("subscriptions")
+        return {"subscriptions": [{"tier_id": "t1", "total_quota": 100, "remaining_quota": 40}]}
+
+    def stats_advanced(self, *, start_date: str, end_date: str, granularity: str) -> dict:
+        self._maybe_fail("advanced")
+        return {
+            "data": [{"tokens": 600, "cost": 6.0}],
+            "details_by_model": [
+                {"model": "m1", "total_requests": 3, "total_tokens": 500, "total_cost": 4.0},
+                {"model": 'odd"name', "total_requests": 1, "total_tokens": 100, "total_cost": 2.0},
+            ],
+        }
+
+
+def _collector(client: _FakeClient) -> MetricsCollector:
+    ticks = iter(float(i) for i in range(1000))
+    return MetricsCollector(
+        client,
+        range_mode="today",
+        range_seconds=24 * 3600,
+        rate_window_seconds=6 * 3600,
+        max_concurrency=1,
+        clock=lambda: next(ticks),
+    )
+
+
+def test_collect_computes_dashboard_metrics() -> None:
+    sample = _collector(_FakeClient()).collect(NOW)
+
+    assert sample.quota.remaining_sum == 40
+    assert sample.balance == 12.5
+    assert sample.burn.tokens_per_hour == pytest.approx(100.0)
+    # cost 口径：40 / (6.0 / 6h) = 40h
+    assert sample.eta == NOW + dt.timedelta(hours=40)
+    assert [r.model for r in sample.models] == ["m1", 'odd"name']
+    assert set(sample.durations) == {"me", "subscriptions", "advanced_rate", "advanced_trend"}
+    assert all(v == 1.0 for v in sample.durations.values())
+
+
+def test_failed_source_reuses_previous_payload() -> None:
+    client = _FakeClient()
+    collector = _collector(client)
+    collector.collect(NOW)
+
+    client.fail = {"me"}
+    sample = collector.collect(NOW + dt.timedelta(minutes=1))
+    assert sample.balance == 12.5
+    assert sample.failed == {"me": "ApiError"}
+
+    text = render_metrics(sample, MetricsPoller(lambda: sample).stats)
+    assert 'rightcodes_fetch_success{source="me"} 0' in text
+    assert 'rightcodes_fetch_success{source="subscriptions"} 1' in text
+
+
+def test_render_prometheus_and_openmetrics() -> None:
+    collector = _collector(_FakeClient())
+    poller = MetricsPoller(lambda: collector.collect(NOW))
+    assert poller.poll_once() == 60.0
+
+    text = render_metrics(poller.latest(), poller.stats)
+    assert "# TYPE rightcodes_quota_remaining gauge" in text
+    assert "rightcodes_quota_remaining 40.0" in text
+    assert "rightcodes_quota_used_ratio 0.6" in text
+    assert "rightcodes_eta_seconds 144000.0" in text
+    assert 'rightcodes_model_cost{model="odd\\"name"} 2.0' in text
+    assert "rightcodes_polls_total 1" in text
+    assert "# TYPE rightcodes_polls_total counter" in text
+    assert "rightcodes_up 1" in text
+    assert not text.rstrip().endswith("# EOF")
+
+    openmetrics = render_metrics(poller.latest(), poller.stats, openmetrics=True)
+    assert openmetrics.rstrip().endswith("# EOF")
+    assert "# TYPE rightcodes_polls counter" in openmetrics
+    assert "rightcodes_polls_total 1" in openmetrics
+
+
+def test_rate_limit_backs_off_and_keeps_last_sample() -> None:
+    collector = _collector(_FakeClient())
+    state = {"raise": False}
+
+    def collect():
+        if state["raise"]:
+            raise RateLimitError("429", next_retry_at=dt.datetime.now() + dt.timedelta(seconds=600))
+        return collector.collect(NOW)
+
+    poller = MetricsPoller(collect, interval_seconds=30)
+    poller.poll_once()
+    state["raise"] = True
+    assert poller.poll_once() > 500
+    assert poller.latest() is not None
+    assert poller.stats.poll_errors == 1
+    assert "rightcodes_up 0" in render_metrics(poller.latest(), poller.stats)
+
+
+def test_scrapes_are_served_from_cache() -> None:
+    client = _FakeClient()
+    collector = _collector(client)
+    poller = MetricsPoller(lambda: collector.collect(NOW))
+    poller.poll_once()
+    calls = len(client.calls)
+
+    server = make_server(("127.0.0.1", 0), poller)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        for _ in range(3):
+            with urllib.request.urlopen(url, timeout=5) as resp:
+                body = resp.read().decode("utf-8")
+                assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        request = urllib.request.Request(url, headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+        with urllib.request.urlopen(request, timeout=5) as resp:
+            assert resp.headers["Content-Type"].startswith("application/openmetrics-text")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "rightcodes_balance 12.5" in body
+    assert len(client.calls) == calls
+
+
+def test_parse_listen() -> None:
+    assert parse_listen("127.0.0.1:9877") == ("127.0.0.1", 9877)
+    assert parse_listen(":9000") == ("127.0.0.1", 9000)
+    assert parse_listen("[::1]:9000") == ("::1", 9000)
+    with pytest.raises(ValueError):
+        parse_listen("localhost:http")
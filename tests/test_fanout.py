@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from rightcodes_tui_dashboard.errors import ApiError, AuthError, RateLimitError
+from rightcodes_tui_dashboard.services.dashboard_fetch import merge_fetch_result
+from rightcodes_tui_dashboard.services.fanout import fan_out
+
+
+def test_fan_out_runs_calls_concurrently() -> None:
+    def _slow(value: int):
+        def _call() -> int:
+            time.sleep(0.2)
+            return value
+
+        return _call
+
+    calls = {f"k{i}": _slow(i) for i in range(6)}
+    started = time.perf_counter()
+    result = fan_out(calls, max_concurrency=6)
+    elapsed = time.perf_counter() - started
+
+    assert result.values == {f"k{i}": i for i in range(6)}
+    assert result.errors == {}
+    # 顺序执行需要约 1.2s；并发应接近单次调用耗时
+    assert elapsed < 0.8
+
+
+def test_fan_out_isolates_failures_per_call() -> None:
+    def _boom() -> None:
+        raise ApiError("boom")
+
+    result = fan_out({"ok": lambda: 1, "bad": _boom}, max_concurrency=2)
+    assert result.values == {"ok": 1}
+    assert isinstance(result.errors["bad"], ApiError)
+
+
+def test_merge_keeps_previous_payload_for_failed_sources() -> None:
+    previous = {"subscriptions": {"subscriptions": [{"tier_id": 1}]}}
+
+    data, failed = merge_fetch_result(
+        {"me": {"balance": 1}, "advanced_rate": {}, "advanced_trend": {}, "stats": {}, "use_logs": {}},
+        {"subscriptions": RateLimitError("slow down")},
+        previous=previous,
+    )
+
+    assert data["me"] == {"balance": 1}
+    assert data["subscriptions"] == {"subscriptions": [{"tier_id": 1}]}
+    assert set(failed) == {"subscriptions"}
+
+
+def test_merge_raises_auth_error_even_if_partial() -> None:
+    with pytest.raises(AuthError):
+        merge_fetch_result({"me": {}}, {"stats": AuthError("expired")}, previous=None)
+
+
+def test_merge_treats_use_logs_api_error_as_non_critical() -> None:
+    data, failed = merge_fetch_result({"me": {}}, {"use_logs": ApiError("changed")}, previous=None)
+    assert data["use_logs"] == {}
+    assert failed == {}
+
+
+def test_async_fan_out_respects_concurrency_limit() -> None:
+    import asyncio
+
+    from rightcodes_tui_dashboard.services.fanout import async_fan_out
+
+    in_flight = 0
+    peak = 0
+
+    def _make(value: int):
+        async def _call() -> int:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if value == 3:
+                raise RateLimitError("slow down")
+            return value
+
+        return _call
+
+    result = asyncio.run(async_fan_out({f"k{i}": _make(i) for i in range(6)}, max_concurrency=2))
+
+    assert peak == 2
+    assert set(result.values) == {"k0", "k1", "k2", "k4", "k5"}
+    assert isinstance(result.errors["k3"], RateLimitError)
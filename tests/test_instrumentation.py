@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+import respx
+
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient, RightCodesApiClient
+from rightcodes_tui_dashboard.api.instrumentation import HistogramSink, NdjsonSink, RequestSample
+from rightcodes_tui_dashboard.api.rate_limit import TokenBucket
+from rightcodes_tui_dashboard.errors import RateLimitError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = json.dumps({"path": self.path, "items": [{"id": i} for i in range(100)]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:  # noqa: ANN002
+        return None
+
+
+@pytest.fixture()
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _sample(total_ms: float, **kwargs) -> RequestSample:
+    return RequestSample(endpoint=kwargs.pop("endpoint", "/a"), method="GET", status=200, error=None, at=0.0, total_ms=total_ms, **kwargs)
+
+
+def test_histogram_quantiles_and_overall() -> None:
+    sink = HistogramSink()
+    for ms in (3, 8, 20, 40, 90, 200, 400, 900, 2000, 20000):
+        sink.record(_sample(ms, decode_ms=1.0))
+    sink.record(_sample(7, endpoint="/b", connect_ms=4.0))
+
+    by_endpoint = {row.endpoint: row for row in sink.summary()}
+    a = by_endpoint["/a"]
+    assert (a.count, a.p50_ms, a.p95_ms, a.max_ms) == (10, 100.0, 20000, 20000)
+    assert a.mean_decode_ms == pytest.approx(1.0) and a.mean_connect_ms is None
+    assert by_endpoint["/b"].mean_connect_ms == pytest.approx(4.0)
+    assert sink.overall().count == 11
+
+
+def test_sync_client_records_phases_per_request(local_server, tmp_path) -> None:
+    sink = HistogramSink()
+    ndjson = NdjsonSink(tmp_path / "requests.ndjson")
+    with RightCodesApiClient(base_url=local_server, token="t", sinks=[sink, ndjson]) as client:
+        client.get_me()
+        client.get_me()
+        assert client.stats.connections_opened == 1
+
+    lines = [json.loads(x) for x in (tmp_path / "requests.ndjson").read_text(encoding="utf-8").splitlines()]
+    first, second = lines
+    assert first["endpoint"] == "/auth/me" and first["status"] == 200
+    assert first["connect_ms"] is not None and second["connect_ms"] is None  # 第二次复用连接
+    assert 0 < first["ttfb_ms"] <= first["total_ms"]
+    assert first["decode_ms"] >= 0 and first["decoded_bytes"] > 1000
+
+    (row,) = sink.summary()
+    assert (row.endpoint, row.count, row.errors) == ("/auth/me", 2, 0)
+
+
+@respx.mock
+def test_async_client_records_errors() -> None:
+    respx.get("https://example.test/subscriptions/list").mock(return_value=httpx.Response(429, json={}))
+    respx.get("https://example.test/auth/me").mock(side_effect=httpx.ConnectError("boom"))
+    sink = HistogramSink()
+
+    async def scenario() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t", sinks=[sink]) as client:
+            with pytest.raises(RateLimitError):
+                await client.list_subscriptions()
+            with pytest.raises(Exception):
+                await client.get_me()
+
+    asyncio.run(scenario())
+    rows = {row.endpoint: row for row in sink.summary()}
+    assert rows["/subscriptions/list"].errors == 1
+    assert rows["/auth/me"].errors == 1
+    assert sink.overall().errors == 2
+
+
+def test_request_log_env_adds_ndjson_sink(monkeypatch, tmp_path) -> None:
+    path = tmp_path / "log.ndjson"
+    monkeypatch.setenv("RIGHTCODES_REQUEST_LOG", str(path))
+    with RightCodesApiClient(base_url="https://example.test", token="t") as client:
+        assert [type(s) for s in client.sinks] == [NdjsonSink]
+    monkeypatch.delenv("RIGHTCODES_REQUEST_LOG")
+    with RightCodesApiClient(base_url="https://example.test", token="t") as client:
+        assert client.sinks == []
+
+
+def test_decode_ms_excludes_limiter_io(local_server, tmp_path) -> None:
+    class _SlowBucket(TokenBucket):
+        def record_success(self) -> None:
+            time.sleep(0.2)
+
+    bucket = _SlowBucket(rate_per_second=100.0, burst=10)
+    ndjson = NdjsonSink(tmp_path / "requests.ndjson")
+    with RightCodesApiClient(base_url=local_server, token="t", sinks=[ndjson], rate_limiter=bucket) as client:
+        client.get_me()
+
+    (line,) = [json.loads(x) for x in (tmp_path / "requests.ndjson").read_text(encoding="utf-8").splitlines()]
+    assert line["decode_ms"] < 100 and line["total_ms"] < 200
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import httpx
+import pytest
+
+from rightcodes_tui_dashboard.api import json_codec
+from rightcodes_tui_dashboard.api.client import _decode_response
+
+
+@pytest.fixture()
+def reset_backend(monkeypatch):
+    monkeypatch.setattr(json_codec, "_backend", json_codec._BACKEND_UNSET)
+    yield monkeypatch
+    json_codec._backend = json_codec._BACKEND_UNSET
+
+
+def test_fast_backend_matches_stdlib_and_keeps_unknown_fields(reset_backend) -> None:
+    body = '{"items": [{"id": 1, "model": "m", "新字段": {"x": [1.5, null, true]}}], "total": 1}'.encode("utf-8")
+    fast = json_codec.loads(body)
+
+    reset_backend.setenv("RIGHTCODES_NO_FAST_JSON", "1")
+    reset_backend.setattr(json_codec, "_backend", json_codec._BACKEND_UNSET)
+    assert json_codec.json_backend()[0] == "json"
+    assert json_codec.loads(body) == fast
+
+
+def test_falls_back_to_stdlib_when_no_fast_decoder(reset_backend) -> None:
+    reset_backend.setattr(json_codec, "_try_import_orjson", lambda: None)
+    reset_backend.setattr(json_codec, "_try_import_msgspec", lambda: None)
+    assert json_codec.json_backend()[0] == "json"
+    with pytest.raises(ValueError):
+        json_codec.loads(b"{not json")
+
+
+def test_decode_response_handles_invalid_and_non_utf8_bodies() -> None:
+    assert _decode_response(httpx.Response(200, content=b"{oops")) == {}
+    latin = httpx.Response(
+        200,
+        content='{"model": "café"}'.encode("latin-1"),
+        headers={"Content-Type": "application/json; charset=latin-1"},
+    )
+    assert _decode_response(latin) == {"model": "café"}
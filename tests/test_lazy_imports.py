@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _loaded_after(code: str) -> set[str]:
+    probe = f"import sys\nsys.path.insert(0, {str(SRC)!r})\n{code}\nimport json\nprint(json.dumps(sorted(sys.modules)))"
+    out = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, check=True).stdout
+    return set(json.loads(out.strip().splitlines()[-1]))
+
+
+def test_parser_does_not_import_network_or_tui_modules() -> None:
+    loaded = _loaded_after("from rightcodes_tui_dashboard.__main__ import build_parser\nbuild_parser()")
+    assert not {"httpx", "textual", "rich", "rightcodes_tui_dashboard.cli"} & loaded
+
+
+def test_cli_module_does_not_import_textual() -> None:
+    loaded = _loaded_after("import rightcodes_tui_dashboard.cli")
+    assert "textual" not in loaded
+    assert "rightcodes_tui_dashboard.ui.app" not in loaded
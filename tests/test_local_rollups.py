@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import pytest
+
+from rightcodes_tui_dashboard.services.calculations import (
+    extract_advanced_buckets,
+    extract_model_usage_rows,
+    extract_stats_totals,
+    extract_trend_series,
+)
+from rightcodes_tui_dashboard.services.log_sync import UseLogSyncer, backfill_archive
+from rightcodes_tui_dashboard.services.rollups import LocalRollups
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogArchive
+
+NOW = dt.datetime(2026, 2, 8, 12, 0, 0)
+
+
+def _item(idx: int, time: str, model: str, tokens: int, cost: float) -> dict:
+    return {"id": idx, "time": time, "model": model, "usage": {"total_tokens": tokens}, "cost": cost}
+
+
+class _FakeClient:
+    def __init__(self, items: list[dict]) -> None:
+        self._items = items
+        self.calls: list[dict] = []
+
+    def use_logs_list(self, **params) -> dict:
+        self.calls.append(params)
+        start = dt.datetime.fromisoformat(params["start_date"])
+        end = dt.datetime.fromisoformat(params["end_date"])
+        matched = [x for x in self._items if start <= dt.datetime.fromisoformat(x["time"]) <= end]
+        page, size = int(params["page"]), int(params["page_size"])
+        return {"items": matched[(page - 1) * size : page * size], "total": len(matched)}
+
+
+ITEMS = [
+    _item(1, "2026-02-08T09:10:00", "m1", 100, 1.0),
+    _item(2, "2026-02-08T09:40:00", "m2", 50, 0.5),
+    _item(3, "2026-02-08T11:05:00", "m1", 30, 2.0),
+    _item(4, "2026-02-07T20:00:00", "m2", 7, 0.25),
+]
+
+
+def test_rollups_match_api_payload_shapes(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        UseLogSyncer(archive, now=NOW, initial_lookback=dt.timedelta(hours=6)).run(_FakeClient(ITEMS))
+        rollups = LocalRollups(archive)
+        start = dt.datetime(2026, 2, 8, 8, 0, 0)
+        assert rollups.covers(start, NOW)
+
+        totals = extract_stats_totals(rollups.stats_payload(start=start, end=NOW))
+        assert (totals.requests, totals.tokens, totals.cost) == (3.0, 180.0, 3.5)
+
+        advanced = rollups.advanced_payload(start=start, end=NOW, granularity="hour")
+        buckets = extract_advanced_buckets(advanced)
+        assert [b["time"] for b in buckets] == [f"2026-02-08 {h:02d}:00" for h in range(8, 13)]
+        assert extract_trend_series(buckets) == [0.0, 150.0, 0.0, 30.0, 0.0]
+
+        rows = extract_model_usage_rows(advanced)
+        assert [(r.model, r.requests, r.tokens, r.cost) for r in rows] == [
+            ("m1", 2.0, 130.0, 3.0),
+            ("m2", 1.0, 50.0, 0.5),
+        ]
+        assert rows[0].share == pytest.approx(3.0 / 3.5)
+
+        daily = rollups.advanced_payload(start=start, end=NOW, granularity="day")
+        assert [b["time"] for b in daily["data"]] == ["2026-02-08"]
+
+
+def test_rollups_do_not_cover_spans_outside_synced_range(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        rollups = LocalRollups(archive)
+        assert not rollups.covers(NOW - dt.timedelta(hours=1), NOW)
+
+        UseLogSyncer(archive, now=NOW, initial_lookback=dt.timedelta(hours=6)).run(_FakeClient(ITEMS))
+        assert archive.get_synced_until() == NOW
+        assert not rollups.covers(NOW - dt.timedelta(days=1), NOW)
+        assert not rollups.covers(NOW - dt.timedelta(hours=1), NOW + dt.timedelta(minutes=1))
+
+
+def test_backfill_extends_coverage_start(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        client = _FakeClient(ITEMS)
+        UseLogSyncer(archive, now=NOW, initial_lookback=dt.timedelta(hours=6)).run(client)
+        assert archive.count() == 3
+
+        since = NOW - dt.timedelta(days=1)
+        result = backfill_archive(archive, client, since=since, page_size=2)
+        assert client.calls[-1]["end_date"] == "2026-02-08T06:00:00"
+        assert result.inserted == 1 and not result.truncated
+        assert archive.get_coverage_start() == since
+        assert LocalRollups(archive).covers(since, NOW)
+
+        # 已覆盖时不再请求。
+        calls = len(client.calls)
+        assert backfill_archive(archive, client, since=since).pages == 0
+        assert len(client.calls) == calls
+
+
+def test_truncated_backfill_keeps_coverage_start(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        items = ITEMS + [_item(10 + i, f"2026-02-08T0{i}:00:00", "m3", 1, 0.0) for i in range(5)]
+        client = _FakeClient(items)
+        UseLogSyncer(archive, now=NOW, initial_lookback=dt.timedelta(hours=6)).run(client)
+
+        result = backfill_archive(archive, client, since=NOW - dt.timedelta(days=1), page_size=2, max_pages=1)
+        assert result.truncated
+        assert archive.get_coverage_start() == NOW - dt.timedelta(hours=6)
+
+
+def test_truncated_backfills_resume_until_covered(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        items = ITEMS + [_item(10 + i, f"2026-02-08T0{i}:00:00", "m3", 1, 0.0) for i in range(5)]
+        client = _FakeClient(items)
+        UseLogSyncer(archive, now=NOW, initial_lookback=dt.timedelta(hours=6)).run(client)
+        since = NOW - dt.timedelta(days=1)
+
+        first = backfill_archive(archive, client, since=since, page_size=2, max_pages=1)
+        second = backfill_archive(archive, client, since=since + dt.timedelta(minutes=5), page_size=2, max_pages=1)
+        assert first.truncated and second.truncated and second.resumed
+        assert [c["page"] for c in client.calls[-2:]] == [1, 2]
+        assert archive.get_coverage_start() == NOW - dt.timedelta(hours=6)
+
+        third = backfill_archive(archive, client, since=since + dt.timedelta(minutes=5), page_size=2, max_pages=1)
+        assert third.resumed and not third.truncated
+        assert archive.count() == len(items)
+        assert archive.get_coverage_start() == since  # 续传沿用首轮的 since
+        assert archive.get_cursor("backfill") is None
+
+
+def test_dashboard_local_rollups_sync_is_bounded_per_refresh(tmp_path, monkeypatch) -> None:
+    from rightcodes_tui_dashboard.ui import app as app_module
+
+    monkeypatch.setenv("RIGHTCODES_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(app_module, "_SYNC_MAX_PAGES", 1)
+    items = [_item(i, f"2026-02-08T{i:02d}:00:00", "m1", 10, 0.1) for i in range(12)]
+    sync_client = _FakeClient(items)
+
+    class _AsyncClient:
+        async def use_logs_list(self, **params) -> dict:
+            return sync_client.use_logs_list(**params)
+
+    screen = app_module.DashboardScreen(
+        base_url="https://example.invalid",
+        token="t",
+        watch_seconds=None,
+        range_seconds=24 * 3600,
+        range_mode="rolling",
+        rate_window_seconds=6 * 3600,
+        granularity="hour",
+    )
+    monkeypatch.setattr(app_module, "UseLogSyncer", _bounded_syncer(app_module.UseLogSyncer))
+    start = NOW - dt.timedelta(hours=12)
+
+    async def _rounds() -> list[dict]:
+        return [
+            await screen._local_rollups(_AsyncClient(), start=start, end=NOW, granularity="hour") for _ in range(3)
+        ]
+
+    first, second, third = asyncio.run(_rounds())
+    assert first == {} and second == {}  # 积压超过单轮上限：回退 API，下一轮续传
+    assert [c["page"] for c in sync_client.calls] == [1, 2, 3]
+    assert extract_stats_totals(third["stats"]).requests == 12.0
+
+
+def _bounded_syncer(cls):
+    # 看板的首次同步回看默认 1 天；这里固定为 12 小时并使用小页，以便构造积压。
+    def factory(archive, **kwargs):  # noqa: ANN001, ANN003
+        return cls(archive, page_size=5, initial_lookback=dt.timedelta(hours=12), **kwargs)
+
+    return factory
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import datetime as dt
+
+from rightcodes_tui_dashboard.services.log_sync import UseLogSyncer
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogArchive
+
+
+def _item(idx: int, time: str) -> dict:
+    return {"id": idx, "time": time, "model": "m1", "usage": {"total_tokens": 10}, "cost": 0.1}
+
+
+class _FakeClient:
+    def __init__(self, pages: list[list[dict]], *, total: int | None = None) -> None:
+        self._pages = pages
+        self._total = total
+        self.calls: list[dict] = []
+
+    def use_logs_list(self, **params) -> dict:
+        self.calls.append(params)
+        idx = int(params["page"]) - 1
+        items = self._pages[idx] if idx < len(self._pages) else []
+        payload: dict = {"items": items}
+        if self._total is not None:
+            payload["total"] = self._total
+        return payload
+
+
+NOW = dt.datetime(2026, 2, 8, 12, 0, 0)
+
+
+def test_first_sync_pages_until_short_page_and_sets_watermark(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        client = _FakeClient(
+            [
+                [_item(3, "2026-02-08T11:00:00"), _item(2, "2026-02-08T10:00:00")],
+                [_item(1, "2026-02-08T09:00:00")],
+            ]
+        )
+        result = UseLogSyncer(archive, now=NOW, page_size=2, initial_lookback=dt.timedelta(hours=6)).run(client)
+
+        assert [c["page"] for c in client.calls] == [1, 2]
+        assert client.calls[0]["start_date"] == "2026-02-08T06:00:00"
+        assert result.pages == 2 and result.fetched == 3 and result.inserted == 3
+        assert archive.get_watermark().time == dt.datetime(2026, 2, 8, 11, 0, 0)
+        assert archive.get_coverage_start() == dt.datetime(2026, 2, 8, 6, 0, 0)
+
+
+def test_second_sync_starts_at_watermark_and_dedupes_boundary(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        UseLogSyncer(archive, now=NOW, page_size=10).run(_FakeClient([[_item(1, "2026-02-08T11:00:00")]]))
+
+        later = NOW + dt.timedelta(minutes=30)
+        client = _FakeClient([[_item(2, "2026-02-08T12:10:00"), _item(1, "2026-02-08T11:00:00")]])
+        result = UseLogSyncer(archive, now=later, page_size=10).run(client)
+
+        assert len(client.calls) == 1
+        assert client.calls[0]["start_date"] == "2026-02-08T11:00:00"
+        assert result.fetched == 2 and result.inserted == 1
+        assert archive.count() == 2
+        assert archive.get_watermark().time == dt.datetime(2026, 2, 8, 12, 10, 0)
+
+
+def test_sync_truncated_by_max_pages_keeps_watermark(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        client = _FakeClient([[_item(2, "2026-02-08T11:00:00")], [_item(1, "2026-02-08T10:00:00")]], total=2)
+        result = UseLogSyncer(archive, now=NOW, page_size=1, max_pages=1).run(client)
+
+        assert len(client.calls) == 1
+        assert result.truncated is True
+        assert archive.get_watermark() is None
+        assert archive.count() == 1
+
+
+class _WindowClient:
+    """按 start/end 过滤、时间倒序分页的假服务端。"""
+
+    def __init__(self, items: list[dict]) -> None:
+        self.items = items
+        self.calls: list[dict] = []
+
+    def use_logs_list(self, *, page: int, page_size: int, start_date: str, end_date: str) -> dict:
+        self.calls.append({"page": page, "start_date": start_date, "end_date": end_date})
+        rows = sorted(
+            (x for x in self.items if start_date <= x["time"] <= end_date), key=lambda x: x["time"], reverse=True
+        )
+        return {"items": rows[(page - 1) * page_size : page * page_size], "total": len(rows)}
+
+
+def test_truncated_syncs_resume_until_backlog_is_archived(tmp_path) -> None:
+    backlog = [_item(i, f"2026-02-08T0{i}:00:00") for i in range(7)]
+    client = _WindowClient(backlog)
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        first = UseLogSyncer(archive, now=NOW, page_size=2, max_pages=2).run(client)
+        assert first.truncated and archive.count() == 4 and archive.get_watermark() is None
+
+        # 下一轮即使“现在”已变化也沿用固定窗口，从第 3 页继续
+        client.items.append(_item(99, "2026-02-08T12:30:00"))
+        second = UseLogSyncer(archive, now=NOW + dt.timedelta(hours=1), page_size=2, max_pages=2).run(client)
+        assert second.resumed and not second.truncated
+        assert [c["page"] for c in client.calls] == [1, 2, 3, 4]
+        assert {c["end_date"] for c in client.calls} == {"2026-02-08T12:00:00"}
+        assert archive.count() == 7
+        assert archive.get_watermark().time == dt.datetime(2026, 2, 8, 6, 0, 0)
+        assert archive.get_coverage_start() == NOW - dt.timedelta(days=1)
+        assert archive.get_cursor("sync") is None
+
+        third = UseLogSyncer(archive, now=NOW + dt.timedelta(hours=1), page_size=2, max_pages=2).run(client)
+        assert not third.resumed and not third.truncated
+        assert archive.count() == 8
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from rightcodes_tui_dashboard.api.pagination import iter_use_log_pages
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogArchive
+
+
+def _page_items(page: int, count: int) -> list[dict]:
+    return [{"id": page * 100 + i, "time": "2026-02-08T10:00:00", "model": "m1", "ip": "1.2.3.4"} for i in range(count)]
+
+
+class _PagedClient:
+    def __init__(self, sizes: list[int], *, total: int | None = None) -> None:
+        self._sizes = sizes
+        self._total = total
+        self.pages: list[int] = []
+
+    def __enter__(self):  # noqa: ANN001
+        return self
+
+    def __exit__(self, exc_type, exc, tb):  # noqa: ANN001
+        return None
+
+    def use_logs_list(self, *, page: int, page_size: int, start_date=None, end_date=None):  # noqa: ANN001
+        self.pages.append(page)
+        count = self._sizes[page - 1] if page <= len(self._sizes) else 0
+        payload = {"items": _page_items(page, count)}
+        if self._total is not None:
+            payload["total"] = self._total
+        return payload
+
+
+def test_iter_use_log_pages_is_lazy_and_stops_on_short_page() -> None:
+    client = _PagedClient([2, 2, 1, 2])
+    pages = iter_use_log_pages(client, page_size=2)
+
+    first = next(pages)
+    assert first.page == 1 and len(first.items) == 2
+    assert client.pages == [1]
+
+    rest = list(pages)
+    assert [p.page for p in rest] == [2, 3]
+    assert client.pages == [1, 2, 3]
+
+
+def test_iter_use_log_pages_respects_total_and_max_pages() -> None:
+    client = _PagedClient([2, 2, 2], total=4)
+    assert [p.page for p in iter_use_log_pages(client, page_size=2)] == [1, 2]
+
+    client = _PagedClient([2, 2, 2])
+    assert [p.page for p in iter_use_log_pages(client, page_size=2, start_page=2, max_pages=1)] == [2]
+
+
+def test_logs_all_streams_redacted_ndjson(monkeypatch, capsys, tmp_path) -> None:
+    from rightcodes_tui_dashboard import cli
+
+    client = _PagedClient([2, 2, 1])
+
+    class FakeStore:
+        def load_token(self):  # noqa: ANN001
+            class _Rec:
+                token = "t"
+
+            return _Rec()
+
+    monkeypatch.setenv("RIGHTCODES_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(cli, "_select_store", lambda *_args, **_kwargs: FakeStore())
+    monkeypatch.setattr(cli, "RightCodesApiClient", lambda **_kwargs: client)
+
+    args = argparse.Namespace(
+        base_url=None,
+        range="24h",
+        page=1,
+        page_size=2,
+        format="ndjson",
+        all=True,
+        max_pages=None,
+        local=False,
+    )
+    assert cli.cmd_logs(args) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert [r["id"] for r in rows] == [100, 101, 200, 201, 300]
+    assert all(r["ip"] == "***REDACTED***" for r in rows)
+    assert client.pages == [1, 2, 3]
+    assert not (tmp_path / "use-logs.sqlite3").exists()  # 未加 --archive 不落盘
+
+
+def test_logs_max_pages_streams_json_array(monkeypatch, capsys, tmp_path) -> None:
+    from rightcodes_tui_dashboard import cli
+
+    client = _PagedClient([2, 2, 2])
+
+    class FakeStore:
+        def load_token(self):  # noqa: ANN001
+            class _Rec:
+                token = "t"
+
+            return _Rec()
+
+    monkeypatch.setenv("RIGHTCODES_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(cli, "_select_store", lambda *_args, **_kwargs: FakeStore())
+    monkeypatch.setattr(cli, "RightCodesApiClient", lambda **_kwargs: client)
+
+    args = argparse.Namespace(
+        base_url=None,
+        range="24h",
+        page=1,
+        page_size=2,
+        format="json",
+        all=False,
+        max_pages=2,
+        local=False,
+        archive=True,
+    )
+    assert cli.cmd_logs(args) == 0
+
+    rows = json.loads(capsys.readouterr().out)
+    assert [r["id"] for r in rows] == [100, 101, 200, 201]
+    assert client.pages == [1, 2]
+
+    with UseLogArchive(tmp_path / "use-logs.sqlite3") as archive:
+        assert archive.count() == 4
+        for path in tmp_path.glob("use-logs.sqlite3*"):
+            assert path.stat().st_mode & 0o777 == 0o600
@@ -20,7 +20,7 @@ def test_logs_range_today_uses_midnight_start(monkeypatch, capsys) -> None:
     captured: dict[str, str] = {}
 
     class FakeClient:
-        def __init__(self, *, base_url: str, token: str | None):  # noqa: ANN001
+        def __init__(self, *, base_url: str, token: str | None, http2: bool = False):  # noqa: ANN001
             self.base_url = base_url
             self.token = token
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import datetime as dt
+import threading
+import time
+
+import pytest
+
+from rightcodes_tui_dashboard.api.pagination import iter_use_log_pages
+from rightcodes_tui_dashboard.errors import RateLimitError
+
+
+class _SlowClient:
+    def __init__(self, *, total: int, page_size: int, delay: float = 0.0, rate_limited: dict[int, int] | None = None):
+        self._total = total
+        self._page_size = page_size
+        self._delay = delay
+        self._rate_limited = dict(rate_limited or {})
+        self._lock = threading.Lock()
+        self.calls: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def use_logs_list(self, *, page: int, page_size: int, start_date=None, end_date=None):  # noqa: ANN001
+        with self._lock:
+            self.calls.append(page)
+            if self._rate_limited.get(page, 0) > 0:
+                self._rate_limited[page] -= 1
+                raise RateLimitError("429", next_retry_at=dt.datetime.now() + dt.timedelta(seconds=2))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self._delay)
+            start = (page - 1) * page_size
+            count = max(0, min(page_size, self._total - start))
+            return {"items": [{"id": start + i} for i in range(count)], "total": self._total}
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_prefetch_keeps_page_order_and_bounds_concurrency() -> None:
+    client = _SlowClient(total=35, page_size=5, delay=0.05)
+
+    started = time.perf_counter()
+    pages = list(iter_use_log_pages(client, page_size=5, max_concurrency=3))
+    elapsed = time.perf_counter() - started
+
+    assert [p.page for p in pages] == [1, 2, 3, 4, 5, 6, 7]
+    assert [x["id"] for p in pages for x in p.items] == list(range(35))
+    assert client.max_in_flight <= 3
+    # 顺序请求约 7×50ms；并发预取后约 1 + ceil(6/3) 轮
+    assert elapsed < 0.3
+
+
+def test_prefetch_respects_max_pages() -> None:
+    client = _SlowClient(total=100, page_size=10)
+
+    pages = list(iter_use_log_pages(client, page_size=10, start_page=3, max_pages=4, max_concurrency=4))
+
+    assert [p.page for p in pages] == [3, 4, 5, 6]
+    assert sorted(client.calls) == [3, 4, 5, 6]
+
+
+def test_prefetch_waits_for_rate_limit_then_retries() -> None:
+    client = _SlowClient(total=30, page_size=10, rate_limited={2: 1})
+    sleeps: list[float] = []
+
+    pages = list(iter_use_log_pages(client, page_size=10, max_concurrency=2, rate_limit_retries=2, sleep=sleeps.append))
+
+    assert [p.page for p in pages] == [1, 2, 3]
+    assert client.calls.count(2) == 2
+    assert sleeps and 0 < max(sleeps) <= 2
+
+
+def test_prefetch_raises_rate_limit_after_retries_exhausted() -> None:
+    client = _SlowClient(total=30, page_size=10, rate_limited={2: 5})
+
+    pages = iter_use_log_pages(client, page_size=10, max_concurrency=2, rate_limit_retries=1, sleep=lambda _s: None)
+    assert next(pages).page == 1
+    with pytest.raises(RateLimitError):
+        list(pages)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+
+import httpx
+import pytest
+import respx
+
+from rightcodes_tui_dashboard.api import rate_limit
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient, RightCodesApiClient
+from rightcodes_tui_dashboard.api.rate_limit import TokenBucket, parse_rate
+from rightcodes_tui_dashboard.errors import RateLimitError
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_burst_then_waits_queue_up() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=1.0, burst=3, clock=clock)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 令牌不足时预约：并发请求依次排队。
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(2.0)
+
+    clock.now += 10
+    assert bucket.snapshot()["tokens"] == pytest.approx(3.0)  # 不超过 burst
+
+
+def test_long_wait_raises_without_consuming() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=0.1, burst=1, clock=clock, max_wait_seconds=5)
+    bucket.acquire()
+    with pytest.raises(RateLimitError) as exc:
+        bucket.acquire()
+    assert exc.value.retry_after_seconds == 10
+    assert bucket.snapshot()["tokens"] == pytest.approx(0.0)
+
+
+def test_learns_from_retry_after_and_recovers() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=2.0, burst=10, clock=clock, max_wait_seconds=60)
+
+    bucket.record_rate_limited(retry_after_seconds=30)
+    bucket.record_rate_limited(retry_after_seconds=30)  # 同一次暂停只降速一次
+    state = bucket.snapshot()
+    assert state["rate"] == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(30.0)
+
+    clock.now += 60
+    for _ in range(40):
+        bucket.record_success()
+    assert bucket.snapshot()["rate"] == pytest.approx(2.0)
+
+
+def _take(path: str, count: int) -> None:
+    from pathlib import Path
+
+    bucket = TokenBucket(rate_per_second=0.001, burst=100, state_path=Path(path), max_wait_seconds=1e9)
+    for _ in range(count):
+        bucket.acquire()
+
+
+@pytest.mark.skipif(os.name != "posix", reason="file lock sharing requires fcntl")
+def test_state_is_shared_across_processes(tmp_path) -> None:
+    path = tmp_path / "rate-limit.json"
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_take, args=(str(path), 25)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    bucket = TokenBucket(rate_per_second=0.001, burst=100, state_path=path)
+    assert bucket.snapshot()["tokens"] == pytest.approx(50.0, abs=0.5)
+
+
+@respx.mock
+def test_clients_feed_429_back_into_shared_limiter() -> None:
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=1.0, burst=5, clock=clock, max_wait_seconds=5)
+    respx.get("https://example.test/auth/me").mock(
+        return_value=httpx.Response(429, headers={"Retry-After": "120"}, json={})
+    )
+    client = RightCodesApiClient(base_url="https://example.test", token="t", rate_limiter=bucket)
+    with pytest.raises(RateLimitError):
+        client.get_me()
+
+    # 另一个（异步）client 共用同一个桶：在 Retry-After 之前不再发请求。
+    route = respx.get("https://example.test/subscriptions/list").mock(return_value=httpx.Response(200, json={}))
+
+    async def _call() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t", rate_limiter=bucket) as other:
+            await other.list_subscriptions()
+
+    with pytest.raises(RateLimitError):
+        asyncio.run(_call())
+    assert route.call_count == 0
+
+
+def test_parse_rate() -> None:
+    assert parse_rate("60/m") == pytest.approx(1.0)
+    assert parse_rate("2/s") == pytest.approx(2.0)
+    assert parse_rate("3600/h") == pytest.approx(1.0)
+    assert parse_rate("off") is None
+    assert parse_rate("0") is None
+    with pytest.raises(ValueError):
+        parse_rate("10/d")
+
+
+def test_record_success_skips_state_io_at_full_rate(tmp_path, monkeypatch) -> None:
+    opened: list[object] = []
+    real_open = rate_limit._open_locked
+    monkeypatch.setattr(rate_limit, "_open_locked", lambda path: opened.append(path) or real_open(path))
+    clock = _Clock()
+    bucket = TokenBucket(rate_per_second=2.0, burst=10, state_path=tmp_path / "rate-limit.json", clock=clock)
+
+    bucket.acquire()
+    for _ in range(5):
+        bucket.record_success()
+    assert len(opened) == 1  # 只有 acquire 读写状态文件
+
+    bucket.record_rate_limited(retry_after_seconds=1)
+    assert bucket.recovering
+    clock.now += 5
+    for _ in range(30):
+        bucket.record_success()
+    assert not bucket.recovering and bucket.snapshot()["rate"] == pytest.approx(2.0)
+
+
+@respx.mock
+def test_async_client_runs_limiter_off_the_event_loop() -> None:
+    threads: list[str] = []
+
+    class _Spy(TokenBucket):
+        def acquire(self) -> float:
+            threads.append(threading.current_thread().name)
+            return super().acquire()
+
+        def record_rate_limited(self, **kwargs) -> None:
+            threads.append(threading.current_thread().name)
+            super().record_rate_limited(**kwargs)
+
+    bucket = _Spy(rate_per_second=1.0, burst=5, clock=_Clock())
+    respx.get("https://example.test/auth/me").mock(return_value=httpx.Response(429, json={}))
+
+    async def _call() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t", rate_limiter=bucket) as client:
+            with pytest.raises(RateLimitError):
+                await client.get_me()
+
+    asyncio.run(_call())
+    assert len(threads) == 2 and threading.main_thread().name not in threads
+
+
+@respx.mock
+def test_sync_and_async_clients_share_one_feedback_rule() -> None:
+    calls: list[str] = []
+
+    class _Spy(TokenBucket):
+        def record_success(self) -> None:
+            calls.append("success")
+            super().record_success()
+
+    clock = _Clock()
+    bucket = _Spy(rate_per_second=10.0, burst=50, clock=clock)
+    respx.get("https://example.test/auth/me").mock(return_value=httpx.Response(200, json={}))
+
+    async def _async_get() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t", rate_limiter=bucket) as other:
+            await other.get_me()
+
+    def _both() -> list[str]:
+        calls.clear()
+        with RightCodesApiClient(base_url="https://example.test", token="t", rate_limiter=bucket) as client:
+            client.get_me()
+        asyncio.run(_async_get())
+        return list(calls)
+
+    assert _both() == []  # 已是配置速率：两种 client 都不反馈
+    bucket.record_rate_limited(retry_after_seconds=0.001)
+    clock.now += 1
+    assert _both() == ["success", "success"]
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import datetime as dt
+import random
+
+from rightcodes_tui_dashboard.services.scheduler import RefreshScheduler
+
+
+def test_scheduler_tracks_independent_intervals() -> None:
+    now = dt.datetime(2026, 2, 8, 12, 0, 0)
+    scheduler = RefreshScheduler({"logs": 10, "subs": 300}, jitter=0.0)
+
+    assert scheduler.due(now) == ["logs", "subs"]
+    scheduler.mark_scheduled(["logs", "subs"], now)
+
+    assert scheduler.due(now + dt.timedelta(seconds=9)) == []
+    assert scheduler.due(now + dt.timedelta(seconds=10)) == ["logs"]
+    assert scheduler.due(now + dt.timedelta(seconds=300)) == ["logs", "subs"]
+    assert scheduler.next_due_at() == now + dt.timedelta(seconds=10)
+
+
+def test_scheduler_jitter_stays_within_bounds() -> None:
+    now = dt.datetime(2026, 2, 8, 12, 0, 0)
+    scheduler = RefreshScheduler({"stats": 100}, jitter=0.2, rng=random.Random(0))
+
+    for _ in range(50):
+        scheduler.mark_scheduled(["stats"], now)
+        next_at = scheduler.next_due_at()
+        assert next_at is not None
+        assert 80 <= (next_at - now).total_seconds() <= 120
+
+
+def test_scheduler_ignores_disabled_sources() -> None:
+    scheduler = RefreshScheduler({"me": None, "logs": 0})
+    assert scheduler.active is False
+    assert scheduler.due(dt.datetime(2026, 2, 8)) == []
+
+
+def test_dashboard_watch_overrides_fall_back_to_global_watch() -> None:
+    from rightcodes_tui_dashboard.ui.app import DashboardScreen
+
+    screen = DashboardScreen(
+        base_url="https://example.invalid",
+        token="t",
+        watch_seconds=30,
+        range_seconds=24 * 3600,
+        range_mode="today",
+        rate_window_seconds=6 * 3600,
+        granularity="auto",
+        watch_intervals={"logs": 10, "subs": 300, "me": None},
+    )
+
+    assert screen._scheduler.interval_of("logs") == 10
+    assert screen._scheduler.interval_of("subs") == 300
+    assert screen._scheduler.interval_of("stats") == 30
+    assert screen._scheduler.interval_of("me") is None
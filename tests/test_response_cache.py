@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+
+import httpx
+import respx
+
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient, RightCodesApiClient
+from rightcodes_tui_dashboard.api.response_cache import ResponseCache
+from rightcodes_tui_dashboard.services.dashboard_fetch import DashboardFetcher, quantize_time
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expiry_and_lru_eviction() -> None:
+    clock = _Clock()
+    cache = ResponseCache(max_entries=2, ttls={"/a": 10.0, "/b": 10.0}, clock=clock)
+
+    cache.put("k1", "/a", {"v": 1})
+    cache.put("k2", "/b", {"v": 2})
+    assert cache.get("k1", "/a") == (True, {"v": 1})  # k1 变为最近使用
+    cache.put("k3", "/a", {"v": 3})
+    assert cache.get("k2", "/b") == (False, None)
+    assert cache.stats.evictions == 1
+
+    clock.now += 10
+    assert cache.get("k1", "/a") == (False, None)
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+    # 未配置 TTL 的 endpoint 不缓存，也不计入统计。
+    cache.put("k4", "/other", {"v": 4})
+    assert cache.get("k4", "/other") == (False, None)
+    assert cache.stats.misses == 2
+
+
+def test_hits_return_copies() -> None:
+    cache = ResponseCache(ttls={"/a": 10.0})
+    cache.put("k", "/a", {"items": [1]})
+    _, first = cache.get("k", "/a")
+    first["items"].append(2)
+    assert cache.get("k", "/a") == (True, {"items": [1]})
+
+
+@respx.mock
+def test_sync_client_serves_repeated_gets_from_cache() -> None:
+    route = respx.get("https://example.test/use-log/list").mock(
+        return_value=httpx.Response(200, json={"logs": [], "total": 0})
+    )
+    cache = ResponseCache()
+    with RightCodesApiClient(base_url="https://example.test", token="t", response_cache=cache) as client:
+        client.use_logs_list(page=1, page_size=20)
+        client.use_logs_list(page=1, page_size=20)
+        client.use_logs_list(page=2, page_size=20)
+    assert route.call_count == 2
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+@respx.mock
+def test_async_client_cache_is_keyed_by_token() -> None:
+    route = respx.get("https://example.test/auth/me").mock(return_value=httpx.Response(200, json={"balance": 1}))
+    cache = ResponseCache()
+
+    async def scenario() -> None:
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="a", response_cache=cache) as c:
+            await c.get_me()
+            await c.get_me()
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="b", response_cache=cache) as c:
+            await c.get_me()
+
+    asyncio.run(scenario())
+    assert route.call_count == 2
+
+
+def test_fetch_window_is_quantized_by_granularity() -> None:
+    hourly = DashboardFetcher(range_mode="rolling", range_seconds=3600, rate_window_seconds=3600)
+    first = hourly.window(dt.datetime(2026, 2, 8, 12, 34, 5))
+    second = hourly.window(dt.datetime(2026, 2, 8, 12, 34, 55))
+    assert first == second
+    assert (first.start, first.end) == (dt.datetime(2026, 2, 8, 11, 34), dt.datetime(2026, 2, 8, 12, 34))
+
+    daily = DashboardFetcher(range_mode="rolling", range_seconds=7 * 86400, rate_window_seconds=3600)
+    assert daily.window(dt.datetime(2026, 2, 8, 12, 34, 5)).end == dt.datetime(2026, 2, 8, 12, 30)
+
+    assert quantize_time(dt.datetime(2026, 2, 8, 12, 59, 59), 300) == dt.datetime(2026, 2, 8, 12, 55)
+
+
+def test_cap_ttl_only_tightens() -> None:
+    cache = ResponseCache(ttls={"/a": 10.0, "/b": 10.0})
+    cache.cap_ttl("/a", 4.5)
+    cache.cap_ttl("/b", 60.0)
+    cache.cap_ttl("/c", 5.0)
+    assert (cache.ttl_for("/a"), cache.ttl_for("/b"), cache.ttl_for("/c")) == (4.5, 10.0, 0.0)
+
+
+def test_dashboard_caps_ttls_by_group_interval_and_manual_refresh_bypasses_cache() -> None:
+    from rightcodes_tui_dashboard.ui.app import DashboardScreen
+
+    cache = ResponseCache()
+    client = AsyncRightCodesApiClient(base_url="https://example.test", token="t", response_cache=cache)
+    screen = DashboardScreen(
+        base_url="https://example.test",
+        token="t",
+        watch_seconds=30,
+        range_seconds=24 * 3600,
+        range_mode="rolling",
+        rate_window_seconds=6 * 3600,
+        granularity="hour",
+        client=client,
+        watch_intervals={"logs": 10, "subs": 20},
+        watch_jitter=0.1,
+    )
+
+    # 最短刷新间隔 interval × 0.9，再减一个 tick。
+    assert cache.ttl_for("/subscriptions/list") == 17.0
+    assert cache.ttl_for("/auth/me") == 26.0
+    assert cache.ttl_for("/use-log/stats") == 20.0
+    assert cache.ttl_for("/use-log/list") == 8.0
+
+    kicked: list[bool] = []
+    screen._kick_refresh = lambda *, force, groups=None: kicked.append(force)  # type: ignore[method-assign]
+    cache.put("k", "/auth/me", {"balance": 1})
+    screen.action_refresh()
+    assert kicked == [True] and len(cache) == 0
+    asyncio.run(client.aclose())
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from rightcodes_tui_dashboard.services.calculations import RollingBurnRate, calculate_burn_rate
+
+WINDOW = 6 * 3600
+T0 = dt.datetime(2026, 2, 8, 12, 0, 0)
+
+
+def _server(since: dt.datetime, now: dt.datetime, *, per_hour: float = 3600.0) -> list[dict]:
+    """模拟 stats_advanced(granularity=hour)：每秒 per_hour/3600 tokens，按 since 过滤后按小时聚合。"""
+
+    out: list[dict] = []
+    hour = since.replace(minute=0, second=0, microsecond=0)
+    while hour <= now:
+        start = max(hour, since)
+        end = min(hour + dt.timedelta(hours=1), now)
+        seconds = max(0.0, (end - start).total_seconds())
+        out.append({"time": hour.strftime("%Y-%m-%d %H:%M:%S"), "tokens": seconds * per_hour / 3600.0, "cost": seconds / 3600.0})
+        hour += dt.timedelta(hours=1)
+    return out
+
+
+def _refresh(engine: RollingBurnRate, now: dt.datetime) -> dt.datetime:
+    since = engine.request_start(now)
+    assert engine.ingest(_server(since, now), since=since, now=now)
+    return since
+
+
+def test_backfill_then_incremental_fetches_only_open_bucket() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    now = T0 + dt.timedelta(minutes=20)
+
+    assert engine.request_start(now) == dt.datetime(2026, 2, 8, 6, 0, 0)
+    _refresh(engine, now)
+    burn = engine.burn(now)
+    assert burn is not None
+    assert burn.tokens_per_hour == pytest.approx(3600.0)
+    assert burn.cost_per_day == pytest.approx(24.0)
+    assert burn.hours_in_window == pytest.approx(6.0)
+
+    later = now + dt.timedelta(minutes=30)
+    assert engine.request_start(later) == T0
+    _refresh(engine, later)
+    assert engine.burn(later).tokens_per_hour == pytest.approx(3600.0)
+
+    # 跨过整点：从上一个 open bucket 起拉，使其以完整数据转为 closed。
+    next_hour = T0 + dt.timedelta(hours=1, minutes=5)
+    assert engine.request_start(next_hour) == T0
+    _refresh(engine, next_hour)
+    assert engine.burn(next_hour).tokens_per_hour == pytest.approx(3600.0)
+    assert len(engine.as_payload()["data"]) == 7  # 07:00..13:00（07:00 只部分落在窗口内）
+
+
+def test_rate_is_continuous_across_hour_boundary() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    # 前 3 小时高负载，之后空闲：窗口滑动时速率应平滑下降而非在整点跳变。
+    busy_until = T0 - dt.timedelta(hours=3)
+
+    def server(since: dt.datetime, now: dt.datetime) -> list[dict]:
+        rows = _server(since, now)
+        for row in rows:
+            start = dt.datetime.fromisoformat(row["time"])
+            if start >= busy_until:
+                row["tokens"] = 0.0
+        return rows
+
+    rates = []
+    now = T0 - dt.timedelta(minutes=2)
+    for _ in range(5):
+        since = engine.request_start(now)
+        engine.ingest(server(since, now), since=since, now=now)
+        rates.append(engine.burn(now).tokens_per_hour)
+        now += dt.timedelta(minutes=1)
+
+    steps = [abs(b - a) for a, b in zip(rates, rates[1:])]
+    assert max(steps) < 20.0  # 每分钟约 3600/60/6 = 10 tokens/h 的线性下降
+
+
+def test_matches_full_window_calculation_for_aligned_window() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    now = T0
+    _refresh(engine, now)
+    full = calculate_burn_rate(_server(now - dt.timedelta(seconds=WINDOW), now), window_seconds=WINDOW)
+    assert engine.burn(now).tokens_per_hour == pytest.approx(full.tokens_per_hour)
+    assert engine.burn(now).cost_per_day == pytest.approx(full.cost_per_day)
+
+
+def test_gap_longer_than_window_triggers_full_refetch() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    _refresh(engine, T0)
+    much_later = T0 + dt.timedelta(hours=10, minutes=30)
+    assert engine.request_start(much_later) == dt.datetime(2026, 2, 8, 16, 0, 0)
+    _refresh(engine, much_later)
+    assert engine.burn(much_later).tokens_per_hour == pytest.approx(3600.0)
+
+
+def test_buckets_without_time_fall_back_to_full_window() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    since = engine.request_start(T0)
+    assert engine.ingest([{"tokens": 10, "cost": 0.1}], since=since, now=T0) is False
+    assert not engine.supported and not engine.ready
+    assert engine.burn(T0) is None
+    assert engine.request_start(T0) == T0 - dt.timedelta(seconds=WINDOW)
+
+
+def test_partial_history_uses_covered_span() -> None:
+    engine = RollingBurnRate(window_seconds=WINDOW)
+    since = T0 - dt.timedelta(hours=2)
+    engine.ingest(_server(since, T0), since=since, now=T0)
+    burn = engine.burn(T0)
+    assert burn.hours_in_window == pytest.approx(2.0)
+    assert burn.tokens_per_hour == pytest.approx(3600.0)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from rightcodes_tui_dashboard.services.calculations import (
+    _BUCKET_FIELDS,
+    _COST_KEYS,
+    _TOKENS_KEYS,
+    _first_number,
+    calculate_burn_rate,
+    extract_model_usage_rows,
+)
+from rightcodes_tui_dashboard.services.shape import FieldSpec, ShapePlan, probe_first
+from rightcodes_tui_dashboard.services.use_logs import (
+    UseLogRecord,
+    extract_use_log_billing_rate,
+    extract_use_log_billing_source,
+    extract_use_log_channel,
+    extract_use_log_cost,
+    extract_use_log_id,
+    extract_use_log_ip,
+    extract_use_log_key,
+    extract_use_log_model,
+    extract_use_log_records,
+    extract_use_log_time,
+    extract_use_log_tokens,
+)
+
+
+def _probe(item: dict) -> UseLogRecord:
+    return UseLogRecord(
+        extract_use_log_id(item),
+        extract_use_log_time(item),
+        extract_use_log_model(item),
+        extract_use_log_key(item),
+        extract_use_log_channel(item),
+        extract_use_log_tokens(item),
+        extract_use_log_cost(item),
+        extract_use_log_billing_rate(item),
+        extract_use_log_billing_source(item),
+        extract_use_log_ip(item),
+    )
+
+
+def _base(**overrides) -> dict:
+    item = {
+        "id": 1,
+        "time": "2026-02-08T10:00:00",
+        "model": "m1",
+        "api_key_name": "k1",
+        "channel": "/codex",
+        "usage": {"total_tokens": 120},
+        "total_cost": 0.5,
+        "cost": None,
+        "billing_rate": "1.5",
+        "note": "subscription",
+        "ip": "1.2.3.4",
+    }
+    item.update(overrides)
+    return item
+
+
+def test_compiled_records_match_probing_for_same_shape_edge_values() -> None:
+    items = [
+        _base(),
+        # 首选 key 的值不可用（空白/None/bool/不可解析）时，继续尝试同形状中的后续 key
+        _base(cost=0.25, total_cost=True),
+        _base(model="  ", api_key_name=" k2 ", time=None),
+        _base(usage={"tokens": "1,234"}, billing_rate=False),
+        _base(usage=None, id=True),
+        _base(usage={"total_tokens": "x"}, channel=""),
+    ]
+
+    assert extract_use_log_records(items) == [_probe(x) for x in items]
+
+
+def test_compiled_records_fall_back_for_items_with_other_shapes() -> None:
+    items = [
+        _base(),
+        {"log_id": "abc", "created_at": "2026-02-08T11:00:00", "model_name": "m2", "tokens": 7, "fee": "0.1"},
+        {"request_id": 9, "usage_tokens": "8", "route": "/x", "client_ip": "5.6.7.8"},
+        _base(extra="field"),
+    ]
+
+    records = extract_use_log_records(items)
+    assert records == [_probe(x) for x in items]
+    assert records[1].tokens == 7.0 and records[1].cost == 0.1
+    assert records[2].channel == "/x" and records[2].id == "9"
+
+
+def test_shape_plan_extract_matches_probe_first() -> None:
+    def _num(v):  # noqa: ANN001
+        return float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else None
+
+    specs = (FieldSpec(("a", "b", "c"), _num), FieldSpec(("x", "y"), _num))
+    plan = ShapePlan(specs, {"b": 1, "c": 2, "z": 0})
+
+    for item in ({"b": 1, "c": 2, "z": 0}, {"b": None, "c": 3, "z": 0}, {"a": 5, "b": 1}, {}):
+        assert plan.extract(item) == tuple(probe_first(item, s.keys, _num) for s in specs)
+
+    items = [{"b": 1, "c": 2, "z": 0}, {"b": "bad", "c": 4, "z": 0}]
+    assert plan.extract_columns(items) == [[1.0, 4.0], [None, None]]
+
+
+def test_calculations_use_shape_plans_consistently() -> None:
+    buckets = [{"tokens": 10, "cost": 0.1}, {"tokens": None, "total_tokens": 20, "cost": 0.2}, {"token_count": 5}]
+    burn = calculate_burn_rate(buckets, window_seconds=3600)
+    assert burn is not None
+    assert burn.tokens_per_hour == 35.0
+    assert abs(burn.cost_per_day - 0.3 * 24) < 1e-9
+
+    rows = extract_model_usage_rows(
+        {
+            "details_by_model": [
+                {"model": "a", "total_requests": 2, "total_tokens": 10, "total_cost": 1.0},
+                {"model": "b", "requests": 1, "tokens": 5, "cost": 0.5},
+            ]
+        }
+    )
+    assert {(r.model, r.requests, r.tokens, r.cost) for r in rows} == {("a", 2.0, 10.0, 1.0), ("b", 1.0, 5.0, 0.5)}
+
+
+def test_bool_values_count_as_missing_like_first_number() -> None:
+    # 与基线 `_first_number` 一致：True/False 不当作 1/0，而是跳过并继续尝试后续 key。
+    buckets = [{"tokens": True, "total_tokens": 7, "cost": False}, {"tokens": True, "total_tokens": 3, "cost": False}]
+    plan = ShapePlan.for_items(_BUCKET_FIELDS, buckets)
+    for b in buckets:
+        assert plan.extract(b) == (_first_number(b, _TOKENS_KEYS), _first_number(b, _COST_KEYS))
+    assert plan.extract_columns(buckets) == [[7.0, 3.0], [None, None]]
+
+    burn = calculate_burn_rate(buckets, window_seconds=3600)
+    assert burn is not None and burn.tokens_per_hour == 10.0 and burn.cost_per_day is None
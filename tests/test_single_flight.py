@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient, RightCodesApiClient
+
+_HITS: Counter[str] = Counter()
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:  # noqa: N802
+        _HITS[self.path] += 1
+        time.sleep(0.2)
+        body = json.dumps({"path": self.path, "items": [{"id": 1}]}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args) -> None:  # noqa: ANN002
+        return None
+
+
+@pytest.fixture()
+def slow_server():
+    _HITS.clear()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_async_identical_calls_share_one_request(slow_server) -> None:
+    async def scenario():
+        async with AsyncRightCodesApiClient(base_url=slow_server, token="t") as client:
+            results = await asyncio.gather(
+                client.get_me(),
+                client.get_me(),
+                client.use_logs_list(page=1, page_size=20),
+                client.use_logs_list(page=1, page_size=20),
+                client.use_logs_list(page=2, page_size=20),
+            )
+            return results, client.stats
+
+    results, stats = asyncio.run(scenario())
+    assert _HITS["/auth/me"] == 1
+    assert _HITS["/use-log/list?page=1&page_size=20"] == 1
+    assert _HITS["/use-log/list?page=2&page_size=20"] == 1
+    assert stats.coalesced == 2 and stats.requests == 3
+    # 合并的调用拿到的是副本：互不影响。
+    assert results[0] == results[1] and results[0] is not results[1]
+
+
+def test_async_leader_cancellation_does_not_cancel_followers(slow_server) -> None:
+    async def scenario():
+        async with AsyncRightCodesApiClient(base_url=slow_server, token="t") as client:
+            leader = asyncio.ensure_future(client.get_me())
+            await asyncio.sleep(0.05)
+            follower = asyncio.ensure_future(client.get_me())
+            await asyncio.sleep(0.05)
+            leader.cancel()
+            return await follower
+
+    assert asyncio.run(scenario())["path"] == "/auth/me"
+    assert _HITS["/auth/me"] == 1
+
+
+def test_sync_threads_share_one_request_and_later_calls_refetch(slow_server) -> None:
+    with RightCodesApiClient(base_url=slow_server, token="t") as client:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = list(pool.map(lambda _: client.get_me(), range(4)))
+        assert _HITS["/auth/me"] == 1
+        assert client.stats.coalesced == 3
+        assert all(r == results[0] for r in results)
+
+        # 不缓存：请求完成后再次调用会重新请求。
+        client.get_me()
+        assert _HITS["/auth/me"] == 2
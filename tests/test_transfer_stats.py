@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+
+import httpx
+import respx
+
+from rightcodes_tui_dashboard.api import client as client_module
+from rightcodes_tui_dashboard.api.client import AsyncRightCodesApiClient, RightCodesApiClient
+
+
+def _gzip_page() -> tuple[bytes, bytes]:
+    raw = json.dumps({"items": [{"id": i, "model": "gpt-5.2", "total_tokens": 120} for i in range(500)]}).encode()
+    return raw, gzip.compress(raw)
+
+
+@respx.mock
+def test_records_wire_vs_decoded_bytes_per_endpoint() -> None:
+    raw, compressed = _gzip_page()
+    route = respx.get("https://example.test/use-log/list").mock(
+        return_value=httpx.Response(200, content=compressed, headers={"Content-Encoding": "gzip"})
+    )
+    with RightCodesApiClient(base_url="https://example.test", token="t") as client:
+        page = client.use_logs_list(page=1, page_size=500)
+        stats = client.stats
+
+    assert len(page["items"]) == 500
+    assert "gzip" in route.calls.last.request.headers["Accept-Encoding"]
+    assert (stats.wire_bytes, stats.decoded_bytes) == (len(compressed), len(raw))
+    assert stats.compression_ratio > 5
+    assert stats.transfers["/use-log/list"] == (1, len(compressed), len(raw))
+    assert stats.http2_requests == 0
+
+
+@respx.mock
+def test_async_client_records_transfers_too() -> None:
+    respx.get("https://example.test/auth/me").mock(return_value=httpx.Response(200, json={"balance": 1}))
+
+    async def scenario():
+        async with AsyncRightCodesApiClient(base_url="https://example.test", token="t") as client:
+            await client.get_me()
+            return client.stats
+
+    stats = asyncio.run(scenario())
+    assert stats.transfers["/auth/me"][0] == 1
+    assert stats.wire_bytes == stats.decoded_bytes > 0
+
+
+def test_http2_falls_back_without_h2_and_br_only_when_decodable(monkeypatch) -> None:
+    monkeypatch.setattr(client_module, "_try_import_h2", lambda: None)
+    monkeypatch.setattr(client_module, "_try_import_brotli", lambda: None)
+    with RightCodesApiClient(base_url="https://example.test", token="t", http2=True) as client:
+        assert client.http2 is False
+    assert client_module.accept_encoding() == "gzip, deflate"
+
+    monkeypatch.setattr(client_module, "_try_import_brotli", lambda: object())
+    assert client_module.accept_encoding().endswith(", br")
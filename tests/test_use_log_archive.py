@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+
+import pytest
+
+from rightcodes_tui_dashboard.storage.use_log_archive import UseLogArchive
+
+
+def _item(idx: int, *, time: str, model: str, key: str = "k1", tokens: int = 10, cost: float = 0.5) -> dict:
+    return {
+        "id": idx,
+        "time": time,
+        "model": model,
+        "api_key_name": key,
+        "upstream_prefix": "/codex",
+        "usage": {"total_tokens": tokens},
+        "cost": cost,
+        "ip": "1.2.3.4",
+    }
+
+
+def test_archive_upsert_is_idempotent_and_queries_by_range(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        items = [
+            _item(1, time="2026-02-08T10:00:00", model="m1"),
+            _item(2, time="2026-02-08T11:00:00", model="m2"),
+            _item(3, time="2026-02-07T09:00:00", model="m1"),
+        ]
+        assert archive.upsert_items(items) == 3
+        assert archive.upsert_items(items[:2]) == 0
+        assert archive.count() == 3
+
+        got = archive.query(start=dt.datetime(2026, 2, 8), end=dt.datetime(2026, 2, 8, 23, 59, 59))
+        assert [x["id"] for x in got] == [2, 1]
+
+        only_m1 = archive.query(model="m1")
+        assert [x["id"] for x in only_m1] == [1, 3]
+
+
+def test_archive_aggregates_by_model_and_day(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        archive.upsert_items(
+            [
+                _item(1, time="2026-02-08T10:00:00", model="m1", tokens=10, cost=1.0),
+                _item(2, time="2026-02-08T11:00:00", model="m1", tokens=5, cost=0.5),
+                _item(3, time="2026-02-07T09:00:00", model="m2", tokens=1, cost=0.1),
+            ]
+        )
+
+        by_model = archive.aggregate(group_by="model")
+        assert [(r.group, r.requests, r.tokens) for r in by_model] == [("m1", 2, 15.0), ("m2", 1, 1.0)]
+        assert by_model[0].cost == pytest.approx(1.5)
+
+        by_day = archive.aggregate(group_by="day")
+        assert [(r.group, r.requests) for r in by_day] == [("2026-02-07", 1), ("2026-02-08", 2)]
+
+        with pytest.raises(ValueError):
+            archive.aggregate(group_by="nope")
+
+
+def test_archive_dedupes_items_without_id_by_content(tmp_path) -> None:
+    with UseLogArchive(tmp_path / "a.sqlite3") as archive:
+        item = {"time": "2026-02-08T10:00:00", "model": "m1"}
+        assert archive.upsert_items([item, dict(item)]) == 1
+
+
+def test_cmd_logs_local_outputs_redacted_json(tmp_path, monkeypatch, capsys) -> None:
+    from rightcodes_tui_dashboard import cli
+
+    monkeypatch.setenv("RIGHTCODES_DATA_DIR", str(tmp_path))
+    now = dt.datetime.now().replace(microsecond=0)
+    with UseLogArchive() as archive:
+        archive.upsert_items([_item(1, time=(now - dt.timedelta(hours=1)).isoformat(), model="m1")])
+
+    args = argparse.Namespace(
+        base_url=None,
+        range="24h",
+        page=1,
+        page_size=50,
+        format="json",
+        local=True,
+        model=None,
+        key=None,
+        channel=None,
+        group_by=None,
+    )
+    assert cli.cmd_logs(args) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert len(out) == 1
+    assert out[0]["ip"] == "***REDACTED***"
+    assert out[0]["api_key_name"] == "***REDACTED***"
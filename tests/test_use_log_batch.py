@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import math
+
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch, UseLogPageBatch
+from rightcodes_tui_dashboard.services.use_logs import extract_use_log_records
+
+
+def _items() -> list:
+    return [
+        {"id": 1, "time": "2026-02-08T10:00:00", "model": "m1", "api_key_name": "k1", "usage": {"total_tokens": 10}, "cost": 0.5},
+        "not-a-dict",
+        {"id": 2, "time": "bad", "model": "m1", "api_key_name": "k1", "usage": None, "cost": None},
+        {"log_id": "x", "created_at": "2026-02-08T12:00:00", "model_name": "m2", "tokens": "7", "ip": "1.2.3.4"},
+    ]
+
+
+def test_batch_columns_match_records_and_skip_non_dicts() -> None:
+    items = _items()
+    batch = UseLogBatch.from_items(items)
+
+    assert len(batch) == 3
+    assert list(batch.records()) == extract_use_log_records(items)
+    assert batch.epoch[0] == dt.datetime(2026, 2, 8, 10, 0, 0).timestamp()
+    assert math.isnan(batch.epoch[1])
+    assert math.isnan(batch.tokens[1]) and batch.record(1).tokens is None
+    assert batch.tokens[2] == 7.0
+    assert list(batch.records(limit=1)) == [batch.record(0)]
+
+
+def test_batch_interns_low_cardinality_strings() -> None:
+    # 通过拼接构造不同的 str 对象，确认批次内同值共享同一对象。
+    items = [{"model": "".join(["gpt", "-5"]), "time": "2026-02-08T10:00:00"} for _ in range(3)]
+    assert items[0]["model"] is not items[1]["model"]
+
+    batch = UseLogBatch.from_items(items)
+    assert batch.models[0] is batch.models[1] is batch.models[2]
+
+
+def test_batch_newest_index_ignores_unparseable_times() -> None:
+    batch = UseLogBatch.from_items(_items())
+    assert batch.newest_index() == 2
+    assert UseLogBatch.from_items([{"time": "bad"}]).newest_index() is None
+    assert UseLogBatch.from_items([]).newest_index() is None
+
+
+def test_page_batch_roundtrips_through_canonical_items() -> None:
+    payload = {"data": _items(), "total": 3, "page": 1, "page_size": 20}
+    page = UseLogPageBatch.from_payload(payload)
+
+    assert (page.total, page.page, page.page_size) == (3, 1, 20)
+    again = UseLogPageBatch.from_payload(json.loads(json.dumps(page.to_payload())))
+    assert list(again.batch.records()) == list(page.batch.records())
+    assert (again.total, again.page, again.page_size) == (3, 1, 20)
+    assert UseLogPageBatch.from_payload({"total": True}).total is None
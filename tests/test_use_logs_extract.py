@@ -42,3 +42,19 @@ def test_extract_use_log_ip() -> None:
     item = {"ip": "1.2.3.4"}
     assert extract_use_log_ip(item) == "1.2.3.4"
 
+
+
+def test_extract_use_log_time_cost_and_id() -> None:
+    from rightcodes_tui_dashboard.services.use_logs import (
+        extract_use_log_cost,
+        extract_use_log_id,
+        extract_use_log_time,
+        parse_use_log_time,
+    )
+
+    item = {"id": 42, "created_at": "2026-02-08T10:00:00", "fee": "0.25"}
+    assert extract_use_log_id(item) == "42"
+    assert extract_use_log_time(item) == "2026-02-08T10:00:00"
+    assert extract_use_log_cost(item) == 0.25
+    assert parse_use_log_time("2026-02-08T10:00:00") is not None
+    assert parse_use_log_time("not-a-time") is None
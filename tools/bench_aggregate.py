@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""聚合基准：纯 Python 列聚合 vs NumPy 向量化（含 list -> ndarray 转换开销）。
+
+用法：
+  python tools/bench_aggregate.py                    # 默认 2160 个 bucket（90d × 小时粒度）、50 个模型行
+  python tools/bench_aggregate.py --buckets 100000 --models 5000 --repeat 5
+
+说明：
+- 纯 Python 一列为 `services/aggregate.py` 的实际实现（看板只使用这一条路径，不存在向量化路径）
+- NumPy 一列仅用于对照：输入同样是从响应 dict 按列抽取出的 Python list，计时包含 `np.asarray` 转换
+- 未安装 NumPy 时只输出纯 Python 结果
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from rightcodes_tui_dashboard.services import aggregate  # noqa: E402
+
+
+def synthetic_column(n: int, *, seed: int = 7, missing: float = 0.05) -> list[float | None]:
+    rng = random.Random(seed)
+    return [None if rng.random() < missing else float(rng.randint(0, 50_000)) for _ in range(n)]
+
+
+def synthetic_names(n: int) -> list[str]:
+    return [f"model-{i}" for i in range(n)]
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _python_cases(column: list[float | None], primary: list[float | None], secondary: list[float | None], names: list[str]):
+    total = aggregate.sum_present(primary) or 1.0
+    return {
+        "sum_present": lambda: aggregate.sum_present(column),
+        "shares_of": lambda: aggregate.shares_of(primary, total),
+        "order_desc": lambda: aggregate.order_desc(primary, secondary, names),
+    }
+
+
+def _numpy_cases(np: Any, column: list[float | None], primary: list[float | None], secondary: list[float | None], names: list[str]):
+    total = aggregate.sum_present(primary) or 1.0
+
+    def _array(values: list[float | None]) -> Any:
+        return np.asarray([np.nan if v is None else v for v in values], dtype=float)
+
+    def _sum() -> float | None:
+        arr = _array(column)
+        mask = ~np.isnan(arr)
+        return float(arr[mask].sum()) if mask.any() else None
+
+    def _shares() -> list[float | None]:
+        return (_array(primary) / total).tolist()
+
+    def _order() -> list[int]:
+        keys = (np.asarray(names), np.nan_to_num(_array(secondary)), np.nan_to_num(_array(primary)))
+        return np.lexsort(keys)[::-1].tolist()
+
+    return {"sum_present": _sum, "shares_of": _shares, "order_desc": _order}
+
+
+def _try_import_numpy():
+    try:
+        import numpy
+    except Exception:
+        return None
+    return numpy
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buckets", type=int, default=90 * 24)
+    parser.add_argument("--models", type=int, default=50, help="模型行数（排序/占比的输入规模）")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    column = synthetic_column(args.buckets)
+    primary = synthetic_column(args.models, seed=11)
+    secondary = synthetic_column(args.models, seed=13)
+    names = synthetic_names(args.models)
+
+    python_times = {name: _best(fn, args.repeat) for name, fn in _python_cases(column, primary, secondary, names).items()}
+    np = _try_import_numpy()
+    numpy_times: dict[str, float] | None = None
+    if np is not None:
+        numpy_times = {
+            name: _best(fn, args.repeat) for name, fn in _numpy_cases(np, column, primary, secondary, names).items()
+        }
+
+    print(f"buckets: {len(column):,}   model rows: {len(names):,}")
+    for name, py in python_times.items():
+        line = f"{name:<12} python {py * 1000:8.3f} ms"
+        if numpy_times is not None:
+            np_t = numpy_times[name]
+            line += f"   numpy {np_t * 1000:8.3f} ms   ({py / np_t:.2f}x)"
+        print(line)
+    if numpy_times is None:
+        print("numpy: not installed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""解码基准：大页 /use-log/list 的 JSON 解码 + 字段抽取（标准库 json vs 已安装的 orjson/msgspec）。
+
+用法：
+  python tools/bench_decode.py
+  python tools/bench_decode.py --page-size 5000 --pages 20 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_extract import synthetic_items  # noqa: E402
+
+from rightcodes_tui_dashboard.api import json_codec  # noqa: E402
+from rightcodes_tui_dashboard.services.calculations import extract_use_logs_items  # noqa: E402
+from rightcodes_tui_dashboard.services.use_logs import extract_use_log_records  # noqa: E402
+
+
+def _decoders() -> dict[str, Callable[[bytes], Any]]:
+    decoders: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    orjson = json_codec._try_import_orjson()
+    if orjson is not None:
+        decoders["orjson"] = orjson.loads
+    msgspec = json_codec._try_import_msgspec()
+    if msgspec is not None:
+        decoders["msgspec"] = msgspec.json.decode
+    return decoders
+
+
+def _best(fn: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=1000)
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    items = synthetic_items(args.page_size * args.pages)
+    bodies = [
+        json.dumps({"items": items[i : i + args.page_size], "total": len(items)}).encode("utf-8")
+        for i in range(0, len(items), args.page_size)
+    ]
+    print(f"pages:      {len(bodies)} x {args.page_size} items ({sum(map(len, bodies)) / 1e6:.1f} MB)")
+    print(f"default:    {json_codec.json_backend()[0]}")
+
+    baseline: dict[str, float] = {}
+    for name, decode in _decoders().items():
+        assert decode(bodies[0]) == json.loads(bodies[0])
+        decode_only = _best(lambda: [decode(b) for b in bodies], args.repeat)
+        end_to_end = _best(
+            lambda: [extract_use_log_records(extract_use_logs_items(decode(b))) for b in bodies], args.repeat
+        )
+        baseline.setdefault("decode", decode_only)
+        baseline.setdefault("total", end_to_end)
+        print(
+            f"{name:<8}    decode {decode_only * 1000:8.1f} ms ({baseline['decode'] / decode_only:.1f}x)"
+            f"   decode+extract {end_to_end * 1000:8.1f} ms ({baseline['total'] / end_to_end:.1f}x)"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""字段抽取基准：逐字段探测 vs 形状编译 vs 列式批次（默认 100k 条合成 use-log）。
+
+用法：
+  python tools/bench_extract.py
+  python tools/bench_extract.py --items 200000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from rightcodes_tui_dashboard.services.use_log_batch import UseLogBatch  # noqa: E402
+from rightcodes_tui_dashboard.services.use_logs import (  # noqa: E402
+    UseLogRecord,
+    extract_use_log_billing_rate,
+    extract_use_log_billing_source,
+    extract_use_log_channel,
+    extract_use_log_cost,
+    extract_use_log_id,
+    extract_use_log_ip,
+    extract_use_log_key,
+    extract_use_log_model,
+    extract_use_log_records,
+    extract_use_log_time,
+    extract_use_log_tokens,
+    use_log_plan,
+)
+
+
+def synthetic_items(n: int, *, seed: int = 7) -> list[dict]:
+    """生成与 /use-log/list 相近的 item（命中靠后的 key 变体，贴近真实探测成本）。"""
+
+    rng = random.Random(seed)
+    models = ["gpt-5.2", "gpt-5.2-codex", "claude-sonnet", "gemini-pro"]
+    items: list[dict] = []
+    for i in range(n):
+        items.append(
+            {
+                "log_id": 1_000_000 + i,
+                "created_at": f"2026-02-08T{i % 24:02d}:{i % 60:02d}:00",
+                "model_name": rng.choice(models),
+                "key_name": f"key-{i % 5}",
+                "route": "/codex",
+                "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120 + i % 50},
+                "total_cost": round(rng.random() / 10, 6),
+                "ratio": 1.0,
+                "balance_type": "subscription",
+                "client_ip": "1.2.3.4",
+                "status": 200,
+                "duration_ms": rng.randint(100, 5000),
+            }
+        )
+    return items
+
+
+def probe_records(items: list[dict]) -> list[UseLogRecord]:
+    return [
+        UseLogRecord(
+            extract_use_log_id(item),
+            extract_use_log_time(item),
+            extract_use_log_model(item),
+            extract_use_log_key(item),
+            extract_use_log_channel(item),
+            extract_use_log_tokens(item),
+            extract_use_log_cost(item),
+            extract_use_log_billing_rate(item),
+            extract_use_log_billing_source(item),
+            extract_use_log_ip(item),
+        )
+        for item in items
+    ]
+
+
+def _best(fn, items: list[dict], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn(items)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _retained_bytes(build) -> int:
+    """构建对象后仍被持有的内存（tracemalloc 口径）。"""
+
+    tracemalloc.start()
+    try:
+        obj = build()
+        current, _peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del obj
+    return current
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    items = synthetic_items(args.items)
+    assert probe_records(items[:1000]) == extract_use_log_records(items[:1000])
+
+    probe = _best(probe_records, items, args.repeat)
+    compiled = _best(extract_use_log_records, items, args.repeat)
+    columns = _best(lambda xs: use_log_plan(xs).extract_columns(xs), items, args.repeat)
+    print(f"items:              {len(items):,}")
+    print(f"probing:            {probe * 1000:8.1f} ms")
+    print(f"compiled (records): {compiled * 1000:8.1f} ms   ({probe / compiled:.1f}x)")
+    batch = _best(UseLogBatch.from_items, items, args.repeat)
+    print(f"compiled (columns): {columns * 1000:8.1f} ms   ({probe / columns:.1f}x)")
+    print(f"UseLogBatch build:  {batch * 1000:8.1f} ms   (incl. time parsing)")
+
+    # 内存：按真实响应的方式（json.loads）得到 dict items，对比列式批次的常驻内存。
+    raw = json.dumps(items)
+    dicts_mem = _retained_bytes(lambda: json.loads(raw))
+    batch_mem = _retained_bytes(lambda: UseLogBatch.from_items(json.loads(raw)))
+    print(f"memory (dicts):     {dicts_mem / 1e6:8.1f} MB")
+    print(f"memory (batch):     {batch_mem / 1e6:8.1f} MB   ({dicts_mem / max(1, batch_mem):.1f}x smaller)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
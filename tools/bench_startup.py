@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""冷启动耗时基准：按子命令统计“解析参数 + 导入该子命令所需模块”的耗时。
+
+用法：
+  python tools/bench_startup.py                         # 打印各子命令冷启动耗时
+  python tools/bench_startup.py --out startup.json      # 记录结果
+  python tools/bench_startup.py --check startup.json    # 与记录对比，回退超过阈值则退出码 1
+
+说明：
+- 每次测量都在全新子进程中进行（冷启动：无模块缓存），取多次中的最小值以降低噪声。
+- 同时记录各子命令是否加载了 textual/rich/httpx，便于发现“误把重依赖拉进轻命令”的回归。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# 子命令 -> argv（与真实入口一致：先 build_parser().parse_args，再按需导入 cli/ui）。
+SUBCOMMANDS: dict[str, list[str]] = {
+    "--version": ["--version"],
+    "login": ["login"],
+    "logs": ["logs", "--format", "json"],
+    "sync": ["sync"],
+    "exporter": ["exporter"],
+    "daemon": ["daemon"],
+    "doctor": ["doctor"],
+    "dashboard": ["dashboard"],
+}
+
+HEAVY_MODULES = ("textual", "rich", "httpx")
+
+# 子进程内执行：只做“解析参数 + 导入实现模块”，不真正发请求/启动 TUI。
+_PROBE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+from rightcodes_tui_dashboard.__main__ import _COMMANDS, build_parser
+argv = json.loads(sys.argv[1])
+try:
+    args = build_parser().parse_args(argv)
+except SystemExit:
+    args = None
+if args is not None:
+    from rightcodes_tui_dashboard import cli
+    getattr(cli, _COMMANDS[args.command])
+    if args.command == "dashboard":
+        from rightcodes_tui_dashboard.ui.app import RightCodesDashboardApp  # noqa: F401
+elapsed = (time.perf_counter() - t0) * 1000.0
+heavy = sorted(m for m in %r if m in sys.modules)
+print(json.dumps({"ms": elapsed, "heavy": heavy}))
+""" % (HEAVY_MODULES,)
+
+
+def measure(argv: list[str], *, repeat: int) -> dict[str, object]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = str(ROOT / "src") + os.pathsep + env.get("PYTHONPATH", "")
+    best: dict[str, object] | None = None
+    for _ in range(max(1, repeat)):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE, json.dumps(argv)],
+            capture_output=True,
+            text=True,
+            env=env,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["ms"] < best["ms"]:
+            best = result
+    assert best is not None
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="每个子命令的测量次数（取最小值）")
+    parser.add_argument("--out", default=None, help="将结果写入 JSON 文件")
+    parser.add_argument("--check", default=None, help="与已记录的 JSON 对比")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="允许的回退倍数（默认 1.5x）")
+    args = parser.parse_args(argv)
+
+    results = {name: measure(cmd, repeat=args.repeat) for name, cmd in SUBCOMMANDS.items()}
+    for name, r in results.items():
+        heavy = ",".join(r["heavy"]) or "-"
+        print(f"{name:<10} {r['ms']:8.1f} ms   heavy: {heavy}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text(encoding="utf-8"))
+        failed = False
+        for name, r in results.items():
+            base = baseline.get(name)
+            if not base:
+                continue
+            if r["ms"] > float(base["ms"]) * args.tolerance:
+                print(f"REGRESSION {name}: {r['ms']:.1f} ms > {base['ms']:.1f} ms × {args.tolerance}")
+                failed = True
+            new_heavy = set(r["heavy"]) - set(base.get("heavy", []))
+            if new_heavy:
+                print(f"REGRESSION {name}: now imports {', '.join(sorted(new_heavy))}")
+                failed = True
+        return 1 if failed else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())